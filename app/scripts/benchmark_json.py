@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+# Add project root to python path to allow importing src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.domain.mocks.schemas import MockEndpoint
+from src.infrastructure.dynamodb.converters import to_item, to_wire
+from src.shared.json_codec import JsonCodec, StdlibJsonCodec, make_json_codec, orjson
+
+
+def make_mock(body_kib: int) -> MockEndpoint:
+    """A mock whose JSON body is roughly body_kib KiB."""
+    items = [
+        {"id": i, "name": f"item-{i}", "price": i * 150, "tags": ["a", "b"]}
+        for i in range(body_kib * 1024 // 64)
+    ]
+    return MockEndpoint(
+        id="bench",
+        path="/bench",
+        method="GET",
+        response_body={"items": items},
+    )
+
+
+def measure(label: str, func: Callable[[], Any], number: int) -> None:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<44} {seconds * 1e6:>10.1f} us")
+
+
+def bench_response_model(mock: MockEndpoint, number: int) -> None:
+    """
+    Ways to serialize a response_model. FastAPI only takes its dump_json
+    fast path when the route keeps the default response class, so a custom
+    JSONResponse subclass would replace it with a dict round trip.
+    """
+    adapter = TypeAdapter(MockEndpoint)
+    print("response_model serialization")
+    measure(
+        "FastAPI dump_json fast path (current)",
+        lambda: adapter.dump_json(mock),
+        number,
+    )
+    measure(
+        "jsonable_encoder + json.dumps (JSONResponse)",
+        lambda: json.dumps(jsonable_encoder(mock)).encode(),
+        number,
+    )
+    if orjson is not None:
+        measure(
+            "model_dump + orjson.dumps (ORJSONResponse)",
+            lambda: orjson.dumps(mock.model_dump(mode="json")),
+            number,
+        )
+
+
+def bench_codec(codec: JsonCodec, mock: MockEndpoint, number: int) -> None:
+    """JSON handled outside pydantic: DynamoDB wire items and JSON columns."""
+    item = {"TableName": "MockTable", "Item": to_wire(to_item(mock))}
+    column = mock.model_dump(mode="json")["response_body"]
+    wire = codec.dumps(item)
+    encoded_column = codec.dumps(column)
+    print(f"{codec.name} codec")
+    measure("DynamoDB item encode", lambda: codec.dumps(item), number)
+    measure("DynamoDB item decode", lambda: codec.loads(wire), number)
+    measure("JSON column encode", lambda: codec.dumps(column), number)
+    measure("JSON column decode", lambda: codec.loads(encoded_column), number)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON serialization paths.")
+    parser.add_argument("--body-kib", type=int, default=256)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    mock = make_mock(args.body_kib)
+    size = len(mock.model_dump_json())
+    print(f"Mock size: {size / 1024:.0f} KiB, best of 5 x {args.number} runs\n")
+
+    bench_response_model(mock, args.number)
+    bench_codec(StdlibJsonCodec(), mock, args.number)
+    if orjson is not None:
+        bench_codec(make_json_codec("orjson"), mock, args.number)
+
+
+if __name__ == "__main__":
+    main()
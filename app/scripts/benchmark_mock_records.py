@@ -0,0 +1,74 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+# Add project root to python path to allow importing src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import MockEndpoint
+
+
+def make_items(count: int) -> list[str]:
+    """
+    Stored rows as JSON text. Each build decodes its own row, so the
+    measured time and memory include the decoding both sides need.
+    """
+    return [
+        MockEndpoint(
+            id=f"mock-{i}",
+            path=f"/bench/{i}",
+            method="GET",
+            response_body={"id": i, "name": f"item-{i}"},
+            headers={"Content-Type": "application/json"},
+        ).model_dump_json()
+        for i in range(count)
+    ]
+
+
+def measure(label: str, build: Callable[[str], object], items: list[str]) -> None:
+    """Build one object per item: best-of-3 throughput and retained memory."""
+    seconds = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        built = [build(item) for item in items]
+        seconds = min(seconds, time.perf_counter() - start)
+        del built
+
+    gc.collect()
+    tracemalloc.start()
+    built = [build(item) for item in items]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_second = len(items) / seconds
+    per_entry = retained / len(built)
+    print(f"  {label:<34} {per_second:>12,.0f} /s {per_entry:>10,.0f} B/entry")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare cached mock representations.")
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    items = make_items(args.count)
+    print(f"{args.count:,} mocks\n")
+    measure(
+        "MockEndpoint.model_validate",
+        lambda row: MockEndpoint.model_validate(json.loads(row)),
+        items,
+    )
+    measure(
+        "MockRecord.from_storage (current)",
+        lambda row: MockRecord.from_storage(json.loads(row)),
+        items,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+# Add project root to python path to allow importing src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+from src.infrastructure.persistence.postgres.database import (
+    dispose_engine,
+    get_engine,
+    get_session_factory,
+)
+from src.infrastructure.persistence.postgres.models import Base, MockEndpointModel
+from src.infrastructure.persistence.postgres.repositories.mock_repository import (
+    PostgresMockRepository,
+)
+
+PATH = "/bench/lookup"
+COLUMNS = [column.key for column in MockEndpointModel.__table__.c]
+
+
+async def orm_find(session: AsyncSession) -> object:
+    """The previous lookup: hydrate an ORM instance, then copy its fields."""
+    stmt = select(MockEndpointModel).where(
+        MockEndpointModel.method == HttpMethod.GET.value,
+        MockEndpointModel.path == PATH,
+    )
+    result = await session.execute(stmt)
+    orm_model = result.scalar_one_or_none()
+    mock = MockRecord.from_storage(
+        {column: getattr(orm_model, column) for column in COLUMNS}
+    )
+    # Like core_find, stay in the session's transaction; only drop the
+    # instance so every lookup hydrates a fresh one, as a new request would
+    session.expunge_all()
+    return mock
+
+
+async def core_find(session: AsyncSession) -> object:
+    return await PostgresMockRepository(session).find(HttpMethod.GET, PATH)
+
+
+async def measure(
+    label: str, find: Callable[[AsyncSession], Awaitable[object]], number: int
+) -> None:
+    """Per-lookup wall and CPU time over one pooled connection (best of 3)."""
+    async with get_session_factory()() as session:
+        for _ in range(100):
+            await find(session)
+        wall = cpu = float("inf")
+        for _ in range(3):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            for _ in range(number):
+                await find(session)
+            wall = min(wall, time.perf_counter() - wall_start)
+            cpu = min(cpu, time.process_time() - cpu_start)
+    print(
+        f"  {label:<30} {wall / number * 1e6:>8.0f} us wall"
+        f" {cpu / number * 1e6:>8.0f} us CPU"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare Postgres lookup paths.")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with get_session_factory()() as session:
+        repo = PostgresMockRepository(session)
+        await repo.delete("bench-lookup")
+        await repo.create(
+            MockEndpoint(
+                id="bench-lookup",
+                path=PATH,
+                method=HttpMethod.GET,
+                response_body={"items": [{"id": i} for i in range(20)]},
+                headers={"Content-Type": "application/json"},
+            )
+        )
+
+    print(f"find(GET, {PATH}), {args.number} lookups\n")
+    await measure("ORM select + field copy", orm_find, args.number)
+    await measure("Core prepared select (current)", core_find, args.number)
+
+    async with get_session_factory()() as session:
+        await PostgresMockRepository(session).delete("bench-lookup")
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
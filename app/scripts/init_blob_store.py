@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add project root to python path to allow importing src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from botocore.exceptions import ClientError
+
+from src.config import get_settings
+from src.infrastructure.blobs.s3_store import get_s3_client
+
+
+def init_blob_store() -> None:
+    """
+    Create the bucket for response body blobs (BLOB_STORE=s3 only).
+    The local store creates its directories on first write.
+    """
+    settings = get_settings()
+    if settings.blob_store != "s3":
+        print("BLOB_STORE is not 's3'; nothing to initialize.")
+        return
+
+    bucket = settings.blob_s3_bucket
+    client = get_s3_client()
+    try:
+        client.head_bucket(Bucket=bucket)
+        print(f"Bucket '{bucket}' already exists.")
+        return
+    except ClientError:
+        pass
+
+    print(f"Creating bucket '{bucket}'...")
+    client.create_bucket(Bucket=bucket)
+    print(f"Bucket '{bucket}' created successfully.")
+
+
+if __name__ == "__main__":
+    init_blob_store()
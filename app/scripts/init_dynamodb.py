@@ -1,5 +1,7 @@
 import os
 import sys
+import time
+from typing import Any
 
 # Add project root to python path to allow importing src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -8,6 +10,131 @@ import boto3
 from botocore.exceptions import ClientError
 
 from src.config import get_settings
+from src.infrastructure.dynamodb.converters import PATTERN_ATTRIBUTE, PATTERN_VALUE
+from src.infrastructure.dynamodb.mock_repository import (
+    ID_INDEX_NAME,
+    PATTERN_INDEX_NAME,
+)
+
+# find_by_id / delete 用のGSI (id -> method, path)
+ID_INDEX = {
+    "IndexName": ID_INDEX_NAME,
+    "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+    "Projection": {"ProjectionType": "ALL"},
+}
+
+# パターンの索引の構築用の疎なGSI。パスがパターンの可能性があるアイテムにのみ
+# pattern 属性を付けるため、それ以外のアイテムは含まれない
+PATTERN_INDEX = {
+    "IndexName": PATTERN_INDEX_NAME,
+    "KeySchema": [
+        {"AttributeName": PATTERN_ATTRIBUTE, "KeyType": "HASH"},
+        {"AttributeName": "path", "KeyType": "RANGE"},
+    ],
+    "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["id"]},
+}
+
+
+def ensure_id_index(table: Any) -> None:  # noqa: ANN401
+    """
+    既存テーブルに IdIndex が無ければ追加する。
+    """
+    indexes = table.global_secondary_indexes or []
+    if any(index["IndexName"] == ID_INDEX_NAME for index in indexes):
+        return
+
+    print(f"Adding index '{ID_INDEX_NAME}'...")
+    table.update(
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        GlobalSecondaryIndexUpdates=[{"Create": ID_INDEX}],
+    )
+    wait_for_indexes(table)
+
+
+def ensure_pattern_index(table: Any) -> None:  # noqa: ANN401
+    """
+    既存テーブルに PatternIndex が無ければ追加し、
+    pattern 属性の無い既存のアイテムに属性を付ける (何度実行してもよい)。
+    """
+    indexes = table.global_secondary_indexes or []
+    if not any(index["IndexName"] == PATTERN_INDEX_NAME for index in indexes):
+        print(f"Adding index '{PATTERN_INDEX_NAME}'...")
+        table.update(
+            AttributeDefinitions=[
+                {"AttributeName": PATTERN_ATTRIBUTE, "AttributeType": "S"},
+                {"AttributeName": "path", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": PATTERN_INDEX}],
+        )
+        wait_for_indexes(table)
+
+    # converters.to_item と同じ条件 (routing.may_be_pattern) で付ける
+    kwargs: dict[str, Any] = {
+        "FilterExpression": (
+            "attribute_not_exists(#pt)"
+            " AND (contains(#p, :brace) OR contains(#p, :star))"
+        ),
+        "ProjectionExpression": "#m, #p",
+        "ExpressionAttributeNames": {
+            "#pt": PATTERN_ATTRIBUTE,
+            "#m": "method",
+            "#p": "path",
+        },
+        "ExpressionAttributeValues": {":brace": "{", ":star": "*"},
+    }
+    updated = 0
+    while True:
+        response = table.scan(**kwargs)
+        for key in response.get("Items", []):
+            table.update_item(
+                Key=key,
+                UpdateExpression="SET #pt = :pt",
+                ExpressionAttributeNames={"#pt": PATTERN_ATTRIBUTE},
+                ExpressionAttributeValues={":pt": PATTERN_VALUE},
+            )
+            updated += 1
+        last_key = response.get("LastEvaluatedKey")
+        if last_key is None:
+            break
+        kwargs["ExclusiveStartKey"] = last_key
+    if updated:
+        print(f"Marked {updated} pattern items.")
+
+
+def wait_for_indexes(table: Any) -> None:  # noqa: ANN401
+    """
+    作成中のGSIが使えるようになるまで待つ
+    (作成中は別のGSIを追加できないため)。
+    """
+    while True:
+        table.reload()
+        indexes = table.global_secondary_indexes or []
+        if all(index.get("IndexStatus", "ACTIVE") == "ACTIVE" for index in indexes):
+            return
+        time.sleep(5)
+
+
+def init_state_table(dynamodb: Any, table_name: str) -> None:  # noqa: ANN401
+    """
+    シーケンスのカウンター用テーブルが無ければ作成する
+    (MOCK_STATE_BACKEND=database の場合に使用する)。
+    """
+    try:
+        dynamodb.Table(table_name).load()
+        print(f"Table '{table_name}' already exists.")
+        return
+    except ClientError:
+        pass
+
+    print(f"Creating table '{table_name}'...")
+    table = dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "key", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "key", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists()
+    print(f"Table '{table_name}' created successfully.")
 
 
 def init_dynamodb() -> None:
@@ -29,6 +156,8 @@ def init_dynamodb() -> None:
         aws_secret_access_key=settings.aws_secret_access_key,
     )
 
+    init_state_table(dynamodb, settings.dynamodb_state_table_name)
+
     table_name = "MockTable"
 
     try:
@@ -36,6 +165,8 @@ def init_dynamodb() -> None:
         # Check if table exists
         table.load()
         print(f"Table '{table_name}' already exists.")
+        ensure_id_index(table)
+        ensure_pattern_index(table)
 
         return
     except ClientError:
@@ -51,12 +182,16 @@ def init_dynamodb() -> None:
                 {"AttributeName": "method", "KeyType": "HASH"},
                 {"AttributeName": "path", "KeyType": "RANGE"},
             ],
-            # AttributeDefinitionsにはキーに使用する属性のみを定義する
+            # AttributeDefinitionsにはキー(GSIを含む)に使用する属性のみを定義する
             AttributeDefinitions=[
                 {"AttributeName": "method", "AttributeType": "S"},
                 {"AttributeName": "path", "AttributeType": "S"},
+                {"AttributeName": "id", "AttributeType": "S"},
+                {"AttributeName": PATTERN_ATTRIBUTE, "AttributeType": "S"},
             ],
-            # GSI (GlobalSecondaryIndexes) は今回の設計で削除されたため指定しない
+            # id から1回のQueryでモックを引けるようにする (Scanの回避)
+            # パターンの索引はパターンのアイテムのみをQueryで読み込む
+            GlobalSecondaryIndexes=[ID_INDEX, PATTERN_INDEX],
             # Terraformの設定 (billing_mode="PAY_PER_REQUEST") に合わせる
             BillingMode="PAY_PER_REQUEST",
         )
@@ -5,10 +5,37 @@ import sys
 # Add project root to python path to allow importing src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
 
 from src.config import get_settings
-from src.infrastructure.persistence.postgres.models import Base
+from src.infrastructure.persistence.postgres.models import Base, MockEndpointModel
+
+# 作成後に追加した列。create_all は既存テーブルを変更しないため個別に追加する
+ADDED_COLUMNS = (
+    "latency",
+    "rules",
+    "sequence",
+    "streaming",
+    "body_ref",
+    "binary_body",
+)
+
+
+async def ensure_columns(conn: AsyncConnection) -> None:
+    """
+    既存の mock_endpoints に無い列を追加する (何度実行してもよい)。
+    """
+    table = MockEndpointModel.__table__
+    for name in ADDED_COLUMNS:
+        column = table.c[name]
+        column_type = column.type.compile(dialect=conn.dialect)
+        await conn.execute(
+            text(
+                f"ALTER TABLE {table.name} "
+                f"ADD COLUMN IF NOT EXISTS {name} {column_type}"
+            )
+        )
 
 
 async def init_postgres() -> None:
@@ -32,6 +59,8 @@ async def init_postgres() -> None:
             # 既存のテーブルを削除して作り直す場合は drop_all を有効にする
             # /await conn.run_sync(Base.metadata.drop_all)/
             await conn.run_sync(Base.metadata.create_all)
+            print("Adding missing columns...")
+            await ensure_columns(conn)
             print("Tables created successfully.")
     except Exception as e:
         print(f"Error creating tables: {e}")
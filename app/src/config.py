@@ -12,11 +12,37 @@ class Settings(BaseSettings):
     # DynamoDB
     # Lambda環境ではNone（AWS DynamoDBを使用）、ローカル開発では環境変数で指定
     dynamodb_endpoint_url: str | None = None
+    dynamodb_table_name: str = "MockTable"
+    # シーケンスのカウンター用テーブル (mock_state_backend="database" の場合)
+    dynamodb_state_table_name: str = "MockStateTable"
+    # boto3: 同期クライアントをスレッドで実行 / async: ネイティブ非同期クライアント
+    dynamodb_client: str = "boto3"  # "boto3" or "async"
+    # botocore Config (プロセス内で共有するクライアントの設定)
+    dynamodb_max_pool_connections: int = 50
+    dynamodb_tcp_keepalive: bool = True
+    dynamodb_connect_timeout_seconds: float = 2.0
+    dynamodb_read_timeout_seconds: float = 5.0
+    dynamodb_max_retry_attempts: int = 3
 
     # Database
     db_type: str = "dynamodb"  # "dynamodb" or "postgres"
     postgres_dsn: str | None = None
 
+    # PostgreSQL connection pool
+    postgres_pool_size: int = 5
+    postgres_max_overflow: int = 10
+    postgres_pool_recycle_seconds: int = 1800  # -1 で無効
+    postgres_pool_timeout_seconds: float = 30.0
+    postgres_pool_pre_ping: bool = True
+    # 起動時に確立しておく接続数 (pool_size が上限)
+    postgres_pool_warmup_connections: int = 5
+    # 他プロセスでのモックの変更を LISTEN/NOTIFY で受け取り、ルートキャッシュに反映する
+    # (有効な場合、mock_cache_ttl_seconds / mock_router_refresh_seconds は長くできる)
+    postgres_change_listener: bool = True
+    # 通知の取りこぼしを版番号で確認する間隔 / 切断時に再接続を試みる間隔
+    postgres_change_check_seconds: float = 5.0
+    postgres_change_retry_seconds: float = 1.0
+
     # AWS
     aws_default_region: str = "us-east-1"
     aws_access_key_id: str = "dummy"
@@ -24,6 +50,48 @@ class Settings(BaseSettings):
 
     # App
     log_level: str = "INFO"
+    # DB の JSON 列、DynamoDB の通信、リクエストボディの JSON 処理
+    # auto: orjson があれば orjson、なければ標準ライブラリ
+    json_codec: str = "auto"  # "auto", "orjson" or "stdlib"
+
+    # Mock route cache (プロセス内キャッシュ)
+    # max_entries を 0 にするとキャッシュを無効化する
+    mock_cache_max_entries: int = 10_000
+    mock_cache_ttl_seconds: float = 30.0
+    # 404 となったパスを記録する時間。0 で negative cache を無効化する
+    mock_cache_negative_ttl_seconds: float = 2.0
+    # パスパターン ({id}, *, **) の索引を全件から作り直す間隔
+    mock_router_refresh_seconds: float = 30.0
+
+    # Template engine (コンパイル済みテンプレートの保持数)
+    template_cache_max_entries: int = 1024
+
+    # Sequence mocks の進行状況
+    # memory: プロセス内に保持 / database: db_type のデータベースで全プロセスが共有
+    mock_state_backend: str = "memory"  # "memory" or "database"
+    # database の場合に増分をまとめて書き出す間隔。0 はリクエストごとに加算する
+    mock_state_flush_seconds: float = 0.0
+
+    # Response body blobs
+    # none: ボディは常にモックと一緒に保存する (Lambda など複数インスタンスでも安全)
+    # local: ローカルディレクトリ (単一ホスト向け) / s3: 全プロセスで共有するバケット
+    blob_store: str = "none"  # "none", "local" or "s3"
+    # ブロブストアを使う場合、エンコード後にこのサイズを超える静的なボディを置く
+    blob_inline_max_bytes: int = 256 * 1024
+    # local: 保存先 / s3: 取得したブロブのキャッシュ
+    blob_local_dir: str = ".blobs"
+    # 開いたままにするメモリマップの数。それぞれファイルディスクリプタを使う
+    blob_map_max_entries: int = 64
+    blob_s3_bucket: str = "mock-response-bodies"
+    # ローカル開発ではS3互換サーバーのURLを指定する
+    blob_s3_endpoint_url: str | None = None
+
+    # 一括登録 (POST /api/mocks/bulk) で受け付ける1行の最大バイト数。
+    # 超えた行は読み込まずに、その行の失敗として報告する
+    bulk_max_line_bytes: int = 8 * 1024 * 1024
+
+    # Latency simulation (この間隔内に期限を迎える遅延はまとめて解放する)
+    latency_timer_resolution_ms: float = 1.0
 
     model_config = SettingsConfigDict(
         env_file=".env.local", env_file_encoding="utf-8", extra="ignore"
@@ -1,16 +1,48 @@
+from collections.abc import AsyncIterator
 from functools import lru_cache
+from pathlib import Path
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import get_settings
-from src.domain.mocks.repository import MockRepository
+from src.domain.mocks.blobs import BlobStore
+from src.domain.mocks.bulk import iter_ndjson_lines
+from src.domain.mocks.cache import MockRouteCache
+from src.domain.mocks.exceptions import LineTooLongError
+from src.domain.mocks.latency import LatencyScheduler
+from src.domain.mocks.repository import MockReader, MockRepository
+from src.domain.mocks.responses import StaticPayloadCache
+from src.domain.mocks.routing import MockRouter
 from src.domain.mocks.services import MockManagementService, MockSimulatorService
+from src.domain.mocks.state import (
+    CounterBackend,
+    CounterStore,
+    InMemoryCounterStore,
+    SharedCounterStore,
+)
 from src.domain.mocks.template_engine import TemplateEngine
+from src.infrastructure.blobs.local_store import LocalBlobStore
+from src.infrastructure.blobs.s3_store import S3BlobStore, get_s3_client
+from src.infrastructure.dynamodb.async_client import get_async_dynamodb_client
+from src.infrastructure.dynamodb.async_mock_repository import (
+    AsyncDynamoMockRepository,
+)
+from src.infrastructure.dynamodb.counter_store import DynamoCounterBackend
 from src.infrastructure.dynamodb.mock_repository import DynamoMockRepository
-from src.infrastructure.persistence.postgres.database import get_db_session
+from src.infrastructure.persistence.postgres.database import (
+    DEFAULT_DATABASE_URL,
+    get_db_session,
+    get_engine,
+    get_session_factory,
+)
+from src.infrastructure.persistence.postgres.notifications import MockChangeListener
+from src.infrastructure.persistence.postgres.repositories.counter_backend import (
+    PostgresCounterBackend,
+)
 from src.infrastructure.persistence.postgres.repositories.mock_repository import (
+    PostgresMockReader,
     PostgresMockRepository,
 )
 
@@ -26,7 +58,27 @@ async def get_repository(
         if session is None:
             raise RuntimeError("Database session is not available")
         return PostgresMockRepository(session)
-    return DynamoMockRepository()
+    return _dynamo_repository()
+
+
+def get_mock_reader() -> MockReader:
+    """
+    Provides the read-only repository used by the simulator. For PostgreSQL
+    it opens no per-request session: each lookup borrows a pooled connection
+    and releases it before latency simulation and rendering.
+    """
+    if get_settings().db_type == "postgres":
+        return PostgresMockReader(get_engine())
+    return _dynamo_repository()
+
+
+def _dynamo_repository() -> MockRepository:
+    settings = get_settings()
+    if settings.dynamodb_client == "async":
+        return AsyncDynamoMockRepository(
+            get_async_dynamodb_client(), settings.dynamodb_table_name
+        )
+    return DynamoMockRepository(settings.dynamodb_table_name)
 
 
 @lru_cache
@@ -34,24 +86,155 @@ def get_template_engine() -> TemplateEngine:
     """
     Provides a singleton instance of the TemplateEngine.
     """
-    return TemplateEngine()
+    settings = get_settings()
+    return TemplateEngine(max_cached_templates=settings.template_cache_max_entries)
+
+
+@lru_cache
+def get_mock_route_cache() -> MockRouteCache:
+    """
+    Provides the process-wide route cache shared by the management and
+    simulation services.
+    """
+    settings = get_settings()
+    return MockRouteCache(
+        max_entries=settings.mock_cache_max_entries,
+        ttl_seconds=settings.mock_cache_ttl_seconds,
+        negative_ttl_seconds=settings.mock_cache_negative_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_mock_router() -> MockRouter:
+    """
+    Provides the process-wide router that resolves exact paths through the
+    route cache and path patterns through an in-memory trie.
+    """
+    settings = get_settings()
+    return MockRouter(
+        get_mock_route_cache(), refresh_seconds=settings.mock_router_refresh_seconds
+    )
+
+
+@lru_cache
+def get_mock_change_listener() -> MockChangeListener:
+    """
+    Provides the process-wide listener that applies mock changes made by other
+    processes on the same PostgreSQL database to the router.
+    """
+    settings = get_settings()
+    return MockChangeListener(
+        settings.postgres_dsn or DEFAULT_DATABASE_URL,
+        get_mock_router(),
+        check_seconds=settings.postgres_change_check_seconds,
+        retry_seconds=settings.postgres_change_retry_seconds,
+    )
+
+
+@lru_cache
+def get_static_payload_cache() -> StaticPayloadCache:
+    """
+    Provides the process-wide cache of pre-encoded responses for static mocks.
+    """
+    settings = get_settings()
+    return StaticPayloadCache(max_entries=settings.mock_cache_max_entries)
+
+
+@lru_cache
+def get_latency_scheduler() -> LatencyScheduler:
+    """
+    Provides the process-wide scheduler for simulated latency.
+    """
+    settings = get_settings()
+    return LatencyScheduler(
+        resolution_seconds=settings.latency_timer_resolution_ms / 1000
+    )
+
+
+@lru_cache
+def get_counter_store() -> CounterStore:
+    """
+    Provides the process-wide store of sequence progress: in memory, or shared
+    through the configured database.
+    """
+    settings = get_settings()
+    if settings.mock_state_backend != "database":
+        return InMemoryCounterStore()
+    backend: CounterBackend
+    if settings.db_type == "postgres":
+        backend = PostgresCounterBackend(get_session_factory())
+    else:
+        backend = DynamoCounterBackend(settings.dynamodb_state_table_name)
+    return SharedCounterStore(backend, settings.mock_state_flush_seconds)
+
+
+@lru_cache
+def get_blob_store() -> BlobStore:
+    """
+    Provides the process-wide store for response bodies kept out of line.
+    """
+    settings = get_settings()
+    local = LocalBlobStore(
+        Path(settings.blob_local_dir), max_maps=settings.blob_map_max_entries
+    )
+    if settings.blob_store == "s3":
+        return S3BlobStore(get_s3_client(), settings.blob_s3_bucket, local)
+    return local
+
+
+def _blob_inline_max_bytes() -> int | None:
+    settings = get_settings()
+    if settings.blob_store == "none":
+        # Without a configured store every body stays inline
+        return None
+    return settings.blob_inline_max_bytes
 
 
 def get_mock_mgmt_service(
     repo: Annotated[MockRepository, Depends(get_repository)],
+    router: Annotated[MockRouter, Depends(get_mock_router)],
 ) -> MockManagementService:
     """
-    Provides an instance of MockManagementService with repository injected.
+    Provides an instance of MockManagementService with repository, router and
+    the process-wide counter and blob stores injected.
     """
-    return MockManagementService(repo)
+    return MockManagementService(
+        repo,
+        router,
+        get_counter_store(),
+        get_blob_store(),
+        inline_max_bytes=_blob_inline_max_bytes(),
+    )
+
+
+def get_bulk_lines(
+    request: Request,
+) -> AsyncIterator[tuple[int, bytes | LineTooLongError]]:
+    """
+    Provides the numbered lines of a streamed bulk import body, with lines
+    over the configured maximum reported instead of buffered.
+    """
+    return iter_ndjson_lines(request.stream(), get_settings().bulk_max_line_bytes)
 
 
 def get_mock_sim_service(
-    repo: Annotated[MockRepository, Depends(get_repository)],
+    repo: Annotated[MockReader, Depends(get_mock_reader)],
     template_engine: Annotated[TemplateEngine, Depends(get_template_engine)],
+    router: Annotated[MockRouter, Depends(get_mock_router)],
+    payload_cache: Annotated[StaticPayloadCache, Depends(get_static_payload_cache)],
+    latency_scheduler: Annotated[LatencyScheduler, Depends(get_latency_scheduler)],
 ) -> MockSimulatorService:
     """
-    Provides an instance of MockSimulatorService with repository and template engine
-    injected.
+    Provides an instance of MockSimulatorService with the read-only repository,
+    template engine, router, payload cache, latency scheduler and the
+    process-wide counter and blob stores injected.
     """
-    return MockSimulatorService(repo, template_engine)
+    return MockSimulatorService(
+        repo,
+        template_engine,
+        router,
+        payload_cache,
+        latency_scheduler,
+        counters=get_counter_store(),
+        blobs=get_blob_store(),
+    )
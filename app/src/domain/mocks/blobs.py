@@ -0,0 +1,27 @@
+from pathlib import Path
+from typing import Protocol
+
+
+class BlobStore(Protocol):
+    """
+    内容のハッシュ (SHA-256) をキーにしたレスポンスボディの保存先。
+    同じ内容は1つだけ保存され、保存済みの内容は変更されない。
+    """
+
+    async def put(self, data: bytes) -> str:
+        """内容を保存し、ダイジェスト (16進数) を返す"""
+        ...
+
+    async def local_path(self, digest: str) -> Path | None:
+        """
+        内容を読めるローカルファイルのパスを返す。存在しなければ None。
+        リモートのストアは初回にローカルへ取得してから返す。
+        """
+        ...
+
+    async def mapped(self, digest: str) -> memoryview | None:
+        """
+        内容をメモリマップした読み取り専用のバッファを返す。存在しなければ None。
+        マップはプロセス内で共有され、リクエストごとにファイルを読み込まない。
+        """
+        ...
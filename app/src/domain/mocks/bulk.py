@@ -0,0 +1,62 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+from src.domain.mocks.exceptions import LineTooLongError
+from src.domain.mocks.records import MockRecord
+
+# エクスポート時にまとめて送信するチャンクの目安サイズ
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | LineTooLongError]]:
+    """
+    受信中のボディを改行で区切り、(行番号, 行) を返す。空行は読み飛ばす。
+    ボディ全体をメモリに載せないため、行の途中で分割されたチャンクも扱う。
+    max_line_bytes を超える行は保持せずに読み飛ばし、行の代わりに
+    LineTooLongError を返す。
+    """
+    line_no = 0
+    # 改行までの断片。連結は行が揃ったときに1回だけ行う
+    parts: list[bytes] = []
+    size = 0
+    async for chunk in chunks:
+        if b"\n" not in chunk:
+            size += len(chunk)
+            if size <= max_line_bytes:
+                parts.append(chunk)
+            else:
+                parts.clear()
+            continue
+        *pieces, tail = chunk.split(b"\n")
+        for piece in pieces:
+            line_no += 1
+            size += len(piece)
+            if size > max_line_bytes:
+                yield line_no, LineTooLongError(max_line_bytes)
+            else:
+                line = b"".join([*parts, piece]) if parts else piece
+                if line.strip():
+                    yield line_no, line
+            parts, size = [], 0
+        size = len(tail)
+        parts = [tail] if tail and size <= max_line_bytes else []
+    if size > max_line_bytes:
+        yield line_no + 1, LineTooLongError(max_line_bytes)
+    elif parts and (line := b"".join(parts)).strip():
+        yield line_no + 1, line
+
+
+async def encode_ndjson(mocks: AsyncIterator[MockRecord]) -> AsyncIterator[bytes]:
+    """モックを1行1件の JSON に変換し、EXPORT_CHUNK_BYTES 程度ずつ返す"""
+    buffer: list[bytes] = []
+    size = 0
+    async for mock in mocks:
+        line = mock.to_model().model_dump_json().encode() + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
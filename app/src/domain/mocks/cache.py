@@ -0,0 +1,149 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, mock_key
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry(Generic[V]):
+    """キャッシュされた値と有効期限(monotonic秒)"""
+
+    value: V
+    expires_at: float
+
+
+class LruCache(Generic[K, V]):
+    """
+    サイズ上限とTTLを持つLRUキャッシュ。
+
+    操作はすべて同期的で await を挟まないため、
+    単一のイベントループ上ではロックなしで安全に共有できる。
+    max_entries が 0 の場合は何も保持しない(キャッシュ無効)。
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> CacheEntry[V] | None:
+        """有効なエントリを返す。期限切れのエントリは破棄してNoneを返す"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """値を保存する。上限を超えた場合は最も古く使われたエントリを追い出す"""
+        ttl = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        if self._max_entries <= 0 or ttl <= 0:
+            return
+        self._entries[key] = CacheEntry(value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def items(self) -> list[tuple[K, V]]:
+        return [(key, entry.value) for key, entry in self._entries.items()]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class MockRouteCache:
+    """
+    シミュレーション用のプロセス内ルートテーブルキャッシュ。
+
+    MockRecord.key をキーに MockRecord を保持する。
+    存在しないパスは None として negative_ttl_seconds の間だけ記録し、
+    404 となるリクエストでもリポジトリへの問い合わせを省略する。
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: LruCache[str, MockRecord | None] = LruCache(
+            max_entries, ttl_seconds, clock
+        )
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        無効化のたびに増える世代番号。
+        リポジトリ参照の前に取得して put に渡すことで、
+        参照中に無効化された古い結果の書き戻しを防ぐ。
+        """
+        return self._generation
+
+    def get(
+        self, method: HttpMethod, path: str
+    ) -> CacheEntry[MockRecord | None] | None:
+        """キャッシュを参照する。未キャッシュならNone、404記録なら value が None"""
+        return self._entries.get(mock_key(method, path))
+
+    def put(
+        self,
+        method: HttpMethod,
+        path: str,
+        mock: MockRecord | None,
+        generation: int,
+    ) -> None:
+        """リポジトリの参照結果を保存する。mock が None の場合は 404 として記録する"""
+        if generation != self._generation:
+            return
+        key = mock_key(method, path)
+        if mock is None:
+            self._entries.put(key, None, self._negative_ttl_seconds)
+            return
+        self._entries.put(key, mock)
+
+    def invalidate(self, method: HttpMethod, path: str) -> None:
+        self._generation += 1
+        self._entries.pop(mock_key(method, path))
+
+    def invalidate_id(self, mock_id: str) -> None:
+        """
+        IDでエントリを無効化する。
+        削除はまれな操作のため、逆引き表を持たず全走査で対応する。
+        """
+        self._generation += 1
+        stale_keys = [
+            key
+            for key, mock in self._entries.items()
+            if mock is not None and mock.id == mock_id
+        ]
+        for key in stale_keys:
+            self._entries.pop(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
@@ -0,0 +1,106 @@
+import gzip
+import threading
+from collections.abc import Callable, Collection
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 任意の依存 (compression extra)
+    brotli = None  # type: ignore[assignment, unused-ignore]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 任意の依存 (compression extra)
+    zstandard = None  # type: ignore[assignment, unused-ignore]
+
+Compressor = Callable[[bytes], bytes]
+
+# これより小さいボディは圧縮しても効果が小さいため、そのまま送る
+MIN_COMPRESS_BYTES = 1024
+
+# 圧縮は登録時かキャッシュ充填時の1回のみのため高めのレベルを使うが、
+# 充填時にイベントループを長く止めない程度に抑える
+_GZIP_LEVEL = 9
+_BROTLI_QUALITY = 9
+_ZSTD_LEVEL = 12
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime を固定して、同じボディからは常に同じバイト列を作る
+    return gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+
+
+# ZstdCompressor はスレッド間で共有できない (compress_variants はワーカー
+# スレッドでも呼ばれる) ため、スレッドごとに作る
+_zstd_local = threading.local()
+
+
+def _zstd(body: bytes) -> bytes:
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+        _zstd_local.compressor = compressor
+    encoded: bytes = compressor.compress(body)
+    return encoded
+
+
+def _available_codecs() -> dict[str, Compressor]:
+    """利用できる圧縮方式 (圧縮率の高い順 = 優先順)"""
+    codecs: dict[str, Compressor] = {}
+    if zstandard is not None:
+        codecs["zstd"] = _zstd
+    if brotli is not None:
+        codecs["br"] = lambda body: brotli.compress(body, quality=_BROTLI_QUALITY)
+    codecs["gzip"] = _gzip
+    return codecs
+
+
+CODECS: dict[str, Compressor] = _available_codecs()
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    """
+    ボディを利用できる全ての方式で圧縮する。
+    元より小さくならなかった方式 (圧縮済みの画像等) は含めない。
+    """
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {}
+    variants: dict[str, bytes] = {}
+    for encoding, compress in CODECS.items():
+        encoded = compress(body)
+        if len(encoded) < len(body):
+            variants[encoding] = encoded
+    return variants
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Accept-Encoding を 方式 -> q値 に変換する (方式名は小文字)"""
+    weights: dict[str, float] = {}
+    for item in header.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.lower()] = q
+    return weights
+
+
+def select_encoding(header: str | None, available: Collection[str]) -> str | None:
+    """
+    Accept-Encoding で受け入れられる方式のうち、サーバー側の優先順で最初のもの。
+    受け入れられる方式が無い場合は None (無圧縮で送る)。
+    """
+    if not header or not available:
+        return None
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    for encoding in CODECS:
+        if encoding in available and weights.get(encoding, wildcard) > 0:
+            return encoding
+    return None
@@ -19,3 +19,15 @@ class MockAlreadyExistsError:
 class InvalidMockError:
     reason: str
     message: str = "Invalid mock definition"
+
+
+@dataclass(frozen=True)
+class InvalidCursorError:
+    cursor: str
+    message: str = "Invalid pagination cursor"
+
+
+@dataclass(frozen=True)
+class LineTooLongError:
+    max_bytes: int
+    message: str = "Line exceeds the maximum length"
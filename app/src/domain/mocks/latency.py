@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import random
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from src.domain.mocks.schemas import (
+    LatencyDistribution,
+    LatencyMetrics,
+    LatencyProfile,
+)
+
+
+def sample_latency_ms(
+    latency_ms: int, profile: LatencyProfile | None, rng: random.Random
+) -> float:
+    """
+    遅延プロファイルに従って今回の遅延時間(ms)を決定する。
+    プロファイルが無い場合は latency_ms 固定。
+    """
+    if profile is None:
+        return float(latency_ms)
+
+    match profile.distribution:
+        case LatencyDistribution.FIXED:
+            sampled = float(latency_ms)
+        case LatencyDistribution.UNIFORM:
+            sampled = rng.uniform(profile.min_ms, profile.max_ms or latency_ms)
+        case LatencyDistribution.NORMAL:
+            sampled = rng.gauss(latency_ms, profile.stddev_ms)
+        case LatencyDistribution.JITTER:
+            sampled = latency_ms + rng.uniform(-profile.jitter_ms, profile.jitter_ms)
+        case LatencyDistribution.PERCENTILE:
+            sampled = _sample_percentiles(profile.percentiles, rng)
+    return max(sampled, 0.0)
+
+
+def _sample_percentiles(percentiles: dict[int, int], rng: random.Random) -> float:
+    """
+    パーセンタイル表 (例: {50: 100, 99: 800}) を区分線形の逆累積分布とみなして
+    サンプリングする。表の外側は端の値で打ち切る。
+    """
+    if not percentiles:
+        return 0.0
+    points = sorted(percentiles.items())
+    ranks = [rank for rank, _ in points]
+    quantile = rng.uniform(0, 100)
+
+    index = bisect_left(ranks, quantile)
+    if index == 0:
+        return float(points[0][1])
+    if index == len(points):
+        return float(points[-1][1])
+
+    (low_rank, low_ms), (high_rank, high_ms) = points[index - 1], points[index]
+    ratio = (quantile - low_rank) / (high_rank - low_rank)
+    return low_ms + (high_ms - low_ms) * ratio
+
+
+@dataclass(order=True, slots=True)
+class _Timer:
+    deadline: float
+    sequence: int
+    waiter: asyncio.Future[None] = field(compare=False)
+
+
+class LatencyScheduler:
+    """
+    遅延レスポンスのためのプロセス内タイマー。
+
+    待機中のリクエストは期限順のヒープに積み、イベントループには
+    最も早い期限のタイマーを1つだけ登録する。期限が来たものは
+    resolution_seconds 内の近いものとまとめて起こすため、
+    数万件の同時遅延でもタイマー登録の数はリクエスト数に比例しない。
+
+    イベントループが変わった場合 (テストクライアントの再作成等) は状態を作り直す。
+    """
+
+    def __init__(
+        self, resolution_seconds: float = 0.001, rng: random.Random | None = None
+    ) -> None:
+        self._resolution_seconds = resolution_seconds
+        self._rng = rng or random.Random()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._heap: list[_Timer] = []
+        self._sequence = itertools.count()
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_deadline = 0.0
+        # メトリクス
+        self._scheduled = 0
+        self._completed = 0
+        self._total_skew_ms = 0.0
+        self._max_skew_ms = 0.0
+
+    async def delay(self, latency_ms: int, profile: LatencyProfile | None) -> None:
+        """モックの遅延設定に従って待機する"""
+        await self.sleep(sample_latency_ms(latency_ms, profile, self._rng) / 1000)
+
+    async def sleep(self, delay_seconds: float) -> None:
+        """delay_seconds 秒後まで待機する"""
+        if delay_seconds <= 0:
+            return
+
+        loop = self._bind(asyncio.get_running_loop())
+        deadline = loop.time() + delay_seconds
+        waiter: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._heap, _Timer(deadline, next(self._sequence), waiter))
+        self._scheduled += 1
+
+        if self._handle is None or deadline < self._handle_deadline:
+            self._arm(loop, deadline)
+        await waiter
+
+    def metrics(self) -> LatencyMetrics:
+        average = self._total_skew_ms / self._completed if self._completed else 0.0
+        return LatencyMetrics(
+            scheduled=self._scheduled,
+            completed=self._completed,
+            pending=len(self._heap),
+            average_skew_ms=average,
+            max_skew_ms=self._max_skew_ms,
+        )
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> asyncio.AbstractEventLoop:
+        if self._loop is not loop:
+            self._loop = loop
+            self._heap = []
+            self._handle = None
+        return loop
+
+    def _arm(self, loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle_deadline = deadline
+        self._handle = loop.call_at(deadline, self._fire, loop)
+
+    def _fire(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._handle = None
+        if loop is not self._loop:
+            return
+
+        now = loop.time()
+        horizon = now + self._resolution_seconds
+        while self._heap and self._heap[0].deadline <= horizon:
+            timer = heapq.heappop(self._heap)
+            # クライアント切断などでキャンセル済みの待機はスキップする
+            if timer.waiter.done():
+                continue
+            timer.waiter.set_result(None)
+            self._record_skew((now - timer.deadline) * 1000)
+
+        if self._heap:
+            self._arm(loop, self._heap[0].deadline)
+
+    def _record_skew(self, skew_ms: float) -> None:
+        self._completed += 1
+        self._total_skew_ms += skew_ms
+        self._max_skew_ms = max(self._max_skew_ms, skew_ms)
@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod
+
+# ページ境界を表すキー (method, path)。バックエンドの走査順でこのキーの次から再開する
+MockKey = tuple[HttpMethod, str]
+
+
+def encode_cursor(mock: MockRecord) -> str:
+    """モックのキーを URL セーフな不透明カーソルに変換する"""
+    raw = json.dumps([mock.method.value, mock.path], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> MockKey:
+    """
+    カーソルをキーに戻す。
+    不正な値の場合は ValueError を送出する。
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        method, path = json.loads(base64.urlsafe_b64decode(padded))
+        key = (HttpMethod(method), path)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {cursor!r}") from e
+    if not isinstance(path, str):
+        raise ValueError(f"Malformed cursor: {cursor!r}")
+    return key
+
+
+async def stream_page(
+    mocks: AsyncGenerator[MockRecord, None], limit: int | None
+) -> AsyncIterator[bytes]:
+    """
+    {"items": [...], "next_cursor": ...} 形式の JSON をモック1件ずつ書き出す。
+    limit 件を超える要素があれば、最後に返したモックのカーソルを next_cursor にする。
+    全件を保持しないため、件数に関わらずメモリ使用量は一定。
+    途中で打ち切った場合も mocks を閉じ、カーソル等のリソースを解放する。
+    """
+    yield b'{"items":['
+    count = 0
+    last: MockRecord | None = None
+    has_more = False
+    async with aclosing(mocks):
+        async for mock in mocks:
+            if limit is not None and count >= limit:
+                has_more = True
+                break
+            yield (b"," if count else b"") + mock.to_model().model_dump_json().encode()
+            count += 1
+            last = mock
+
+    next_cursor = encode_cursor(last) if has_more and last is not None else None
+    yield b'],"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
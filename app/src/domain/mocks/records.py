@@ -0,0 +1,147 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.domain.mocks.schemas import (
+    STORED_CONTEXT,
+    BlobRef,
+    HttpMethod,
+    LatencyProfile,
+    MockEndpoint,
+    MockRule,
+    MockSequence,
+    StreamingProfile,
+    mock_key,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MockLocation:
+    """
+    モックの id とメソッド・パスのみ。パターンの索引の構築では、
+    ボディ等を含む定義全体を読み込まずにこれだけを取得する。
+    """
+
+    id: str
+    method: HttpMethod
+    path: str
+
+    @classmethod
+    def from_storage(cls, data: Mapping[str, Any]) -> "MockLocation":
+        return cls(id=data["id"], method=HttpMethod(data["method"]), path=data["path"])
+
+
+@dataclass(frozen=True, slots=True)
+class MockRecord:
+    """
+    保存済みのモック定義の実行時表現。
+
+    ルートキャッシュに大量に保持するため、Pydantic モデルではなく
+    __slots__ を持つ不変の dataclass とする (インスタンスごとの __dict__ や
+    fields_set を持たない)。
+    値は登録時に MockEndpoint として検証済みのため、ストレージから読み込む際は
+    検証し直さない。API に返す場合は to_model で MockEndpoint に変換する。
+    """
+
+    id: str
+    path: str
+    method: HttpMethod
+    status_code: int
+    response_body: dict[str, Any] | str
+    headers: dict[str, str]
+    latency_ms: int
+    latency: LatencyProfile | None
+    rules: tuple[MockRule, ...]
+    sequence: MockSequence | None
+    streaming: StreamingProfile | None
+    binary_body: bytes | None
+    body_ref: BlobRef | None
+
+    @property
+    def key(self) -> str:
+        """ユニークキー: メソッドとパスの組み合わせ"""
+        return mock_key(self.method, self.path)
+
+    @classmethod
+    def from_model(cls, mock: MockEndpoint) -> "MockRecord":
+        """検証済みの MockEndpoint から作る (値はコピーせずに共有する)"""
+        return cls(
+            id=mock.id,
+            path=mock.path,
+            method=mock.method,
+            status_code=mock.status_code,
+            response_body=mock.response_body,
+            headers=mock.headers,
+            latency_ms=mock.latency_ms,
+            latency=mock.latency,
+            rules=tuple(mock.rules),
+            sequence=mock.sequence,
+            streaming=mock.streaming,
+            binary_body=mock.binary_body,
+            body_ref=mock.body_ref,
+        )
+
+    @classmethod
+    def from_storage(cls, data: Mapping[str, Any]) -> "MockRecord":
+        """
+        ストレージから読み込んだ値 (JSON 互換の辞書) から検証せずに作る。
+        遅延やルール等の入れ子の設定は、指定されている場合のみモデルに変換する
+        (型の変換のみで、正規表現のコンパイル等の確認は繰り返さない)。
+        後から追加された項目を持たない古いデータは既定値で補う。
+        """
+        latency = data.get("latency")
+        sequence = data.get("sequence")
+        streaming = data.get("streaming")
+        body_ref = data.get("body_ref")
+        return cls(
+            id=data["id"],
+            path=data["path"],
+            method=HttpMethod(data["method"]),
+            status_code=data.get("status_code", 200),
+            response_body=data.get("response_body", {}),
+            headers=data.get("headers") or {},
+            latency_ms=data.get("latency_ms", 0),
+            latency=(
+                LatencyProfile.model_validate(latency, context=STORED_CONTEXT)
+                if latency
+                else None
+            ),
+            rules=tuple(
+                MockRule.model_validate(rule, context=STORED_CONTEXT)
+                for rule in data.get("rules") or ()
+            ),
+            sequence=(
+                MockSequence.model_validate(sequence, context=STORED_CONTEXT)
+                if sequence
+                else None
+            ),
+            streaming=(
+                StreamingProfile.model_validate(streaming, context=STORED_CONTEXT)
+                if streaming
+                else None
+            ),
+            binary_body=data.get("binary_body"),
+            body_ref=(
+                BlobRef.model_validate(body_ref, context=STORED_CONTEXT)
+                if body_ref
+                else None
+            ),
+        )
+
+    def to_model(self) -> MockEndpoint:
+        """API で返すための MockEndpoint (検証済みの値のため検証はしない)"""
+        return MockEndpoint.model_construct(
+            id=self.id,
+            path=self.path,
+            method=self.method,
+            status_code=self.status_code,
+            response_body=self.response_body,
+            headers=self.headers,
+            latency_ms=self.latency_ms,
+            latency=self.latency,
+            rules=list(self.rules),
+            sequence=self.sequence,
+            streaming=self.streaming,
+            binary_body=self.binary_body,
+            body_ref=self.body_ref,
+        )
@@ -1,25 +1,94 @@
+from collections.abc import AsyncGenerator, Iterable
+from dataclasses import dataclass, field
 from typing import Protocol
 
+from src.domain.mocks.pagination import MockKey
+from src.domain.mocks.records import MockLocation, MockRecord
 from src.domain.mocks.schemas import HttpMethod, MockEndpoint
 
 
-class MockRepository(Protocol):
+@dataclass(frozen=True, slots=True)
+class BulkCreateResult:
+    """
+    create_many の結果。created は保存したモック、rejected はキーの重複以外の
+    理由 (項目の大きさの上限等) で保存できなかったモックの id と理由。
+    どちらにも含まれないモックは、キーが登録済みだったもの。
+    """
+
+    created: list[MockEndpoint]
+    rejected: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def combine(cls, results: Iterable["BulkCreateResult"]) -> "BulkCreateResult":
+        combined = cls(created=[])
+        for result in results:
+            combined.created.extend(result.created)
+            combined.rejected.update(result.rejected)
+        return combined
+
+
+class MockReader(Protocol):
+    """
+    モックの読み込みのみを行うリポジトリ (シミュレーターが使う)。
+    読み込みは検証し直さずに作った MockRecord を返す。
+    """
+
+    async def find(self, method: HttpMethod, path: str) -> MockRecord | None:
+        """メソッドとパスでモックを検索する"""
+        ...
+
+    def iter_locations(
+        self, page_size: int = 1000
+    ) -> AsyncGenerator[MockLocation, None]:
+        """
+        全てのモックの id, method, path のみを page_size 件ずつ読み込みながら返す
+        (パターンの索引の構築用。ボディ等は読み込まない)
+        """
+        ...
+
+
+class MockRepository(MockReader, Protocol):
+    """
+    書き込みは API で検証済みの MockEndpoint を受け取り、
+    読み込みは検証し直さずに作った MockRecord を返す。
+    """
+
     async def save(self, mock: MockEndpoint) -> None:
         """モック定義を保存する"""
         ...
 
-    async def find(self, method: HttpMethod, path: str) -> MockEndpoint | None:
-        """メソッドとパスでモックを検索する"""
+    async def create(self, mock: MockEndpoint) -> bool:
+        """
+        (method, path) が未登録の場合のみアトミックに保存する。
+        保存できた場合はTrue、既に存在した場合はFalseを返す
+        """
+        ...
+
+    async def create_many(self, mocks: list[MockEndpoint]) -> BulkCreateResult:
+        """
+        (method, path) が未登録のモックのみまとめて保存する。
+        ストレージが項目単位で拒否したモックは、全体を失敗させずに rejected で返す。
+        mocks 内でキーは重複しない前提。
+        """
         ...
 
     async def delete(self, mock_id: str) -> bool:
         """IDでモックを削除する。削除できた場合はTrueを返す"""
         ...
 
-    async def find_by_id(self, mock_id: str) -> MockEndpoint | None:
+    async def find_by_id(self, mock_id: str) -> MockRecord | None:
         """IDでモックを検索する"""
         ...
 
-    async def find_all(self) -> list[MockEndpoint]:
+    async def find_all(self) -> list[MockRecord]:
         """全てのモックを取得する"""
         ...
+
+    def iter_all(
+        self, after: MockKey | None = None, page_size: int = 100
+    ) -> AsyncGenerator[MockRecord, None]:
+        """
+        全てのモックを page_size 件ずつ読み込みながら1件ずつ返す。
+        after を指定した場合は、バックエンドの走査順でそのキーの次から返す。
+        """
+        ...
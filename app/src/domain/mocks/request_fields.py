@@ -0,0 +1,32 @@
+import json
+from typing import Any
+
+
+def split_field_path(name: str) -> tuple[str, ...]:
+    """ "a.b.0" のようなボディのフィールド指定をキーの列に分解する"""
+    return tuple(name.split(".")) if name else ()
+
+
+def lookup_field(body: Any, keys: tuple[str, ...]) -> Any:  # noqa: ANN401
+    """
+    JSON ボディからフィールドを取り出す。dict はキー、list は数字の添字で辿る。
+    見つからない場合は None を返す。
+    """
+    value = body
+    for key in keys:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+    return value
+
+
+def stringify(value: Any) -> str:  # noqa: ANN401
+    """テンプレートや条件の比較に使う文字列表現 (文字列以外はコンパクトな JSON)"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
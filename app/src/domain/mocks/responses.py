@@ -0,0 +1,186 @@
+import hashlib
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+
+from src.domain.mocks.cache import LruCache
+from src.domain.mocks.encoding import compress_variants, select_encoding
+from src.domain.mocks.schemas import ContentType, SimulationResult
+
+# 304 応答では本文に関するヘッダーを返さない
+_BODY_HEADERS = frozenset({"content-type", "content-length", "content-encoding"})
+_SUCCESS_STATUS_CODES = range(200, 300)
+# Starlette と同様、本文を持たないステータスには content-length を付与しない
+_NO_BODY_STATUS_CODES = frozenset({*range(100, 200), 204, 304})
+
+
+@dataclass(frozen=True, slots=True)
+class StaticPayload:
+    """
+    プレースホルダーを含まないモックの送信可能なレスポンス。
+    エンコード済みボディと、content-length / content-type / ETag を含む
+    マージ済みヘッダーを保持し、リクエストごとに再利用する。
+    encoded には事前に圧縮したボディのペイロードを content-encoding ごとに持つ。
+    """
+
+    ok: SimulationResult
+    not_modified: SimulationResult | None
+    etag: str | None
+    encoded: Mapping[str, "StaticPayload"] = field(default_factory=dict)
+
+    def select(
+        self, if_none_match: str | None, accept_encoding: str | None = None
+    ) -> SimulationResult:
+        """
+        Accept-Encoding で受け入れられる圧縮済みのボディがあればそれを選ぶ。
+        If-None-Match が (選んだボディの) ETag に一致する場合は 304 を返す
+        """
+        encoding = select_encoding(accept_encoding, self.encoded)
+        if encoding is not None:
+            return self.encoded[encoding].select(if_none_match)
+        if self.not_modified is None or self.etag is None or if_none_match is None:
+            return self.ok
+        if etag_matches(if_none_match, self.etag):
+            return self.not_modified
+        return self.ok
+
+
+class StaticPayloadCache:
+    """
+    モックIDごとの StaticPayload のキャッシュ。
+    動的なモックは None として記録し、判定をやり直さない。
+    モック定義は不変でIDは再利用されないため、無効化は不要 (LRUで追い出すのみ)。
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._entries: LruCache[str, StaticPayload | None] = LruCache(
+            max_entries=max_entries, ttl_seconds=math.inf
+        )
+
+    def get(self, mock_id: str) -> tuple[bool, StaticPayload | None]:
+        """(キャッシュ済みか, ペイロード) を返す"""
+        entry = self._entries.get(mock_id)
+        if entry is None:
+            return False, None
+        return True, entry.value
+
+    def put(self, mock_id: str, payload: StaticPayload | None) -> None:
+        self._entries.put(mock_id, payload)
+
+
+def _strong_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _find_header(headers: dict[str, str], name: str) -> str | None:
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """圧縮したボディの ETag (表現ごとに異なる値にする)"""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else f"{etag}-{encoding}"
+
+
+def vary_on_encoding(headers: dict[str, str]) -> dict[str, str]:
+    """Vary に accept-encoding を加えたヘッダー (モック側の Vary は残す)"""
+    vary = _find_header(headers, "vary")
+    return {
+        **{key: value for key, value in headers.items() if key.lower() != "vary"},
+        "vary": f"{vary}, accept-encoding" if vary else "accept-encoding",
+    }
+
+
+def build_static_payload(
+    status_code: int,
+    body: bytes,
+    headers: dict[str, str],
+    media_type: ContentType | None,
+    *,
+    compress: bool = False,
+) -> StaticPayload:
+    """
+    静的レスポンスを事前に組み立てる。
+    モック側で指定されたヘッダーは、同名(大文字小文字を区別しない)の既定値より優先する。
+    ETag は 2xx の場合のみ付与する。
+    compress の場合は圧縮したボディも組み立てておき、Accept-Encoding で選ぶ。
+    モック側で content-encoding を指定した場合 (圧縮済みのボディ) は圧縮しない。
+    """
+    has_body = status_code not in _NO_BODY_STATUS_CODES
+    variants: dict[str, bytes] = {}
+    if compress and has_body and _find_header(headers, "content-encoding") is None:
+        variants = compress_variants(body)
+    if not variants:
+        return _assemble(status_code, body, headers, media_type, None)
+
+    headers = vary_on_encoding(headers)
+    payload = _assemble(status_code, body, headers, media_type, None)
+    # モック側の ETag は無圧縮のボディのものとして扱い、圧縮版には派生した値を付ける
+    variant_headers = {
+        key: value for key, value in headers.items() if key.lower() != "etag"
+    }
+    encoded = {
+        encoding: _assemble(
+            status_code,
+            data,
+            {**variant_headers, "content-encoding": encoding},
+            media_type,
+            encoded_etag(payload.etag, encoding) if payload.etag else None,
+        )
+        for encoding, data in variants.items()
+    }
+    return replace(payload, encoded=encoded)
+
+
+def _assemble(
+    status_code: int,
+    body: bytes,
+    headers: dict[str, str],
+    media_type: ContentType | None,
+    etag: str | None,
+) -> StaticPayload:
+    is_success = status_code in _SUCCESS_STATUS_CODES
+    if etag is None:
+        etag = _find_header(headers, "etag")
+    if etag is None and is_success:
+        etag = _strong_etag(body)
+
+    has_body = status_code not in _NO_BODY_STATUS_CODES
+    defaults = {
+        **({"content-length": str(len(body))} if has_body else {}),
+        **({"content-type": media_type.value} if media_type else {}),
+        **({"etag": etag} if etag else {}),
+    }
+    overridden = {key.lower() for key in headers}
+    merged = {
+        **{key: value for key, value in defaults.items() if key not in overridden},
+        **headers,
+    }
+
+    not_modified = None
+    if etag is not None and is_success:
+        not_modified = SimulationResult(
+            status_code=304,
+            body=b"",
+            headers={
+                key: value
+                for key, value in merged.items()
+                if key.lower() not in _BODY_HEADERS
+            },
+        )
+
+    return StaticPayload(
+        ok=SimulationResult(status_code=status_code, body=body, headers=merged),
+        not_modified=not_modified,
+        etag=etag,
+    )
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match の値が ETag に一致するか (弱い比較)"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -1,21 +1,45 @@
+from collections.abc import AsyncIterator
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from src.dependencies import get_mock_mgmt_service
-from src.domain.mocks.exceptions import MockAlreadyExistsError, MockNotFoundError
-from src.domain.mocks.schemas import MockCreate, MockEndpoint
+from src.dependencies import (
+    get_bulk_lines,
+    get_latency_scheduler,
+    get_mock_mgmt_service,
+)
+from src.domain.mocks.exceptions import (
+    InvalidCursorError,
+    InvalidMockError,
+    LineTooLongError,
+    MockAlreadyExistsError,
+    MockNotFoundError,
+)
+from src.domain.mocks.latency import LatencyScheduler
+from src.domain.mocks.schemas import (
+    BulkImportReport,
+    LatencyMetrics,
+    MockCreate,
+    MockEndpoint,
+)
 from src.domain.mocks.services import MockManagementService
 from src.shared.result import Failure, Success
 
 router = APIRouter(prefix="/api/mocks", tags=["mocks"])
 
+MAX_PAGE_LIMIT = 1000
+
 
 @router.post(
     "",
     response_model=MockEndpoint,
     status_code=status.HTTP_201_CREATED,
-    description="Register a new mock endpoint.",
+    description=(
+        "Register a new mock endpoint. The path may contain `{name}` and `*` "
+        "segments and a trailing `**`; captured values are available to "
+        "templates as `{{path.name}}`."
+    ),
 )
 async def create_mock(
     schema: MockCreate,
@@ -27,6 +51,97 @@ async def create_mock(
             return mock
         case Failure(MockAlreadyExistsError() as e):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        case Failure(InvalidMockError() as e):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+            )
+        case Failure(e):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+            )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkImportReport,
+    description=(
+        "Register mock endpoints from a newline-delimited JSON body "
+        "(one MockCreate per line). The body is read as it streams in and "
+        "written in batches; conflicts, invalid or overlong lines and rows "
+        "the store rejects are reported by line."
+    ),
+)
+async def import_mocks(
+    lines: Annotated[
+        AsyncIterator[tuple[int, bytes | LineTooLongError]], Depends(get_bulk_lines)
+    ],
+    service: Annotated[MockManagementService, Depends(get_mock_mgmt_service)],
+) -> BulkImportReport:
+    result = await service.import_bulk(lines)
+    match result:
+        case Success(report):
+            return report
+        case Failure(e):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+            )
+
+
+@router.get(
+    "/export",
+    description=(
+        "Export every mock endpoint as newline-delimited JSON, "
+        "in a format accepted by POST /api/mocks/bulk."
+    ),
+)
+async def export_mocks(
+    service: Annotated[MockManagementService, Depends(get_mock_mgmt_service)],
+) -> StreamingResponse:
+    return StreamingResponse(service.export(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "",
+    description=(
+        "List mock endpoints as a streamed JSON object "
+        '`{"items": [...], "next_cursor": ...}`. '
+        "Without `limit` every mock is returned; otherwise pass `next_cursor` "
+        "back as `cursor` to fetch the next page."
+    ),
+)
+async def list_mocks(
+    service: Annotated[MockManagementService, Depends(get_mock_mgmt_service)],
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_LIMIT)] = None,
+    cursor: str | None = None,
+) -> StreamingResponse:
+    result = service.list_page(cursor, limit)
+    match result:
+        case Success(chunks):
+            return StreamingResponse(chunks, media_type="application/json")
+        case Failure(InvalidCursorError() as e):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        case Failure(e):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+            )
+
+
+@router.post(
+    "/sequences/reset",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description=(
+        "Rewind sequence mocks to their first step. With `scenario`, only the "
+        "mocks sharing that scenario are rewound."
+    ),
+)
+async def reset_sequences(
+    service: Annotated[MockManagementService, Depends(get_mock_mgmt_service)],
+    scenario: str | None = None,
+) -> None:
+    result = await service.reset_sequences(scenario)
+    match result:
+        case Success(_):
+            return
         case Failure(e):
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -52,3 +167,14 @@ async def delete_mock(
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
+
+
+@router.get(
+    "/metrics/latency",
+    response_model=LatencyMetrics,
+    description="Skew between scheduled and actual wake-up of delayed responses.",
+)
+async def get_latency_metrics(
+    scheduler: Annotated[LatencyScheduler, Depends(get_latency_scheduler)],
+) -> LatencyMetrics:
+    return scheduler.metrics()
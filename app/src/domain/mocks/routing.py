@@ -0,0 +1,376 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Final
+
+from src.domain.mocks.cache import MockRouteCache
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.repository import MockReader
+from src.domain.mocks.schemas import HttpMethod
+
+logger = logging.getLogger("app")
+
+_PARAM_PATTERN: Final = re.compile(r"\{(\w+)\}")
+_WILDCARD: Final = "*"
+_CATCH_ALL: Final = "**"
+
+# パターン読み込み時にリポジトリから1回に取得する件数
+_LOAD_PAGE_SIZE: Final = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class RouteMatch:
+    """解決したモックと、パスパターンから取り出したパラメータ"""
+
+    mock: MockRecord
+    path_params: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class _Route:
+    pattern: str
+    mock_id: str
+    # 1セグメントのキャプチャごとのパラメータ名 (* は None)
+    names: tuple[str | None, ...]
+
+
+class _Node:
+    __slots__ = ("catch_all", "param", "routes", "static")
+
+    def __init__(self) -> None:
+        self.static: dict[str, _Node] = {}
+        self.param: _Node | None = None
+        # このノードで終わるパターン / このノード以降を ** で受けるパターン
+        self.routes: dict[str, _Route] = {}
+        self.catch_all: dict[str, _Route] = {}
+
+    def is_empty(self) -> bool:
+        return not (self.static or self.param or self.routes or self.catch_all)
+
+
+def _segments(path: str) -> list[str]:
+    return path.removeprefix("/").split("/")
+
+
+def may_be_pattern(path: str) -> bool:
+    """
+    パターンの可能性があるパス ({ または * を含む)。
+    索引の構築時にストレージ側で読み込む行を絞り込むための条件で、
+    パターンかどうかの判定は parse_pattern で行う。
+    """
+    return "{" in path or "*" in path
+
+
+def parse_pattern(path: str) -> list[str | None] | None:
+    """
+    パスをパターンとして解釈する。
+    パターンでなければ None を、パターンなら各セグメントを返す
+    (リテラルは文字列、{name} は名前付きパラメータとして "{name}"、* は None)。
+
+    {name} と * はちょうど1セグメント、末尾の ** は残り0個以上のセグメントに一致する。
+    "file.{ext}" のようなセグメントの一部だけのパラメータは扱わずリテラルとみなす。
+    不正なパターン (名前の重複、末尾以外の **) は ValueError を送出する。
+    """
+    segments = _segments(path)
+    parsed: list[str | None] = []
+    names: set[str] = set()
+    is_pattern = False
+    for index, segment in enumerate(segments):
+        if segment == _CATCH_ALL:
+            if index != len(segments) - 1:
+                raise ValueError(f"'**' must be the last segment: {path}")
+            is_pattern = True
+            parsed.append(_CATCH_ALL)
+        elif segment == _WILDCARD:
+            is_pattern = True
+            parsed.append(None)
+        elif (param := _PARAM_PATTERN.fullmatch(segment)) is not None:
+            name = param.group(1)
+            if name in names:
+                raise ValueError(f"Duplicate path parameter '{name}': {path}")
+            names.add(name)
+            is_pattern = True
+            parsed.append(segment)
+        else:
+            parsed.append(segment)
+    return parsed if is_pattern else None
+
+
+class PatternTrie:
+    """
+    1つの HTTP メソッドに属するパスパターンのトライ木 (セグメント単位)。
+
+    照合の優先順位は リテラル > {param} / * > ** で、深い位置で失敗した場合は
+    次の候補に戻って探索する。照合の手間は登録数ではなくパスのセグメント数で決まる。
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+
+    def add(self, mock: MockLocation | MockRecord, parsed: list[str | None]) -> None:
+        node = self._root
+        names: list[str | None] = []
+        for segment in parsed:
+            if segment == _CATCH_ALL:
+                route = _Route(mock.path, mock.id, tuple(names))
+                node.catch_all[mock.path] = route
+                return
+            if segment is None or _PARAM_PATTERN.fullmatch(segment):
+                names.append(segment[1:-1] if segment else None)
+                node.param = node.param or _Node()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+        node.routes[mock.path] = _Route(mock.path, mock.id, tuple(names))
+
+    def remove(self, pattern: str, parsed: list[str | None]) -> None:
+        trail: list[tuple[_Node, str | None]] = []
+        node: _Node | None = self._root
+        for segment in parsed:
+            if node is None:
+                return
+            if segment == _CATCH_ALL:
+                node.catch_all.pop(pattern, None)
+                break
+            if segment is None or _PARAM_PATTERN.fullmatch(segment):
+                trail.append((node, None))
+                node = node.param
+            else:
+                trail.append((node, segment))
+                node = node.static.get(segment)
+        else:
+            if node is None:
+                return
+            node.routes.pop(pattern, None)
+
+        # 空になったノードを末端から取り除く
+        for parent, segment in reversed(trail):
+            child = parent.param if segment is None else parent.static.get(segment)
+            if child is None or not child.is_empty():
+                break
+            if segment is None:
+                parent.param = None
+            else:
+                del parent.static[segment]
+
+    def match(self, path: str) -> tuple[_Route, dict[str, str]] | None:
+        segments = _segments(path)
+        captures: list[str] = []
+        route = self._match(self._root, segments, 0, captures)
+        if route is None:
+            return None
+        params = {
+            name: value
+            for name, value in zip(route.names, captures, strict=False)
+            if name is not None
+        }
+        return route, params
+
+    def _match(
+        self, node: _Node, segments: list[str], index: int, captures: list[str]
+    ) -> _Route | None:
+        if index == len(segments):
+            if node.routes:
+                return next(iter(node.routes.values()))
+            return next(iter(node.catch_all.values()), None)
+
+        child = node.static.get(segments[index])
+        if child is not None:
+            route = self._match(child, segments, index + 1, captures)
+            if route is not None:
+                return route
+
+        if node.param is not None:
+            captures.append(segments[index])
+            route = self._match(node.param, segments, index + 1, captures)
+            if route is not None:
+                return route
+            captures.pop()
+
+        return next(iter(node.catch_all.values()), None)
+
+
+class _PatternIndex:
+    """メソッドごとのトライ木と、削除用の ID -> パターンの対応表"""
+
+    def __init__(self) -> None:
+        self._tries: dict[HttpMethod, PatternTrie] = {}
+        self._patterns: dict[str, tuple[HttpMethod, str, list[str | None]]] = {}
+
+    def __contains__(self, mock_id: str) -> bool:
+        return mock_id in self._patterns
+
+    def location(self, mock_id: str) -> tuple[HttpMethod, str] | None:
+        """索引に載っている ID のメソッドとパターン"""
+        entry = self._patterns.get(mock_id)
+        return (entry[0], entry[1]) if entry is not None else None
+
+    def add(self, mock: MockLocation | MockRecord) -> None:
+        try:
+            parsed = parse_pattern(mock.path)
+        except ValueError as e:
+            # 登録時の検証より前に保存されたパス等。索引に載せず完全一致でのみ返す
+            logger.warning("Skipping mock %s with invalid pattern: %s", mock.id, e)
+            return
+        if parsed is None:
+            return
+        self.remove(mock.id)
+        self._tries.setdefault(mock.method, PatternTrie()).add(mock, parsed)
+        self._patterns[mock.id] = (mock.method, mock.path, parsed)
+
+    def remove(self, mock_id: str) -> None:
+        entry = self._patterns.pop(mock_id, None)
+        if entry is None:
+            return
+        method, pattern, parsed = entry
+        self._tries[method].remove(pattern, parsed)
+
+    def match(
+        self, method: HttpMethod, path: str
+    ) -> tuple[_Route, dict[str, str]] | None:
+        trie = self._tries.get(method)
+        return trie.match(path) if trie is not None else None
+
+
+class MockRouter:
+    """
+    モックの解決を担うルーティング表。
+
+    完全一致のパスは MockRouteCache 経由でリポジトリを参照し、
+    一致しなければメソッドごとのパターンのトライ木で照合する。
+    トライ木は最初の照合時にリポジトリの全モックの id, method, path から構築し、
+    以降はこのプロセスでの登録・削除を差分で反映する。他プロセスでの変更は、
+    通知を受け取れるバックエンドでは add/remove/reset で反映し、
+    それ以外では refresh_seconds ごとに作り直して取り込む。
+    作り直しはバックグラウンドで行い、その間は現在の索引で照合を続ける
+    (このため resolve に渡すリポジトリはリクエストの終了後も使えるものとする)。
+    """
+
+    def __init__(
+        self,
+        cache: MockRouteCache,
+        refresh_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._cache = cache
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._index = _PatternIndex()
+        self._loaded_at: float | None = None
+        # 作り直している最中の索引。その間の登録・削除はこちらにも反映する
+        self._building: _PatternIndex | None = None
+        self._loading: asyncio.Task[None] | None = None
+
+    @property
+    def cache(self) -> MockRouteCache:
+        return self._cache
+
+    async def resolve(
+        self, repo: MockReader, method: HttpMethod, path: str
+    ) -> RouteMatch | None:
+        """完全一致、パターンの順にモックを探す"""
+        mock = await self._lookup(repo, method, path)
+        if mock is not None:
+            return RouteMatch(mock)
+
+        await self._ensure_loaded(repo)
+        matched = self._index.match(method, path)
+        if matched is None:
+            return None
+
+        route, params = matched
+        mock = await self._lookup(repo, method, route.pattern)
+        if mock is None or mock.id != route.mock_id:
+            # 他プロセスで削除・再登録されたパターン
+            self._index.remove(route.mock_id)
+            return None
+        return RouteMatch(mock, params)
+
+    def add(self, mock: MockRecord) -> None:
+        """登録されたモックを反映する"""
+        self._cache.invalidate(mock.method, mock.path)
+        self._index.add(mock)
+        if self._building is not None:
+            self._building.add(mock)
+
+    def upsert(self, location: MockLocation) -> None:
+        """
+        他プロセスで登録されたモックを、定義を読み込まずに反映する。
+        キャッシュはそのキーのみ無効化し、次の参照でリポジトリから読み込ませる。
+        ID の全走査は、索引上で別のパターンに登録されていた場合のみ行う。
+        """
+        self._cache.invalidate(location.method, location.path)
+        indexed = self._index.location(location.id)
+        if indexed is not None and indexed != (location.method, location.path):
+            self.remove(location.id)
+        self._index.add(location)
+        if self._building is not None:
+            self._building.add(location)
+
+    def remove(self, mock_id: str) -> None:
+        """削除されたモックを反映する"""
+        self._cache.invalidate_id(mock_id)
+        self._index.remove(mock_id)
+        if self._building is not None:
+            self._building.remove(mock_id)
+
+    def reset(self) -> None:
+        """
+        他プロセスでの変更を取りこぼした可能性がある場合に、キャッシュを破棄し、
+        次のパターン照合で索引を作り直させる
+        """
+        self._cache.clear()
+        if self._loaded_at is not None:
+            self._loaded_at = -math.inf
+
+    async def _lookup(
+        self, repo: MockReader, method: HttpMethod, path: str
+    ) -> MockRecord | None:
+        cached = self._cache.get(method, path)
+        if cached is not None:
+            return cached.value
+
+        generation = self._cache.generation
+        mock = await repo.find(method, path)
+        self._cache.put(method, path, mock, generation)
+        return mock
+
+    async def _ensure_loaded(self, repo: MockReader) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and self._clock() - loaded_at < self._refresh_seconds:
+            return
+
+        loop = asyncio.get_running_loop()
+        loading = self._loading
+        if loading is None or loading.done() or loading.get_loop() is not loop:
+            self._loading = loading = loop.create_task(self._reload(repo))
+            loading.add_done_callback(_log_reload_failure)
+        # 未構築なら完了を待ち、構築済みなら待たずに現在の索引で照合する
+        if loaded_at is None:
+            await asyncio.shield(loading)
+
+    async def _reload(self, repo: MockReader) -> None:
+        building = _PatternIndex()
+        self._building = building
+        try:
+            async for location in repo.iter_locations(page_size=_LOAD_PAGE_SIZE):
+                if location.id not in building:
+                    building.add(location)
+        except BaseException:
+            # 失敗しても現在の索引を使い続け、refresh_seconds 後に再試行する
+            if self._loaded_at is not None:
+                self._loaded_at = self._clock()
+            raise
+        finally:
+            self._building = None
+        self._index = building
+        self._loaded_at = self._clock()
+
+
+def _log_reload_failure(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and (error := task.exception()) is not None:
+        logger.warning("Failed to reload mock path patterns: %s", error)
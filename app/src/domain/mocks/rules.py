@@ -0,0 +1,104 @@
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.domain.mocks.request_fields import lookup_field, split_field_path, stringify
+from src.domain.mocks.schemas import (
+    MockRule,
+    RuleCondition,
+    RuleOperator,
+    RuleSource,
+    SimulationRequest,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RuleInput:
+    """条件の評価に使うリクエストの値"""
+
+    request: SimulationRequest
+    path_params: dict[str, str]
+    body: Any = None
+
+
+# 値が無い場合は None を返す
+Extractor = Callable[[RuleInput], str | None]
+Predicate = Callable[[RuleInput], bool]
+
+
+def _extractor(condition: RuleCondition) -> Extractor:
+    name = condition.name
+    match condition.source:
+        case RuleSource.HEADER:
+            lowered = name.lower()
+            return lambda values: values.request.headers.get(lowered)
+        case RuleSource.QUERY:
+            return lambda values: values.request.query.get(name)
+        case RuleSource.PATH:
+            return lambda values: values.path_params.get(name)
+        case RuleSource.BODY:
+            keys = split_field_path(name)
+
+            def extract(values: RuleInput) -> str | None:
+                value = lookup_field(values.body, keys)
+                return None if value is None else stringify(value)
+
+            return extract
+
+
+def _compile_condition(condition: RuleCondition) -> Predicate:
+    extract = _extractor(condition)
+    expected = condition.value or ""
+    match condition.operator:
+        case RuleOperator.EXISTS:
+            return lambda values: extract(values) is not None
+        case RuleOperator.ABSENT:
+            return lambda values: extract(values) is None
+        case RuleOperator.EQUALS:
+            return lambda values: extract(values) == expected
+        case RuleOperator.NOT_EQUALS:
+            return lambda values: extract(values) != expected
+        case RuleOperator.CONTAINS:
+            return lambda values: expected in (extract(values) or "")
+        case RuleOperator.REGEX:
+            pattern = re.compile(expected)
+
+            def search(values: RuleInput) -> bool:
+                actual = extract(values)
+                return actual is not None and pattern.search(actual) is not None
+
+            return search
+
+
+@dataclass(frozen=True, slots=True)
+class RuleMatcher:
+    """
+    モックのルール定義をコンパイルした判定器。
+    条件は比較関数に変換済み (正規表現のコンパイル、名前の小文字化、
+    ボディのパスの分解も済んでいる) のため、リクエストごとには評価のみを行う。
+    """
+
+    rules: tuple[tuple[Predicate, ...], ...]
+    needs_body: bool
+
+    def select(self, values: RuleInput) -> int | None:
+        """最初にすべての条件を満たしたルールの番号を返す。無ければ None"""
+        for index, predicates in enumerate(self.rules):
+            if all(predicate(values) for predicate in predicates):
+                return index
+        return None
+
+
+def compile_rules(rules: Sequence[MockRule]) -> RuleMatcher:
+    return RuleMatcher(
+        rules=tuple(
+            tuple(_compile_condition(condition) for condition in rule.conditions)
+            for rule in rules
+        ),
+        needs_body=any(
+            condition.source == RuleSource.BODY
+            for rule in rules
+            for condition in rule.conditions
+        ),
+    )
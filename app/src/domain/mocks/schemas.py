@@ -1,7 +1,25 @@
+import base64
+import binascii
+import json
+import re
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import datetime, timezone
 from enum import StrEnum
-from typing import Any
+from pathlib import Path
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    ValidationInfo,
+    WithJsonSchema,
+    model_validator,
+)
+
+from src.shared.logging_utils import request_id_context
 
 
 class HttpMethod(StrEnum):
@@ -16,6 +34,215 @@ class ContentType(StrEnum):
     JSON = "application/json"
     TEXT = "text/plain"
     HTML = "text/html"
+    EVENT_STREAM = "text/event-stream"
+    OCTET_STREAM = "application/octet-stream"
+
+
+class LatencyDistribution(StrEnum):
+    FIXED = "fixed"
+    UNIFORM = "uniform"
+    NORMAL = "normal"
+    PERCENTILE = "percentile"
+    JITTER = "jitter"
+
+
+class SequenceMode(StrEnum):
+    # 最後のステップを返し続ける / 先頭に戻って繰り返す
+    REPEAT_LAST = "repeat_last"
+    CYCLE = "cycle"
+
+
+class RuleSource(StrEnum):
+    HEADER = "header"
+    QUERY = "query"
+    BODY = "body"
+    PATH = "path"
+
+
+class RuleOperator(StrEnum):
+    EQUALS = "equals"
+    NOT_EQUALS = "not_equals"
+    CONTAINS = "contains"
+    REGEX = "regex"
+    EXISTS = "exists"
+    ABSENT = "absent"
+
+
+# 比較する値 (value) を必要としない演算子
+VALUELESS_OPERATORS: frozenset[RuleOperator] = frozenset(
+    {RuleOperator.EXISTS, RuleOperator.ABSENT}
+)
+
+
+# 保存済みの (登録時に検証済みの) 値を読み込む際の検証コンテキスト。
+# 型の変換のみ行い、正規表現のコンパイル等の重い確認は省く
+STORED_CONTEXT: Mapping[str, bool] = {"stored": True}
+
+
+def _is_stored(info: ValidationInfo) -> bool:
+    return bool(info.context and info.context.get("stored"))
+
+
+def _decode_base64(value: object) -> object:
+    # API (JSON) からは base64 文字列、保存先からは生のバイト列で渡される
+    if isinstance(value, str):
+        try:
+            return base64.b64decode(value, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64: {e}") from e
+    return value
+
+
+def _encode_base64(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+# バイナリのボディ。JSON では base64 文字列として読み書きし、内部では bytes で持つ
+BinaryBody = Annotated[
+    bytes,
+    BeforeValidator(_decode_base64),
+    PlainSerializer(_encode_base64, return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "contentEncoding": "base64"}),
+]
+
+
+def mock_key(method: HttpMethod, path: str) -> str:
+    """ユニークキー: メソッドとパスの組み合わせ"""
+    return f"{method}:{path}"
+
+
+class LatencyProfile(BaseModel):
+    """latency_ms を基準にした遅延の分布"""
+
+    model_config = ConfigDict(frozen=True)
+
+    distribution: LatencyDistribution = LatencyDistribution.FIXED
+    min_ms: int = Field(0, ge=0, description="uniform: 下限")
+    max_ms: int | None = Field(
+        None, ge=0, description="uniform: 上限 (省略時は latency_ms)"
+    )
+    stddev_ms: int = Field(0, ge=0, description="normal: 標準偏差 (平均は latency_ms)")
+    jitter_ms: int = Field(0, ge=0, description="jitter: latency_ms ± jitter_ms")
+    percentiles: dict[
+        Annotated[int, Field(ge=0, le=100)], Annotated[int, Field(ge=0)]
+    ] = Field(
+        default_factory=dict,
+        description="percentile: パーセンタイル -> 遅延(ms) (例: {50: 100, 99: 800})",
+    )
+
+
+class RuleCondition(BaseModel):
+    """ルールの条件1つ (リクエストの値と比較する)"""
+
+    model_config = ConfigDict(frozen=True)
+
+    source: RuleSource
+    name: str = Field(
+        "",
+        description="ヘッダー名/クエリ名/パスパラメータ名 (body は a.b.0 形式)",
+    )
+    operator: RuleOperator = RuleOperator.EQUALS
+    value: str | None = Field(None, description="比較する値 (regex はパターン)")
+
+    @model_validator(mode="after")
+    def _check_value(self, info: ValidationInfo) -> "RuleCondition":
+        if self.operator not in VALUELESS_OPERATORS and self.value is None:
+            raise ValueError(f"'{self.operator}' requires a value")
+        if (
+            self.operator == RuleOperator.REGEX
+            and self.value is not None
+            and not _is_stored(info)
+        ):
+            try:
+                re.compile(self.value)
+            except re.error as e:
+                raise ValueError(f"Invalid regex {self.value!r}: {e}") from e
+        return self
+
+
+class MockResponse(BaseModel):
+    """モックが返すレスポンス1つ (ステータス、ボディ、ヘッダー)"""
+
+    model_config = ConfigDict(frozen=True)
+
+    status_code: int = Field(200, ge=100, le=599)
+    response_body: dict[str, Any] | str = Field(default_factory=dict)
+    headers: dict[str, str] = Field(default_factory=dict)
+
+
+class MockRule(MockResponse):
+    """
+    条件付きレスポンス。conditions をすべて満たすリクエストにはこのレスポンスを返す。
+    """
+
+    conditions: list[RuleCondition] = Field(default_factory=list)
+
+
+class MockSequence(BaseModel):
+    """
+    呼び出し回数に応じて順に返すレスポンス (例: 503, 503, 200)。
+    進行状況はカウンターストアに保持する。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    steps: list[MockResponse] = Field(..., min_length=1)
+    mode: SequenceMode = SequenceMode.REPEAT_LAST
+    scenario: str | None = Field(
+        None,
+        min_length=1,
+        description="同じ名前のモック同士で進行状況を共有する (省略時はモックごと)",
+    )
+
+
+class SseEvent(BaseModel):
+    """Server-Sent Events のイベント1つ"""
+
+    model_config = ConfigDict(frozen=True)
+
+    data: str = Field(..., description="複数行の場合は data 行に分けて送る")
+    event: str | None = Field(None, pattern=r"^[^\r\n]+$")
+    id: str | None = Field(None, pattern=r"^[^\r\n]+$")
+    retry_ms: int | None = Field(None, ge=0)
+
+
+class StreamingProfile(BaseModel):
+    """
+    レスポンスを分割して送る設定 (大きなボディ、低速な回線、SSE の模擬)。
+    events を指定した場合はボディの代わりにイベントを text/event-stream で送る。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    chunk_size: int = Field(64 * 1024, ge=1, description="1回に送るバイト数")
+    bytes_per_second: int | None = Field(
+        None, ge=1, description="帯域の上限 (省略時は無制限)"
+    )
+    chunk_delay_ms: int = Field(0, ge=0, description="チャンク (イベント) ごとの待機")
+    repeat: int = Field(1, ge=1, description="ボディ (イベント列) を繰り返して送る回数")
+    events: list[SseEvent] = Field(default_factory=list)
+
+
+class EncodedBlob(BaseModel):
+    """ブロブストアに置いた圧縮済みのボディ"""
+
+    model_config = ConfigDict(frozen=True)
+
+    digest: str = Field(..., pattern=r"^[0-9a-f]{64}$", description="SHA-256")
+    size: int = Field(..., ge=0)
+
+
+class BlobRef(BaseModel):
+    """ブロブストアに置いたレスポンスボディへの参照"""
+
+    model_config = ConfigDict(frozen=True)
+
+    digest: str = Field(..., pattern=r"^[0-9a-f]{64}$", description="SHA-256")
+    size: int = Field(..., ge=0)
+    media_type: ContentType | None = None
+    encodings: dict[str, EncodedBlob] = Field(
+        default_factory=dict, description="content-encoding -> 登録時に圧縮したボディ"
+    )
 
 
 class MockEndpoint(BaseModel):
@@ -33,19 +260,106 @@ class MockEndpoint(BaseModel):
     response_body: dict[str, Any] | str = Field(default_factory=dict)
     headers: dict[str, str] = Field(default_factory=dict)
     latency_ms: int = Field(0, ge=0, description="シミュレートする遅延時間(ms)")
+    latency: LatencyProfile | None = Field(None, description="遅延の分布")
+    rules: list[MockRule] = Field(
+        default_factory=list, description="先頭から評価し、最初に一致したものを返す"
+    )
+    sequence: MockSequence | None = Field(
+        None, description="どのルールにも一致しない場合に順に返すレスポンス"
+    )
+    streaming: StreamingProfile | None = Field(
+        None, description="ボディを分割して送る設定"
+    )
+    binary_body: BinaryBody | None = Field(
+        None, description="バイナリのボディ (response_body の代わり)"
+    )
+    body_ref: BlobRef | None = Field(
+        None,
+        description="ブロブストアに置いた大きなボディ (response_body の代わり)",
+    )
 
     @property
     def key(self) -> str:
         """ユニークキー: メソッドとパスの組み合わせ"""
-        return f"{self.method}:{self.path}"
+        return mock_key(self.method, self.path)
 
 
-class MockTemplateContext(BaseModel):
-    """レスポンス生成時の動的置換用コンテキスト"""
+class SimulationRequest:
+    """
+    シミュレーション対象のリクエストのうち、テンプレートから参照できる部分。
 
-    model_config = ConfigDict(frozen=True)
-    request_id: str
-    timestamp: str
+    ボディは read_body を通じて必要になった時点で初めて読み込み、loads で解析する。
+    headers のキーは小文字で引く (Starlette の Headers は大文字小文字を区別しない)。
+    """
+
+    __slots__ = ("_body", "_loads", "_read_body", "headers", "query")
+
+    def __init__(
+        self,
+        query: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        read_body: Callable[[], Awaitable[bytes]] | None = None,
+        loads: Callable[[bytes], Any] = json.loads,
+    ) -> None:
+        self.query: Mapping[str, str] = query or {}
+        self.headers: Mapping[str, str] = headers or {}
+        self._read_body = read_body
+        self._loads = loads
+        self._body: Any = None
+
+    async def parsed_body(self) -> Any:  # noqa: ANN401
+        """ボディを JSON として読み込む。JSON でなければ文字列として返す"""
+        if self._read_body is None:
+            return self._body
+        raw = await self._read_body()
+        self._read_body = None
+        if raw:
+            try:
+                self._body = self._loads(raw)
+            except ValueError:
+                self._body = raw.decode(errors="replace")
+        return self._body
+
+
+class MockTemplateContext:
+    """
+    レスポンス生成時の動的置換用コンテキスト。
+
+    各値は最初に参照された時点で計算してリクエスト内で使い回す。
+    テンプレートが参照しない値(時刻のフォーマット等)は計算しない。
+    値を明示的に渡した場合はそれを使う(テスト用)。
+    """
+
+    __slots__ = ("_request_id", "_timestamp", "body", "path_params", "request")
+
+    def __init__(
+        self,
+        request_id: str | None = None,
+        timestamp: str | None = None,
+        path_params: dict[str, str] | None = None,
+        request: SimulationRequest | None = None,
+        body: Any = None,  # noqa: ANN401
+    ) -> None:
+        self._request_id = request_id
+        self._timestamp = timestamp
+        # パスパターン ({id} 等) から取り出した値
+        self.path_params = path_params or {}
+        self.request = request or SimulationRequest()
+        # 読み込み済みのリクエストボディ。テンプレートが参照する場合のみ設定される
+        self.body = body
+
+    @property
+    def request_id(self) -> str:
+        """request_id_middleware が設定したリクエストID"""
+        if self._request_id is None:
+            self._request_id = request_id_context.get()
+        return self._request_id
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            self._timestamp = datetime.now(timezone.utc).isoformat()
+        return self._timestamp
 
 
 class MockCreate(BaseModel):
@@ -59,13 +373,85 @@ class MockCreate(BaseModel):
     response_body: dict[str, Any] | str = Field(default_factory=dict)
     headers: dict[str, str] = Field(default_factory=dict)
     latency_ms: int = Field(0, ge=0, description="シミュレートする遅延時間(ms)")
+    latency: LatencyProfile | None = Field(None, description="遅延の分布")
+    rules: list[MockRule] = Field(
+        default_factory=list, description="先頭から評価し、最初に一致したものを返す"
+    )
+    sequence: MockSequence | None = Field(
+        None, description="どのルールにも一致しない場合に順に返すレスポンス"
+    )
+    streaming: StreamingProfile | None = Field(
+        None, description="ボディを分割して送る設定"
+    )
+    binary_body: BinaryBody | None = Field(
+        None,
+        description="base64 でエンコードしたバイナリのボディ (response_body の代わり)",
+    )
+    # エクスポートしたモックを取り込む場合のみ指定される
+    body_ref: BlobRef | None = Field(
+        None, description="ブロブストアに置いた大きなボディ (response_body の代わり)"
+    )
+
+
+class BodyFile(BaseModel):
+    """ローカルのファイルから送るレスポンスボディ"""
+
+    model_config = ConfigDict(frozen=True)
+
+    digest: str
+    path: Path
+    size: int
 
 
 class SimulationResult(BaseModel):
-    """シミュレーション結果"""
+    """シミュレーション結果 (ボディはエンコード済みのバイト列)"""
 
     model_config = ConfigDict(frozen=True)
 
     status_code: int
-    body: dict[str, Any] | str
+    body: bytes
     headers: dict[str, str]
+    media_type: ContentType | None = None
+    # 指定された場合はボディを分割して送る
+    stream: StreamingProfile | None = None
+    # 指定された場合は body の代わりにファイルの内容を送る
+    body_file: BodyFile | None = None
+
+    @property
+    def body_size(self) -> int:
+        return self.body_file.size if self.body_file is not None else len(self.body)
+
+
+class LatencyMetrics(BaseModel):
+    """遅延スケジューラの予定時刻と実際の起床時刻のずれ"""
+
+    model_config = ConfigDict(frozen=True)
+
+    scheduled: int
+    completed: int
+    pending: int
+    average_skew_ms: float
+    max_skew_ms: float
+
+
+class BulkImportFailure(BaseModel):
+    """一括登録で登録できなかった行"""
+
+    model_config = ConfigDict(frozen=True)
+
+    line: int = Field(..., description="リクエストボディの行番号 (1始まり)")
+    # conflict はキーが登録済み、invalid は行が不正、rejected はストレージが
+    # 項目を受け付けなかった場合。項目の大きさの上限等
+    reason: Literal["conflict", "invalid", "rejected"]
+    method: str | None = None
+    path: str | None = None
+    detail: str = ""
+
+
+class BulkImportReport(BaseModel):
+    """一括登録の結果"""
+
+    model_config = ConfigDict(frozen=True)
+
+    created: int
+    failures: list[BulkImportFailure] = Field(default_factory=list)
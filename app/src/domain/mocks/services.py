@@ -1,51 +1,208 @@
 import asyncio
-import json
+import functools
 import uuid
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
 
-from src.domain.mocks.exceptions import MockAlreadyExistsError, MockNotFoundError
-from src.domain.mocks.repository import MockRepository
+from pydantic import ValidationError
+
+from src.domain.mocks.blobs import BlobStore
+from src.domain.mocks.bulk import encode_ndjson
+from src.domain.mocks.encoding import (
+    MIN_COMPRESS_BYTES,
+    compress_variants,
+    select_encoding,
+)
+from src.domain.mocks.exceptions import (
+    InvalidCursorError,
+    InvalidMockError,
+    LineTooLongError,
+    MockAlreadyExistsError,
+    MockNotFoundError,
+)
+from src.domain.mocks.latency import LatencyScheduler
+from src.domain.mocks.pagination import decode_cursor, stream_page
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.repository import MockReader, MockRepository
+from src.domain.mocks.responses import (
+    StaticPayload,
+    StaticPayloadCache,
+    build_static_payload,
+    encoded_etag,
+    etag_matches,
+    vary_on_encoding,
+)
+from src.domain.mocks.routing import MockRouter, RouteMatch, parse_pattern
+from src.domain.mocks.rules import RuleInput
 from src.domain.mocks.schemas import (
+    BlobRef,
+    BodyFile,
+    BulkImportFailure,
+    BulkImportReport,
+    ContentType,
+    EncodedBlob,
     HttpMethod,
     MockCreate,
     MockEndpoint,
+    MockResponse,
     MockTemplateContext,
+    SimulationRequest,
     SimulationResult,
+    StreamingProfile,
+)
+from src.domain.mocks.state import (
+    CounterStore,
+    scenario_key,
+    sequence_key,
+    step_index,
+)
+from src.domain.mocks.streaming import iter_stream
+from src.domain.mocks.template_engine import (
+    CompiledTemplate,
+    TemplateEngine,
+    compile_json,
+    compile_template,
 )
-from src.domain.mocks.template_engine import TemplateEngine
 from src.shared.result import Failure, Result, Success
 
+# Rows per repository round trip during a bulk import
+BULK_BATCH_SIZE = 500
+
+# Encoded static bodies larger than this are kept in the blob store
+BLOB_INLINE_MAX_BYTES = 256 * 1024
+
+# 304 responses carry no body, so there is nothing to stream
+NOT_MODIFIED = 304
+SUCCESS_STATUS_CODES = range(200, 300)
+
+
+def _new_mock(create_schema: MockCreate) -> MockEndpoint:
+    return MockEndpoint(
+        id=str(uuid.uuid4()),
+        path=create_schema.path,
+        method=create_schema.method,
+        status_code=create_schema.status_code,
+        response_body=create_schema.response_body,
+        headers=create_schema.headers,
+        latency_ms=create_schema.latency_ms,
+        latency=create_schema.latency,
+        rules=create_schema.rules,
+        sequence=create_schema.sequence,
+        streaming=create_schema.streaming,
+        binary_body=create_schema.binary_body,
+        body_ref=create_schema.body_ref,
+    )
+
+
+def _conflict(line_no: int, mock: MockEndpoint) -> BulkImportFailure:
+    return BulkImportFailure(
+        line=line_no,
+        reason="conflict",
+        method=mock.method.value,
+        path=mock.path,
+        detail=MockAlreadyExistsError(mock.method, mock.path).message,
+    )
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, detail['loc'])) or 'body'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def _validate_path(path: str) -> InvalidMockError | None:
+    try:
+        parse_pattern(path)
+    except ValueError as e:
+        return InvalidMockError(reason=str(e))
+    return None
+
 
 class MockManagementService:
-    def __init__(self, repo: MockRepository) -> None:
+    def __init__(
+        self,
+        repo: MockRepository,
+        router: MockRouter,
+        counters: CounterStore,
+        blobs: BlobStore,
+        inline_max_bytes: int | None = BLOB_INLINE_MAX_BYTES,
+    ) -> None:
         self._repo = repo
+        self._router = router
+        self._counters = counters
+        self._blobs = blobs
+        self._inline_max_bytes = inline_max_bytes
+
+    async def _store_large_body(self, mock: MockEndpoint) -> MockEndpoint:
+        """
+        Move a static body larger than inline_max_bytes to the blob store so
+        the stored mock stays small; templated bodies are rendered per request
+        and stay inline. Compressed variants are stored alongside it. With
+        inline_max_bytes None every body stays inline.
+        """
+        if self._inline_max_bytes is None:
+            return mock
+        if mock.binary_body is not None:
+            encoded, media_type = mock.binary_body, ContentType.OCTET_STREAM
+        else:
+            body = mock.response_body
+            if isinstance(body, dict):
+                compiled, media_type = compile_json(body), ContentType.JSON
+            else:
+                compiled, media_type = compile_template(body), None
+            if not compiled.is_static:
+                return mock
+            encoded = compiled.source.encode()
+        if len(encoded) <= self._inline_max_bytes:
+            return mock
+
+        digest = await self._blobs.put(encoded)
+        compress = mock.streaming is None and not any(
+            key.lower() == "content-encoding" for key in mock.headers
+        )
+        ref = BlobRef(
+            digest=digest,
+            size=len(encoded),
+            media_type=media_type,
+            encodings=await self._store_encodings(encoded) if compress else {},
+        )
+        return mock.model_copy(
+            update={"response_body": "", "binary_body": None, "body_ref": ref}
+        )
+
+    async def _store_encodings(self, body: bytes) -> dict[str, EncodedBlob]:
+        # Large bodies are compressed once here, off the event loop, so
+        # requests send the stored variants without compressing anything
+        variants = await asyncio.to_thread(compress_variants, body)
+        return {
+            encoding: EncodedBlob(digest=await self._blobs.put(data), size=len(data))
+            for encoding, data in variants.items()
+        }
 
     async def register(
         self, create_schema: MockCreate
-    ) -> Result[MockEndpoint, MockAlreadyExistsError]:
-        # Check if exists
-        existing = await self._repo.find(create_schema.method, create_schema.path)
-        if existing:
+    ) -> Result[MockEndpoint, MockAlreadyExistsError | InvalidMockError]:
+        invalid = _validate_path(create_schema.path)
+        if invalid is not None:
+            return Failure(invalid)
+
+        new_mock = await self._store_large_body(_new_mock(create_schema))
+        # Insert-if-absent in a single round trip; concurrent registrations of
+        # the same route cannot both succeed
+        if not await self._repo.create(new_mock):
             return Failure(
                 MockAlreadyExistsError(create_schema.method, create_schema.path)
             )
 
-        # Create new entity
-        new_mock = MockEndpoint(
-            id=str(uuid.uuid4()),
-            path=create_schema.path,
-            method=create_schema.method,
-            status_code=create_schema.status_code,
-            response_body=create_schema.response_body,
-            headers=create_schema.headers,
-            latency_ms=create_schema.latency_ms,
-        )
-
-        await self._repo.save(new_mock)
+        # Drop any negative entry recorded for this route and index patterns
+        self._router.add(MockRecord.from_model(new_mock))
         return Success(new_mock)
 
     async def delete(self, mock_id: str) -> Result[bool, MockNotFoundError]:
         deleted = await self._repo.delete(mock_id)
+        self._router.remove(mock_id)
         if not deleted:
             # We don't know method/path here easily without lookup,
             # but MockNotFoundError expects them.
@@ -58,18 +215,244 @@ class MockManagementService:
             )
         return Success(True)
 
+    async def reset_sequences(
+        self, scenario: str | None = None
+    ) -> Result[None, Exception]:
+        """
+        Rewind sequence mocks to their first step: every sequence, or only
+        those sharing the given scenario.
+        """
+        key = None if scenario is None else scenario_key(scenario)
+        await self._counters.reset(key)
+        return Success(None)
+
     async def get_all(self) -> Result[list[MockEndpoint], Exception]:
         mocks = await self._repo.find_all()
-        return Success(mocks)
+        return Success([mock.to_model() for mock in mocks])
+
+    async def import_bulk(
+        self,
+        lines: AsyncIterator[tuple[int, bytes | LineTooLongError]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> Result[BulkImportReport, Exception]:
+        """
+        Register mocks from numbered JSON lines (see iter_ndjson_lines).
+        Lines are validated and written batch_size at a time, so the body is
+        never held in memory. Invalid lines and routes that already exist are
+        reported per line instead of failing the whole import, as are rows the
+        store refuses on their own (for example an item over its size limit).
+        """
+        created = 0
+        failures: list[BulkImportFailure] = []
+        batch: dict[str, tuple[int, MockEndpoint]] = {}
+
+        async def flush() -> None:
+            nonlocal created
+            result = await self._repo.create_many([mock for _, mock in batch.values()])
+            saved_ids = {mock.id for mock in result.created}
+            for line_no, mock in batch.values():
+                if mock.id in saved_ids:
+                    self._router.add(MockRecord.from_model(mock))
+                elif mock.id in result.rejected:
+                    failures.append(
+                        BulkImportFailure(
+                            line=line_no,
+                            reason="rejected",
+                            method=mock.method.value,
+                            path=mock.path,
+                            detail=result.rejected[mock.id],
+                        )
+                    )
+                else:
+                    failures.append(_conflict(line_no, mock))
+            created += len(result.created)
+            batch.clear()
+
+        async for line_no, line in lines:
+            if isinstance(line, LineTooLongError):
+                failures.append(
+                    BulkImportFailure(
+                        line=line_no,
+                        reason="invalid",
+                        detail=f"{line.message} ({line.max_bytes} bytes)",
+                    )
+                )
+                continue
+            try:
+                create_schema = MockCreate.model_validate_json(line)
+            except ValidationError as e:
+                failures.append(
+                    BulkImportFailure(
+                        line=line_no, reason="invalid", detail=_describe(e)
+                    )
+                )
+                continue
+            invalid = _validate_path(create_schema.path)
+            if invalid is not None:
+                failures.append(
+                    BulkImportFailure(
+                        line=line_no,
+                        reason="invalid",
+                        method=create_schema.method.value,
+                        path=create_schema.path,
+                        detail=invalid.reason,
+                    )
+                )
+                continue
+
+            mock = await self._store_large_body(_new_mock(create_schema))
+            if mock.key in batch:
+                failures.append(_conflict(line_no, mock))
+                continue
+            batch[mock.key] = (line_no, mock)
+            if len(batch) >= batch_size:
+                await flush()
+
+        if batch:
+            await flush()
+        failures.sort(key=lambda failure: failure.line)
+        return Success(BulkImportReport(created=created, failures=failures))
+
+    def export(self) -> AsyncIterator[bytes]:
+        """Stream every mock as newline-delimited JSON."""
+        return encode_ndjson(self._repo.iter_all(page_size=BULK_BATCH_SIZE))
+
+    def list_page(
+        self, cursor: str | None, limit: int | None, page_size: int = 100
+    ) -> Result[AsyncIterator[bytes], InvalidCursorError]:
+        """
+        Stream mocks as a JSON page, starting after the cursor.
+        The repository is read page_size items at a time, so nothing beyond
+        the current page is held in memory.
+        """
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return Failure(InvalidCursorError(cursor or ""))
+
+        if limit is not None:
+            # One extra item tells whether a next page exists
+            page_size = min(page_size, limit + 1)
+        return Success(stream_page(self._repo.iter_all(after, page_size), limit))
+
+
+@dataclass(frozen=True, slots=True)
+class _Response:
+    """
+    The response chosen for a request: the mock's default or one of its rules.
+    key identifies it in the compiled-template and static-payload caches.
+    """
+
+    key: str
+    status_code: int
+    body: dict[str, Any] | str
+    headers: dict[str, str]
+    # Set when the body lives in the blob store rather than in body
+    blob: BlobRef | None = None
+    # Set for binary bodies, which are always static
+    binary: bytes | None = None
+
+    @classmethod
+    def of(cls, key: str, response: MockResponse) -> "_Response":
+        return cls(key, response.status_code, response.response_body, response.headers)
 
 
 class MockSimulatorService:
-    def __init__(self, repo: MockRepository, template_engine: TemplateEngine) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        repo: MockReader,
+        template_engine: TemplateEngine,
+        router: MockRouter,
+        payload_cache: StaticPayloadCache,
+        latency_scheduler: LatencyScheduler,
+        *,
+        counters: CounterStore,
+        blobs: BlobStore,
+    ) -> None:
         self._repo = repo
         self._template_engine = template_engine
+        self._router = router
+        self._payload_cache = payload_cache
+        self._latency_scheduler = latency_scheduler
+        self._counters = counters
+        self._blobs = blobs
+
+    def _compile_body(
+        self, response: _Response
+    ) -> tuple[CompiledTemplate, ContentType | None]:
+        # dict bodies are pre-serialized once per response, so rendering emits
+        # the final JSON directly without a dumps -> render -> loads round trip.
+        if isinstance(response.body, dict):
+            compiled = self._template_engine.compile_json(response.key, response.body)
+            return compiled, ContentType.JSON
+        return self._template_engine.compile(response.body), None
+
+    async def _static_payload(
+        self, response: _Response, compress: bool
+    ) -> StaticPayload | None:
+        cached, payload = self._payload_cache.get(response.key)
+        if cached:
+            return payload
+
+        media_type: ContentType | None
+        if response.binary is not None:
+            body, media_type = response.binary, ContentType.OCTET_STREAM
+        else:
+            compiled, media_type = self._compile_body(response)
+            if not compiled.is_static:
+                self._payload_cache.put(response.key, None)
+                return None
+            body = compiled.source.encode()
+
+        # Compressed variants are built here, once per cache fill, and then
+        # picked per request from Accept-Encoding. Compressing at the highest
+        # levels takes milliseconds, so it runs off the event loop.
+        build = functools.partial(
+            build_static_payload,
+            response.status_code,
+            body,
+            response.headers,
+            media_type,
+            compress=compress,
+        )
+        if compress and len(body) >= MIN_COMPRESS_BYTES:
+            payload = await asyncio.to_thread(build)
+        else:
+            payload = build()
+        self._payload_cache.put(response.key, payload)
+        return payload
+
+    async def _select_response(
+        self, route: RouteMatch, request: SimulationRequest
+    ) -> _Response:
+        mock = route.mock
+        if mock.rules:
+            matcher = self._template_engine.compile_rules(mock.id, mock.rules)
+            body = await request.parsed_body() if matcher.needs_body else None
+            index = matcher.select(RuleInput(request, route.path_params, body))
+            if index is not None:
+                return _Response.of(f"{mock.id}#{index}", mock.rules[index])
+        if mock.sequence is not None:
+            # Only requests that reach the sequence advance its counter
+            sequence = mock.sequence
+            count = await self._counters.advance(sequence_key(mock, sequence))
+            index = step_index(sequence, count)
+            return _Response.of(f"{mock.id}@{index}", sequence.steps[index])
+        return _Response(
+            key=mock.id,
+            status_code=mock.status_code,
+            body=mock.response_body,
+            headers=mock.headers,
+            blob=mock.body_ref,
+            binary=mock.binary_body,
+        )
 
     async def execute(
-        self, method: str, path: str
+        self,
+        method: str,
+        path: str,
+        if_none_match: str | None = None,
+        request: SimulationRequest | None = None,
     ) -> Result[SimulationResult, MockNotFoundError]:
         # 1. Lookup
         # method string to Enum
@@ -78,38 +461,125 @@ class MockSimulatorService:
         except ValueError:
             return Failure(MockNotFoundError(method, path, "Invalid HTTP Method"))
 
-        mock = await self._repo.find(http_method, path)
-        if not mock:
+        route = await self._router.resolve(self._repo, http_method, path)
+        if route is None:
             return Failure(MockNotFoundError(method, path))
+        mock = route.mock
+        request = request or SimulationRequest()
+
+        # Conditional rules pick the response variant, their predicates compiled
+        # once per mock; otherwise a sequence steps through its responses
+        response = await self._select_response(route, request)
 
         # 2. Latency Simulation
-        if mock.latency_ms > 0:
-            await asyncio.sleep(mock.latency_ms / 1000)
+        # The repository has already released its connection after the lookup,
+        # so waiting here only holds a heap entry in the scheduler.
+        if mock.latency_ms > 0 or mock.latency is not None:
+            await self._latency_scheduler.delay(mock.latency_ms, mock.latency)
 
-        # 3. Template Processing
-        # Prepare context
-        context = MockTemplateContext(
-            request_id=str(uuid.uuid4()),  # Or get from contextvar if needed
-            timestamp=datetime.now(timezone.utc).isoformat(),
+        conditional = if_none_match if http_method == HttpMethod.GET else None
+        # Streamed bodies are paced as they are, so they are never compressed
+        accept_encoding = (
+            request.headers.get("accept-encoding") if mock.streaming is None else None
         )
 
-        # Handle body (dict or str)
-        final_body: str | dict
-        if isinstance(mock.response_body, dict):
-            # Convert to str, render, convert back
-            body_str = json.dumps(mock.response_body)
-            rendered_str = self._template_engine.render(body_str, context)
-            try:
-                final_body = json.loads(rendered_str)
-            except json.JSONDecodeError:
-                # Fallback to string if invalid JSON after render
-                final_body = rendered_str
-        else:
-            final_body = self._template_engine.render(mock.response_body, context)
+        # 3. Bodies kept in the blob store are sent from a local file
+        if response.blob is not None:
+            blob_result = await self._blob_result(
+                response, conditional, accept_encoding, mock.streaming
+            )
+            if blob_result is None:
+                return Failure(MockNotFoundError(method, path, "Body blob is missing"))
+            return Success(blob_result)
+
+        # 4. Static responses are served from their pre-encoded payload
+        payload = await self._static_payload(response, compress=mock.streaming is None)
+        if payload is not None:
+            result = payload.select(conditional, accept_encoding)
+            if mock.streaming is not None and result.status_code != NOT_MODIFIED:
+                # Shallow copy: the cached body buffer is shared, not duplicated
+                result = result.model_copy(update={"stream": mock.streaming})
+            return Success(result)
 
-        # 4. Return Result
+        # 5. Template Processing
+        # Values are computed lazily, only when the template references them;
+        # the request body is read only if the template uses {{body...}}
+        compiled, media_type = self._compile_body(response)
+        context = MockTemplateContext(
+            path_params=route.path_params,
+            request=request,
+            body=await request.parsed_body() if compiled.needs_body else None,
+        )
+
+        # 6. Return Result
         return Success(
             SimulationResult(
-                status_code=mock.status_code, body=final_body, headers=mock.headers
+                status_code=response.status_code,
+                body=compiled.render(context).encode(),
+                headers=response.headers,
+                media_type=media_type,
+                stream=mock.streaming,
+            )
+        )
+
+    async def _blob_result(
+        self,
+        response: _Response,
+        if_none_match: str | None,
+        accept_encoding: str | None,
+        stream: StreamingProfile | None,
+    ) -> SimulationResult | None:
+        blob = response.blob
+        if blob is None:
+            return None
+        # The digest is a strong validator, so no file access is needed for 304
+        digest, size = blob.digest, blob.size
+        etag = f'"{digest}"'
+        headers = dict(response.headers)
+        if blob.encodings:
+            headers = vary_on_encoding(headers)
+        encoding = select_encoding(accept_encoding, blob.encodings)
+        if encoding is not None:
+            digest, size = (
+                blob.encodings[encoding].digest,
+                blob.encodings[encoding].size,
             )
+            etag = encoded_etag(etag, encoding)
+            headers["content-encoding"] = encoding
+
+        is_success = response.status_code in SUCCESS_STATUS_CODES
+        if is_success and if_none_match and etag_matches(if_none_match, etag):
+            vary = {key: value for key, value in headers.items() if key == "vary"}
+            return SimulationResult(
+                status_code=NOT_MODIFIED, body=b"", headers={"etag": etag, **vary}
+            )
+
+        path = await self._blobs.local_path(digest)
+        if path is None:
+            return None
+        return SimulationResult(
+            status_code=response.status_code,
+            body=b"",
+            headers={**({"etag": etag} if is_success else {}), **headers},
+            media_type=blob.media_type,
+            stream=stream,
+            body_file=BodyFile(digest=digest, path=path, size=size),
         )
+
+    async def stream(
+        self, result: SimulationResult
+    ) -> AsyncIterator[bytes | memoryview]:
+        """
+        Chunks of a streamed result, paced by the latency scheduler so that
+        many slow downloads share its coalesced timers. Blob bodies are sliced
+        from a memory map shared by all requests.
+        """
+        buffer = None
+        if result.body_file is not None:
+            buffer = await self._blobs.mapped(result.body_file.digest)
+            if buffer is None:
+                raise FileNotFoundError(result.body_file.path)
+        async for chunk in iter_stream(
+            result, self._latency_scheduler.sleep, buffer=buffer
+        ):
+            yield chunk
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from typing import Protocol
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import MockSequence, SequenceMode
+
+logger = logging.getLogger("app")
+
+
+def scenario_key(scenario: str) -> str:
+    """シナリオで共有するカウンターのキー"""
+    return f"scenario:{scenario}"
+
+
+def sequence_key(mock: MockRecord, sequence: MockSequence) -> str:
+    """シーケンスの進行状況を保持するカウンターのキー"""
+    if sequence.scenario is not None:
+        return scenario_key(sequence.scenario)
+    return f"mock:{mock.id}"
+
+
+def step_index(sequence: MockSequence, count: int) -> int:
+    """count 回目 (0始まり) の呼び出しで返すステップの番号"""
+    last = len(sequence.steps) - 1
+    if sequence.mode == SequenceMode.CYCLE:
+        return count % (last + 1)
+    return min(count, last)
+
+
+class CounterStore(Protocol):
+    async def advance(self, key: str) -> int:
+        """key のカウンターを1進め、進める前の値を返す"""
+        ...
+
+    async def reset(self, key: str | None = None) -> None:
+        """key のカウンターを0に戻す。None の場合は全て"""
+        ...
+
+    async def close(self) -> None:
+        """保留中の更新を書き出して終了する"""
+        ...
+
+
+class CounterBackend(Protocol):
+    """複数プロセスで共有するカウンターの保存先"""
+
+    async def add(self, deltas: dict[str, int]) -> dict[str, int]:
+        """各キーに加算し、加算後の値を返す。0 を渡すと現在値を読む"""
+        ...
+
+    async def reset(self, key: str | None = None) -> None:
+        """key のカウンターを削除する。None の場合は全て"""
+        ...
+
+
+class InMemoryCounterStore:
+    """
+    プロセス内のカウンター。
+    advance は await を挟まずに読み書きするため、イベントループ上ではロック無しで
+    アトミックになる。プロセス間では共有されない。
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[str, int] = {}
+
+    async def advance(self, key: str) -> int:
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count
+
+    async def reset(self, key: str | None = None) -> None:
+        if key is None:
+            self._counts.clear()
+        else:
+            self._counts.pop(key, None)
+
+    async def close(self) -> None:
+        return None
+
+
+class SharedCounterStore:
+    """
+    CounterBackend に保持するカウンター。
+
+    flush_seconds が 0 の場合は呼び出しごとにバックエンドをアトミックに加算し、
+    全プロセスで厳密に順番を共有する。
+    正の値の場合はプロセス内で数えた増分を flush_seconds ごとにまとめて加算する。
+    リクエストはバックエンドを待たないが、他プロセスの増分は次の書き出しまで
+    反映されないため、順番はその間だけ近似になる。
+    """
+
+    def __init__(self, backend: CounterBackend, flush_seconds: float = 0.0) -> None:
+        self._backend = backend
+        self._flush_seconds = flush_seconds
+        # 最後に書き出した時点のバックエンドの値と、それ以降の増分
+        self._base: dict[str, int] = {}
+        self._pending: dict[str, int] = {}
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def advance(self, key: str) -> int:
+        if self._flush_seconds <= 0:
+            totals = await self._backend.add({key: 1})
+            return totals[key] - 1
+
+        if key not in self._base:
+            # 初めてのキーは他プロセスでの進行状況を読んでから数え始める
+            current = (await self._backend.add({key: 0}))[key]
+            self._base.setdefault(key, current)
+
+        pending = self._pending.get(key, 0)
+        self._pending[key] = pending + 1
+        self._schedule_flush()
+        return self._base[key] + pending
+
+    async def reset(self, key: str | None = None) -> None:
+        if key is None:
+            self._base.clear()
+            self._pending.clear()
+        else:
+            self._base.pop(key, None)
+            self._pending.pop(key, None)
+        await self._backend.reset(key)
+
+    async def flush(self) -> None:
+        """保留中の増分をまとめてバックエンドに加算する"""
+        deltas = dict(self._pending)
+        if not deltas:
+            return
+        # 加算が終わるまでは増分を _pending に残し、その間の呼び出しにも
+        # 同じ番号を返さないようにする。失敗した場合は次回に持ち越す
+        totals = await self._backend.add(deltas)
+        for key, delta in deltas.items():
+            remaining = self._pending.get(key, 0) - delta
+            if remaining > 0:
+                self._pending[key] = remaining
+            else:
+                self._pending.pop(key, None)
+        self._base.update(totals)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_seconds)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to flush sequence counters")
+            # 次の呼び出しを待たずに再試行する
+            self._flusher = None
+            self._schedule_flush()
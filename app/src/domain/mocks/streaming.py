@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from src.domain.mocks.schemas import (
+    ContentType,
+    SimulationResult,
+    SseEvent,
+    StreamingProfile,
+)
+
+Sleep = Callable[[float], Awaitable[None]]
+Clock = Callable[[], float]
+
+# SSE ではボディの代わりにイベントを送るため、ボディについてのヘッダーは付けない
+_BODY_HEADERS = frozenset({"content-length", "content-type"})
+
+
+def encode_sse_event(event: SseEvent) -> bytes:
+    """イベントを text/event-stream の1ブロックにエンコードする"""
+    lines: list[str] = []
+    if event.event is not None:
+        lines.append(f"event: {event.event}")
+    if event.id is not None:
+        lines.append(f"id: {event.id}")
+    if event.retry_ms is not None:
+        lines.append(f"retry: {event.retry_ms}")
+    lines.extend(f"data: {line}" for line in event.data.splitlines() or [""])
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+def stream_media_type(result: SimulationResult) -> ContentType | None:
+    if result.stream is not None and result.stream.events:
+        return ContentType.EVENT_STREAM
+    return result.media_type
+
+
+def stream_headers(result: SimulationResult) -> dict[str, str]:
+    """
+    分割して送るレスポンスのヘッダー。
+    content-length は繰り返しを含めた長さに付け直し、SSE では付けない。
+    """
+    profile = result.stream
+    if profile is None:
+        return result.headers
+    dropped = _BODY_HEADERS if profile.events else {"content-length"}
+    headers = {
+        key: value
+        for key, value in result.headers.items()
+        if key.lower() not in dropped
+    }
+    if profile.events:
+        headers["cache-control"] = "no-cache"
+    else:
+        headers["content-length"] = str(result.body_size * profile.repeat)
+    return headers
+
+
+class _Pacer:
+    """
+    チャンクの送信時刻を開始時刻からの累計で決める。
+    1回ごとの待機の誤差が積み重ならず、帯域が bytes_per_second に収束する。
+    """
+
+    def __init__(self, profile: StreamingProfile, sleep: Sleep, clock: Clock) -> None:
+        self._bytes_per_second = profile.bytes_per_second
+        self._chunk_delay = profile.chunk_delay_ms / 1000
+        self._sleep = sleep
+        self._clock = clock
+        self._started_at: float | None = None
+        self._sent = 0
+        self._chunks = 0
+
+    async def wait(self, size: int) -> None:
+        """size バイトのチャンクを送れる時刻まで待つ"""
+        now = self._clock()
+        if self._started_at is None:
+            self._started_at = now
+        target = self._started_at + self._chunks * self._chunk_delay
+        if self._bytes_per_second is not None:
+            target += self._sent / self._bytes_per_second
+        if target > now:
+            await self._sleep(target - now)
+        self._sent += size
+        self._chunks += 1
+
+
+async def iter_stream(
+    result: SimulationResult,
+    sleep: Sleep,
+    clock: Clock | None = None,
+    buffer: memoryview | None = None,
+) -> AsyncIterator[bytes | memoryview]:
+    """
+    ボディ (または SSE のイベント) をプロファイルに従って分割して返す。
+    ボディは memoryview のスライスとして返すため、キャッシュ済みのバイト列を
+    リクエスト間で共有したままコピーせずに送れる。
+    buffer を渡した場合は result.body の代わりに送る (メモリマップしたファイル等)。
+    """
+    profile = result.stream or StreamingProfile()
+    pacer = _Pacer(profile, sleep, clock or asyncio.get_running_loop().time)
+
+    if profile.events:
+        encoded = [encode_sse_event(event) for event in profile.events]
+        for _ in range(profile.repeat):
+            for block in encoded:
+                await pacer.wait(len(block))
+                yield block
+        return
+
+    view = buffer if buffer is not None else memoryview(result.body)
+    for _ in range(profile.repeat):
+        for offset in range(0, len(view), profile.chunk_size):
+            chunk = view[offset : offset + profile.chunk_size]
+            await pacer.wait(len(chunk))
+            yield chunk
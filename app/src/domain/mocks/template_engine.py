@@ -1,11 +1,191 @@
+import json
+import math
 import random
 import re
 import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Final
 
-from src.domain.mocks.schemas import MockTemplateContext
+from src.domain.mocks.cache import LruCache
+from src.domain.mocks.request_fields import lookup_field, split_field_path, stringify
+from src.domain.mocks.rules import RuleMatcher, compile_rules
+from src.domain.mocks.schemas import MockRule, MockTemplateContext
+
+Resolver = Callable[[MockTemplateContext], str]
+
+# {{name}} または {{namespace.name}} (ボディは {{body.a.b}} のように階層を辿れる)
+_PLACEHOLDER_PATTERN: Final = re.compile(r"\{\{(\w+(?:\.[\w-]+)*)\}\}")
+_BODY_NAMESPACE: Final = "body"
+
+# プレースホルダー名 -> 値の生成関数
+_RESOLVERS: Final[dict[str, Resolver]] = {
+    "uuid": lambda _context: str(uuid.uuid4()),
+    "now_iso": lambda context: context.timestamp,
+    "request_id": lambda context: context.request_id,
+    "random_int": lambda _context: str(random.randint(0, 100)),
+}
+
+
+def _path_param(name: str) -> Resolver:
+    return lambda context: context.path_params.get(name, "")
+
+
+def _query_param(name: str) -> Resolver:
+    return lambda context: context.request.query.get(name, "")
+
+
+def _header(name: str) -> Resolver:
+    lowered = name.lower()
+    return lambda context: context.request.headers.get(lowered, "")
+
+
+def _body_field(name: str) -> Resolver:
+    keys = split_field_path(name)
+    return lambda context: stringify(lookup_field(context.body, keys))
+
+
+# "名前空間.名前" 形式のプレースホルダー -> 名前から値の生成関数を作る関数
+_NAMESPACED_RESOLVERS: Final[dict[str, Callable[[str], Resolver]]] = {
+    "path": _path_param,
+    "query": _query_param,
+    "header": _header,
+    _BODY_NAMESPACE: _body_field,
+}
+
+
+def _resolver_for(tag: str) -> Resolver | None:
+    namespace, _, name = tag.partition(".")
+    if namespace == _BODY_NAMESPACE:
+        # {{body}} はボディ全体
+        return _body_field(name)
+    if not name:
+        return _RESOLVERS.get(tag)
+    factory = _NAMESPACED_RESOLVERS.get(namespace)
+    return factory(name) if factory is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTemplate:
+    """
+    リテラルとプレースホルダーのセグメント列に分解済みのテンプレート。
+    segments の要素は、文字列ならリテラル、関数ならプレースホルダーを表す。
+    """
+
+    source: str
+    segments: tuple[str | Resolver, ...]
+    is_static: bool  # プレースホルダーを含まない(レンダリング不要)
+    needs_body: bool = False  # リクエストボディを参照する(レンダリング前に読み込む)
+
+    def render(self, context: MockTemplateContext) -> str:
+        if self.is_static:
+            return self.source
+        return "".join(
+            [
+                segment if isinstance(segment, str) else segment(context)
+                for segment in self.segments
+            ]
+        )
+
+
+def _json_escaped(resolver: Resolver) -> Resolver:
+    # JSON文字列リテラル内に埋め込むため、値をエスケープする (前後の引用符は除く)
+    return lambda context: json.dumps(resolver(context), ensure_ascii=False)[1:-1]
+
+
+def _to_segment(index: int, part: str, *, json_escape: bool) -> str | Resolver:
+    # re.split の結果は奇数番目がキャプチャ(タグ名)になる
+    if index % 2 == 0:
+        return part
+    resolver = _resolver_for(part)
+    if resolver is None:
+        # 未知のタグはリテラルとしてそのまま残す
+        return f"{{{{{part}}}}}"
+    return _json_escaped(resolver) if json_escape else resolver
+
+
+def compile_json(body: dict[str, Any]) -> CompiledTemplate:
+    """
+    dict のレスポンスボディを一度だけJSONへシリアライズし、
+    シリアライズ済みの断片とプレースホルダーに分解する。
+
+    json.dumps の出力では "{{" は必ず文字列リテラル(キーまたは値)の内側に現れるため、
+    置換値をエスケープして断片を連結すれば、パースし直さずに正しいJSONが得られる。
+    """
+    serialized = json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+    return compile_template(serialized, json_escape=True)
+
+
+def compile_template(template: str, *, json_escape: bool = False) -> CompiledTemplate:
+    """
+    テンプレートを1回の走査でセグメント列に分解する。
+    json_escape=True の場合、置換値をJSON文字列としてエスケープして埋め込む。
+    """
+    parts = _PLACEHOLDER_PATTERN.split(template)
+    segments = tuple(
+        _to_segment(index, part, json_escape=json_escape)
+        for index, part in enumerate(parts)
+        if part
+    )
+    tags = parts[1::2]
+    return CompiledTemplate(
+        source=template,
+        segments=segments,
+        is_static=all(isinstance(segment, str) for segment in segments),
+        needs_body=any(tag.partition(".")[0] == _BODY_NAMESPACE for tag in tags),
+    )
 
 
 class TemplateEngine:
+    """
+    テンプレートのコンパイル結果をキャッシュし、
+    2回目以降はセグメントの連結のみでレンダリングする。
+    文字列テンプレートはテンプレート文字列、JSONボディとルールはモックIDをキーとする。
+    """
+
+    def __init__(self, max_cached_templates: int = 1024) -> None:
+        self._compiled: LruCache[str, CompiledTemplate] = LruCache(
+            max_entries=max_cached_templates, ttl_seconds=math.inf
+        )
+        self._compiled_json: LruCache[str, CompiledTemplate] = LruCache(
+            max_entries=max_cached_templates, ttl_seconds=math.inf
+        )
+        self._compiled_rules: LruCache[str, RuleMatcher] = LruCache(
+            max_entries=max_cached_templates, ttl_seconds=math.inf
+        )
+
+    def compile(self, template: str) -> CompiledTemplate:
+        cached = self._compiled.get(template)
+        if cached is not None:
+            return cached.value
+
+        compiled = compile_template(template)
+        self._compiled.put(template, compiled)
+        return compiled
+
+    def compile_json(self, mock_id: str, body: dict[str, Any]) -> CompiledTemplate:
+        """
+        JSONボディをコンパイルする。
+        モック定義は不変でIDは再利用されないため、IDをキャッシュキーにできる。
+        """
+        cached = self._compiled_json.get(mock_id)
+        if cached is not None:
+            return cached.value
+
+        compiled = compile_json(body)
+        self._compiled_json.put(mock_id, compiled)
+        return compiled
+
+    def compile_rules(self, mock_id: str, rules: Sequence[MockRule]) -> RuleMatcher:
+        """モックの条件付きレスポンスの判定器をコンパイルする (キーはモックID)"""
+        cached = self._compiled_rules.get(mock_id)
+        if cached is not None:
+            return cached.value
+
+        matcher = compile_rules(rules)
+        self._compiled_rules.put(mock_id, matcher)
+        return matcher
+
     def render(self, template: str, context: MockTemplateContext) -> str:
         """
         文字列内のプレースホルダーを置換する。
@@ -13,21 +193,11 @@ class TemplateEngine:
         Supported tags:
           {{uuid}}: Random UUIDv4
           {{now_iso}}: Current timestamp (ISO8601)
+          {{request_id}}: Request ID of the current request
           {{random_int}}: Random integer (0-100)
+          {{path.<name>}}: Value captured by {<name>} in the mock's path pattern
+          {{query.<name>}}: Query string parameter
+          {{header.<name>}}: Request header (case-insensitive)
+          {{body}}, {{body.<a>.<b>}}: Request body, or a field of a JSON body
         """
-        result = template
-
-        def replace_uuid(_match: re.Match) -> str:
-            return str(uuid.uuid4())
-
-        result = re.sub(r"\{\{uuid\}\}", replace_uuid, result)
-
-        def replace_now_iso(_match: re.Match) -> str:
-            return context.timestamp
-
-        result = re.sub(r"\{\{now_iso\}\}", replace_now_iso, result)
-
-        def replace_random_int(_match: re.Match) -> str:
-            return str(random.randint(0, 100))
-
-        return re.sub(r"\{\{random_int\}\}", replace_random_int, result)
+        return self.compile(template).render(context)
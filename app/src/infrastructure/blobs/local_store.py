@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Final
+
+_DIGEST_PATTERN: Final = re.compile(r"[0-9a-f]{64}")
+
+
+def _map_file(path: Path) -> mmap.mmap | None:
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # 長さ0のファイルはマップできない
+            return None
+        # マップはファイルを閉じた後も有効。複製したディスクリプタを保持する
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close_map(mapped: mmap.mmap) -> None:
+    # 送信中のビューがあれば閉じられない。最後のビューが解放された時点で閉じられる
+    with contextlib.suppress(BufferError):
+        mapped.close()
+
+
+class LocalBlobStore:
+    """
+    ローカルディレクトリに置くブロブストア。
+    root/<ダイジェストの先頭2文字>/<ダイジェスト> に保存する。
+
+    ファイルは一時ファイルに書き込んでから置き換えるため、書き込み途中の内容が
+    読まれることはない。メモリマップは一度作成したらプロセス内で使い回す
+    (ページキャッシュを共有するため、同時に送信しても常駐メモリは増えない)。
+    マップはそれぞれファイルディスクリプタを保持するため、最近使った
+    max_maps 件までを保持し、それを超えたら古いものから閉じる。
+    """
+
+    def __init__(self, root: Path, max_maps: int = 64) -> None:
+        self._root = root
+        self._max_maps = max_maps
+        self._maps: OrderedDict[str, mmap.mmap] = OrderedDict()
+
+    def path_for(self, digest: str) -> Path:
+        if not _DIGEST_PATTERN.fullmatch(digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return self._root / digest[:2] / digest
+
+    async def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self.install, digest, lambda f: f.write(data))
+        return digest
+
+    def install(self, digest: str, write: Callable[[IO[bytes]], object]) -> Path:
+        """
+        write で書き込んだ内容を digest のブロブとして保存する (同期)。
+        既に存在する場合は何もしない。
+        """
+        path = self.path_for(digest)
+        if path.exists():
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+            try:
+                write(tmp)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+        os.replace(tmp.name, path)
+        return path
+
+    async def local_path(self, digest: str) -> Path | None:
+        path = self.path_for(digest)
+        return path if path.exists() else None
+
+    async def mapped(self, digest: str) -> memoryview | None:
+        mapped = self._maps.get(digest)
+        if mapped is None:
+            path = await self.local_path(digest)
+            if path is None:
+                return None
+            mapped = await asyncio.to_thread(_map_file, path)
+            if mapped is None:
+                return memoryview(b"")
+            # 読み込み中に他のリクエストが同じブロブをマップしていれば、そちらを使う
+            existing = self._maps.get(digest)
+            if existing is not None:
+                _close_map(mapped)
+                mapped = existing
+            self._maps[digest] = mapped
+        self._maps.move_to_end(digest)
+        while len(self._maps) > self._max_maps:
+            _, evicted = self._maps.popitem(last=False)
+            _close_map(evicted)
+        # 呼び出しごとにビューを作る。送信中のビューがあるマップは閉じられない
+        return memoryview(mapped)
@@ -0,0 +1,86 @@
+import asyncio
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import boto3
+from botocore.exceptions import ClientError
+
+from src.config import get_settings
+from src.infrastructure.blobs.local_store import LocalBlobStore
+
+_NOT_FOUND_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
+
+
+@lru_cache
+def get_s3_client() -> Any:  # noqa: ANN401
+    """
+    S3 互換ストレージのクライアントを取得する (プロセス内で1度だけ作成する)。
+    blob_s3_endpoint_url を指定するとローカルの互換サーバーに接続する。
+    """
+    settings = get_settings()
+    session = boto3.session.Session()
+    if settings.blob_s3_endpoint_url:
+        return session.client(
+            "s3",
+            endpoint_url=settings.blob_s3_endpoint_url,
+            region_name=settings.aws_default_region,
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+        )
+    return session.client("s3")
+
+
+def _is_not_found(error: ClientError) -> bool:
+    return error.response["Error"]["Code"] in _NOT_FOUND_CODES
+
+
+class S3BlobStore:
+    """
+    S3 互換ストレージに置くブロブストア。キーはダイジェスト。
+    送信はローカルファイルから行うため、取得したブロブは LocalBlobStore に保持する
+    (内容は変更されないため、キャッシュの無効化は不要)。
+    """
+
+    def __init__(self, client: Any, bucket: str, cache: LocalBlobStore) -> None:  # noqa: ANN401
+        self._client = client
+        self._bucket = bucket
+        self._cache = cache
+
+    async def put(self, data: bytes) -> str:
+        digest = await self._cache.put(data)
+        await asyncio.to_thread(self._upload, digest, data)
+        return digest
+
+    def _upload(self, digest: str, data: bytes) -> None:
+        try:
+            # 同じ内容は既にあるため送り直さない
+            self._client.head_object(Bucket=self._bucket, Key=digest)
+            return
+        except ClientError as e:
+            if not _is_not_found(e):
+                raise
+        self._client.put_object(Bucket=self._bucket, Key=digest, Body=data)
+
+    async def local_path(self, digest: str) -> Path | None:
+        path = await self._cache.local_path(digest)
+        if path is not None:
+            return path
+        return await asyncio.to_thread(self._download, digest)
+
+    def _download(self, digest: str) -> Path | None:
+        # 一時ファイルに直接書き込むため、ボディ全体をメモリに載せない
+        try:
+            return self._cache.install(
+                digest,
+                lambda f: self._client.download_fileobj(self._bucket, digest, f),
+            )
+        except ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+
+    async def mapped(self, digest: str) -> memoryview | None:
+        if await self.local_path(digest) is None:
+            return None
+        return await self._cache.mapped(digest)
@@ -0,0 +1,162 @@
+import asyncio
+from functools import lru_cache
+from typing import Any
+
+import httpx
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from botocore.session import get_session
+
+from src.config import get_settings
+from src.shared.json_codec import JsonCodec, StdlibJsonCodec, get_json_codec
+
+_TARGET_PREFIX = "DynamoDB_20120810"
+_CONTENT_TYPE = "application/x-amz-json-1.0"
+_RETRYABLE_ERRORS = frozenset(
+    {
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "InternalServerError",
+    }
+)
+
+
+class DynamoDBError(Exception):
+    """
+    DynamoDB がエラーを返した場合の例外 (code は __type の末尾)。
+    TransactionCanceledException の場合は項目ごとの取り消し理由を持つ。
+    """
+
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        cancellation_reasons: list[dict[str, Any]] | None = None,
+    ) -> None:
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.cancellation_reasons = cancellation_reasons or []
+
+
+class AsyncDynamoDBClient:
+    """
+    DynamoDB の JSON プロトコルを直接話す最小限の非同期クライアント。
+
+    リクエストは botocore の SigV4 で署名し、プロセスで共有する
+    httpx.AsyncClient のコネクションプールから送信する。
+    スレッドを介さないため、同時実行数はスレッドプールではなくネットワークで決まる。
+    大きなボディを含む Item の JSON は codec でエンコード・デコードする。
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        http: httpx.AsyncClient,
+        endpoint_url: str,
+        region_name: str,
+        credentials: Credentials,
+        *,
+        max_attempts: int = 3,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        self._http = http
+        self._endpoint_url = endpoint_url
+        self._region_name = region_name
+        self._credentials = credentials
+        self._max_attempts = max_attempts
+        self._codec = codec or StdlibJsonCodec()
+
+    async def call(self, operation: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        DynamoDB API (GetItem, PutItem 等) を呼び出す。
+        スロットリングとサーバーエラーは指数バックオフで再試行する。
+        """
+        body = self._codec.dumps(payload)
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                return await self._send(operation, body)
+            except DynamoDBError as e:
+                if e.code not in _RETRYABLE_ERRORS or attempt == self._max_attempts:
+                    raise
+            await asyncio.sleep(0.05 * 2**attempt)
+        raise DynamoDBError("RetryExhausted", operation)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _send(self, operation: str, body: bytes) -> dict[str, Any]:
+        request = AWSRequest(
+            method="POST",
+            url=self._endpoint_url,
+            data=body,
+            headers={
+                "Content-Type": _CONTENT_TYPE,
+                "X-Amz-Target": f"{_TARGET_PREFIX}.{operation}",
+            },
+        )
+        SigV4Auth(
+            self._credentials.get_frozen_credentials(), "dynamodb", self._region_name
+        ).add_auth(request)
+
+        response = await self._http.post(
+            self._endpoint_url, content=body, headers=dict(request.headers.items())
+        )
+        data: dict[str, Any] = (
+            self._codec.loads(response.content) if response.content else {}
+        )
+        if response.is_error:
+            code = str(data.get("__type", "UnknownError")).rsplit("#", 1)[-1]
+            message = str(data.get("message") or data.get("Message") or "")
+            raise DynamoDBError(code, message, data.get("CancellationReasons"))
+        return data
+
+
+def _resolve_credentials() -> Credentials:
+    settings = get_settings()
+    if settings.dynamodb_endpoint_url:
+        # ローカル環境では boto3 リソースと同じく設定値の認証情報を使う
+        return Credentials(settings.aws_access_key_id, settings.aws_secret_access_key)
+    credentials = get_session().get_credentials()
+    if credentials is None:
+        raise RuntimeError("AWS credentials are not available")
+    return credentials
+
+
+@lru_cache
+def get_async_dynamodb_client() -> AsyncDynamoDBClient:
+    """
+    プロセス共通の非同期クライアントを取得する。
+    コネクションプールの上限やタイムアウトは boto3 クライアントと同じ設定を使う。
+    """
+    settings = get_settings()
+    region_name = settings.aws_default_region
+    endpoint_url = (
+        settings.dynamodb_endpoint_url
+        or f"https://dynamodb.{region_name}.amazonaws.com"
+    )
+    http = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.dynamodb_max_pool_connections,
+            max_keepalive_connections=settings.dynamodb_max_pool_connections,
+        ),
+        timeout=httpx.Timeout(
+            settings.dynamodb_read_timeout_seconds,
+            connect=settings.dynamodb_connect_timeout_seconds,
+        ),
+    )
+    return AsyncDynamoDBClient(
+        http,
+        endpoint_url,
+        region_name,
+        _resolve_credentials(),
+        max_attempts=settings.dynamodb_max_retry_attempts,
+        codec=get_json_codec(),
+    )
+
+
+async def close_async_dynamodb_client() -> None:
+    """コネクションプールを閉じ、次回利用時に作り直させる"""
+    if get_async_dynamodb_client.cache_info().currsize:
+        await get_async_dynamodb_client().aclose()
+    get_async_dynamodb_client.cache_clear()
@@ -0,0 +1,298 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from src.domain.mocks.pagination import MockKey
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.repository import BulkCreateResult
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+from src.infrastructure.dynamodb.async_client import AsyncDynamoDBClient, DynamoDBError
+from src.infrastructure.dynamodb.converters import (
+    PATTERN_VALUE,
+    from_wire,
+    item_size,
+    to_domain,
+    to_item,
+    to_wire,
+)
+from src.infrastructure.dynamodb.mock_repository import (
+    BATCH_GET_MAX_KEYS,
+    BATCH_MAX_ATTEMPTS,
+    ID_INDEX_NAME,
+    KEY_PROJECTION,
+    PATTERN_LOCATIONS_QUERY,
+    PUT_IF_ABSENT,
+    TRANSACT_WRITE_MAX_BYTES,
+    TRANSACT_WRITE_MAX_ITEMS,
+    batch_backoff_seconds,
+    chunked,
+    chunked_by_size,
+    conflicting_indices,
+    rejected_reasons,
+)
+
+
+class AsyncDynamoMockRepository:
+    """
+    DynamoDB implementation for MockEndpoint on a native asyncio client.
+    Uses the same table schema as DynamoMockRepository, but sends requests
+    from the event loop instead of offloading boto3 calls to threads.
+    Table Schema:
+      - PK: method (String)
+      - SK: path (String)
+      - GSI IdIndex: id (String), projection ALL
+      - GSI PatternIndex: pattern (String) / path, projection id
+        (sparse: only items whose path may be a pattern)
+    """
+
+    def __init__(
+        self, client: AsyncDynamoDBClient, table_name: str = "MockTable"
+    ) -> None:
+        self._client = client
+        self._table_name = table_name
+
+    async def save(self, mock: MockEndpoint) -> None:
+        await self._client.call(
+            "PutItem", {"TableName": self._table_name, "Item": to_wire(to_item(mock))}
+        )
+
+    async def create(self, mock: MockEndpoint) -> bool:
+        try:
+            await self._client.call(
+                "PutItem",
+                {
+                    "TableName": self._table_name,
+                    "Item": to_wire(to_item(mock)),
+                    **PUT_IF_ABSENT,
+                },
+            )
+        except DynamoDBError as e:
+            if e.code == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    async def create_many(self, mocks: list[MockEndpoint]) -> BulkCreateResult:
+        if not mocks:
+            return BulkCreateResult(created=[])
+        # 登録済みのキーを先に除き、トランザクションが取り消される回数を減らす
+        existing = await self._existing_keys(
+            [{"method": mock.method.value, "path": mock.path} for mock in mocks]
+        )
+        entries = [
+            (mock, to_item(mock))
+            for mock in mocks
+            if (mock.method.value, mock.path) not in existing
+        ]
+        chunks = chunked_by_size(
+            entries,
+            lambda entry: item_size(entry[1]),
+            TRANSACT_WRITE_MAX_ITEMS,
+            TRANSACT_WRITE_MAX_BYTES,
+        )
+        results = await asyncio.gather(
+            *[
+                self._put_if_absent([(mock, to_wire(item)) for mock, item in chunk])
+                for chunk in chunks
+            ]
+        )
+        return BulkCreateResult.combine(results)
+
+    async def _put_if_absent(
+        self, entries: list[tuple[MockEndpoint, dict[str, Any]]]
+    ) -> BulkCreateResult:
+        """
+        確認の後に別のリクエストが登録したキーを上書きしないよう、条件付きの
+        TransactWriteItems で書き込む。
+        条件を満たさない項目や項目自体が拒否された項目があると全体が取り消されるため、
+        その項目を除いて再送する。リクエスト全体が検証エラーになった場合は、
+        原因の項目を特定するため半分ずつに分けて書き込む。
+        """
+        rejected: dict[str, str] = {}
+        pending = entries
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if not pending:
+                return BulkCreateResult(created=[], rejected=rejected)
+            try:
+                await self._client.call(
+                    "TransactWriteItems",
+                    {
+                        "TransactItems": [
+                            {
+                                "Put": {
+                                    "TableName": self._table_name,
+                                    "Item": item,
+                                    **PUT_IF_ABSENT,
+                                }
+                            }
+                            for _, item in pending
+                        ]
+                    },
+                )
+            except DynamoDBError as e:
+                if e.code == "ValidationException":
+                    if len(pending) == 1:
+                        rejected[pending[0][0].id] = str(e)
+                        return BulkCreateResult(created=[], rejected=rejected)
+                    half = len(pending) // 2
+                    return BulkCreateResult.combine(
+                        [
+                            BulkCreateResult(created=[], rejected=rejected),
+                            await self._put_if_absent(pending[:half]),
+                            await self._put_if_absent(pending[half:]),
+                        ]
+                    )
+                if e.code != "TransactionCanceledException":
+                    raise
+                failed = rejected_reasons(e.cancellation_reasons)
+                conflicts = conflicting_indices(e.cancellation_reasons)
+                for index, detail in failed.items():
+                    rejected[pending[index][0].id] = detail
+                if conflicts or failed:
+                    pending = [
+                        entry
+                        for index, entry in enumerate(pending)
+                        if index not in conflicts and index not in failed
+                    ]
+                else:
+                    # 同じキーへの他のトランザクションと競合した。待ってから再送する
+                    await asyncio.sleep(batch_backoff_seconds(attempt))
+                continue
+            return BulkCreateResult(
+                created=[mock for mock, _ in pending], rejected=rejected
+            )
+        # 他のトランザクションとの競合が続いた
+        for mock, _ in pending:
+            rejected[mock.id] = "TransactWriteItems did not complete"
+        return BulkCreateResult(created=[], rejected=rejected)
+
+    async def _existing_keys(self, keys: list[dict[str, str]]) -> set[tuple[str, str]]:
+        responses = await asyncio.gather(
+            *[
+                self._batch_call(
+                    "BatchGetItem",
+                    "UnprocessedKeys",
+                    {"Keys": [to_wire(key) for key in chunk], **KEY_PROJECTION},
+                )
+                for chunk in chunked(keys, BATCH_GET_MAX_KEYS)
+            ]
+        )
+        return {
+            (item["method"], item["path"])
+            for items in responses
+            for item in map(from_wire, items)
+        }
+
+    async def _batch_call(
+        self,
+        operation: str,
+        unprocessed_field: str,
+        request: Any,  # noqa: ANN401
+    ) -> list[dict[str, Any]]:
+        """
+        Batch 系APIを呼び出し、未処理分をバックオフしながら再送する。
+        BatchGetItem の場合は取得したアイテムを返す。
+        """
+        items: list[dict[str, Any]] = []
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = await self._client.call(
+                operation, {"RequestItems": {self._table_name: request}}
+            )
+            items.extend(response.get("Responses", {}).get(self._table_name, []))
+            unprocessed = response.get(unprocessed_field, {}).get(self._table_name)
+            if not unprocessed:
+                return items
+            request = unprocessed
+            await asyncio.sleep(batch_backoff_seconds(attempt))
+        raise DynamoDBError(unprocessed_field, f"{operation} did not complete")
+
+    async def find(self, method: HttpMethod, path: str) -> MockRecord | None:
+        response = await self._client.call(
+            "GetItem",
+            {
+                "TableName": self._table_name,
+                "Key": to_wire({"method": method.value, "path": path}),
+            },
+        )
+        item = response.get("Item")
+        if item:
+            return to_domain(from_wire(item))
+        return None
+
+    async def find_by_id(self, mock_id: str) -> MockRecord | None:
+        # IdIndex を1回Queryする（DynamoMockRepositoryと同じ方針）
+        response = await self._client.call(
+            "Query",
+            {
+                "TableName": self._table_name,
+                "IndexName": ID_INDEX_NAME,
+                "KeyConditionExpression": "id = :id",
+                "ExpressionAttributeValues": to_wire({":id": mock_id}),
+                "Limit": 1,
+            },
+        )
+        items = response.get("Items", [])
+        if items:
+            return to_domain(from_wire(items[0]))
+        return None
+
+    async def delete(self, mock_id: str) -> bool:
+        mock = await self.find_by_id(mock_id)
+        if not mock:
+            return False
+
+        try:
+            await self._client.call(
+                "DeleteItem",
+                {
+                    "TableName": self._table_name,
+                    "Key": to_wire({"method": mock.method.value, "path": mock.path}),
+                    "ConditionExpression": "id = :id",
+                    "ExpressionAttributeValues": to_wire({":id": mock_id}),
+                },
+            )
+            return True
+        except DynamoDBError:
+            return False
+
+    async def find_all(self) -> list[MockRecord]:
+        return [mock async for mock in self.iter_all(page_size=1000)]
+
+    async def iter_all(
+        self, after: MockKey | None = None, page_size: int = 100
+    ) -> AsyncGenerator[MockRecord, None]:
+        payload: dict[str, Any] = {"TableName": self._table_name, "Limit": page_size}
+        if after is not None:
+            method, path = after
+            payload["ExclusiveStartKey"] = to_wire(
+                {"method": method.value, "path": path}
+            )
+
+        while True:
+            response = await self._client.call("Scan", payload)
+            for item in response.get("Items", []):
+                yield to_domain(from_wire(item))
+
+            last_key = response.get("LastEvaluatedKey")
+            if last_key is None:
+                return
+            payload["ExclusiveStartKey"] = last_key
+
+    async def iter_locations(
+        self, page_size: int = 1000
+    ) -> AsyncGenerator[MockLocation, None]:
+        payload: dict[str, Any] = {
+            "TableName": self._table_name,
+            "Limit": page_size,
+            **PATTERN_LOCATIONS_QUERY,
+            "ExpressionAttributeValues": {":pt": {"S": PATTERN_VALUE}},
+        }
+        while True:
+            response = await self._client.call("Query", payload)
+            for item in response.get("Items", []):
+                yield MockLocation.from_storage(from_wire(item))
+
+            last_key = response.get("LastEvaluatedKey")
+            if last_key is None:
+                return
+            payload["ExclusiveStartKey"] = last_key
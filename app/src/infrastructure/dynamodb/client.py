@@ -1,32 +1,82 @@
+import logging
+from functools import lru_cache
 from typing import Any
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 
 from src.config import get_settings
 
+logger = logging.getLogger("app")
 
+
+def _botocore_config() -> Config:
+    settings = get_settings()
+    return Config(
+        max_pool_connections=settings.dynamodb_max_pool_connections,
+        tcp_keepalive=settings.dynamodb_tcp_keepalive,
+        connect_timeout=settings.dynamodb_connect_timeout_seconds,
+        read_timeout=settings.dynamodb_read_timeout_seconds,
+        retries={
+            "max_attempts": settings.dynamodb_max_retry_attempts,
+            "mode": "standard",
+        },
+    )
+
+
+@lru_cache
 def get_dynamodb_resource() -> Any:  # noqa: ANN401
     """
     DynamoDBリソースを取得する。
     設定ファイル(src.config)からエンドポイントを取得する。
+
+    boto3のセッション生成とサービスモデルの読み込み、HTTPコネクションプールの作成は
+    高コストなため、プロセス内で1度だけ行い使い回す。
+    リポジトリは get_item 等のリクエストメソッドのみを使用し、
+    これらはスレッドセーフな低レベルクライアントに委譲される。
     """
     settings = get_settings()
     endpoint_url = settings.dynamodb_endpoint_url
+    session = boto3.session.Session()
 
     if endpoint_url:
-        return boto3.resource(
+        return session.resource(
             "dynamodb",
             endpoint_url=endpoint_url,
             region_name=settings.aws_default_region,
             aws_access_key_id=settings.aws_access_key_id,
             aws_secret_access_key=settings.aws_secret_access_key,
+            config=_botocore_config(),
         )
-    return boto3.resource("dynamodb")
+    return session.resource("dynamodb", config=_botocore_config())
 
 
+@lru_cache
 def get_table(table_name: str) -> Any:  # noqa: ANN401
     """
     DynamoDBテーブルリソースを取得する。
     """
     dynamodb = get_dynamodb_resource()
     return dynamodb.Table(table_name)
+
+
+def warm_up(table_name: str) -> bool:
+    """
+    DescribeTable を1度呼び出し、認証情報の解決とHTTP接続の確立を済ませておく。
+    失敗しても起動は妨げない(最初のリクエストで改めてエラーになる)。
+    """
+    try:
+        get_table(table_name).meta.client.describe_table(TableName=table_name)
+    except (BotoCoreError, ClientError) as e:
+        logger.warning("DynamoDB warm-up failed: %s", e)
+        return False
+    return True
+
+
+def close_dynamodb() -> None:
+    """HTTPコネクションプールを閉じ、次回利用時に作り直させる"""
+    if get_dynamodb_resource.cache_info().currsize:
+        get_dynamodb_resource().meta.client.close()
+    get_table.cache_clear()
+    get_dynamodb_resource.cache_clear()
@@ -1,14 +1,43 @@
+import base64
+from collections.abc import Callable, Mapping
+from decimal import Decimal
 from typing import Any
 
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.routing import may_be_pattern
 from src.domain.mocks.schemas import MockEndpoint
 
+# パターンの可能性があるアイテムにのみ付ける属性 (疎なGSI PatternIndex のキー)
+PATTERN_ATTRIBUTE = "pattern"
+PATTERN_VALUE = "1"
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
 
-def to_domain(item: dict[str, Any]) -> MockEndpoint:
+
+def to_domain(item: dict[str, Any]) -> MockRecord:
     """
     DynamoDB Item -> Domain Model
     """
     # Itemの中身がそのままDomain Modelの構造と一致しているためシンプル
-    return MockEndpoint.model_validate(item)
+    # ただし数値は Decimal、バイナリは Binary で返るため、int / float / bytes に戻す
+    # 保存時に検証済みのため、読み込み時は検証し直さない
+    return MockRecord.from_storage(_from_dynamodb(item))
+
+
+def _from_dynamodb(value: Any) -> Any:  # noqa: ANN401
+    if isinstance(value, Binary):
+        # スタブは value 属性を持たない (__bytes__ の型も誤っている)
+        return value.value  # type: ignore[attr-defined]
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _from_dynamodb(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_from_dynamodb(child) for child in value]
+    return value
 
 
 def to_item(mock: MockEndpoint) -> dict[str, Any]:
@@ -18,4 +47,82 @@ def to_item(mock: MockEndpoint) -> dict[str, Any]:
     # PK, SK を手動で追加する必要はない。
     # MockEndpoint自体が 'method' と 'path' を持っており、
     # それがそのままDynamoDBのキーになる。
-    return mock.model_dump(mode="json")
+    item = mock.model_dump(mode="json")
+    # バイナリのボディは base64 文字列ではなく Binary 型 (生のバイト列) で保存する
+    item["binary_body"] = mock.binary_body
+    if may_be_pattern(mock.path):
+        item[PATTERN_ATTRIBUTE] = PATTERN_VALUE
+    return item
+
+
+def item_size(item: Mapping[str, Any]) -> int:
+    """
+    to_item の結果を DynamoDB が数える大きさ (属性名と値のバイト数の合計)
+    で概算する。数値は文字列の長さで数えるため、実際より少し大きくなる。
+    """
+    return sum(len(name.encode()) + _value_size(value) for name, value in item.items())
+
+
+def _value_size(value: Any) -> int:  # noqa: ANN401
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, bytes | bytearray):
+        return len(value)
+    if isinstance(value, Mapping):
+        return 3 + sum(
+            len(key.encode()) + 1 + _value_size(child) for key, child in value.items()
+        )
+    if isinstance(value, list | tuple | set):
+        return 3 + sum(1 + _value_size(child) for child in value)
+    return len(str(value)) + 1
+
+
+def to_wire(item: dict[str, Any]) -> dict[str, Any]:
+    """
+    Python の dict -> DynamoDB JSON (属性値に型記述子を付けた形式)
+    低レベル API を直接呼び出す非同期クライアント用。
+    """
+    return {
+        key: _map_binary(_serializer.serialize(value), _b64encode)
+        for key, value in item.items()
+    }
+
+
+def from_wire(item: dict[str, Any]) -> dict[str, Any]:
+    """
+    DynamoDB JSON -> Python の dict
+    """
+    return {
+        key: _deserializer.deserialize(_map_binary(value, base64.b64decode))
+        for key, value in item.items()
+    }
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def _map_binary(
+    attribute: Any,  # noqa: ANN401
+    convert: Callable[[Any], Any],
+) -> Any:  # noqa: ANN401
+    """
+    属性値のうちバイナリ (B / BS) に convert を適用する。
+    JSON で送受信するため、バイナリはワイヤ上では base64 文字列になる。
+    """
+    if "B" in attribute:
+        return {"B": convert(attribute["B"])}
+    if "BS" in attribute:
+        return {"BS": [convert(value) for value in attribute["BS"]]}
+    if "M" in attribute:
+        return {
+            "M": {
+                key: _map_binary(value, convert)
+                for key, value in attribute["M"].items()
+            }
+        }
+    if "L" in attribute:
+        return {"L": [_map_binary(value, convert) for value in attribute["L"]]}
+    return attribute
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any
+
+from src.infrastructure.dynamodb.client import get_table
+
+
+class DynamoCounterBackend:
+    """
+    シーケンスのカウンターを DynamoDB に保持する。
+    UpdateItem の ADD は項目が無ければ0から加算するため、読み書きが1回で済み、
+    複数プロセスから同時に加算しても値が失われない。
+    Table Schema:
+      - PK: key (String)
+      - count (Number)
+    """
+
+    def __init__(self, table_name: str = "MockStateTable") -> None:
+        self._table = get_table(table_name)
+
+    async def add(self, deltas: dict[str, int]) -> dict[str, int]:
+        return await asyncio.to_thread(self._add, deltas)
+
+    def _add(self, deltas: dict[str, int]) -> dict[str, int]:
+        # UpdateItem にバッチ版は無いため、キーごとに1回ずつ送る
+        totals: dict[str, int] = {}
+        for key, delta in deltas.items():
+            response = self._table.update_item(
+                Key={"key": key},
+                UpdateExpression="ADD #c :d",
+                ExpressionAttributeNames={"#c": "count"},
+                ExpressionAttributeValues={":d": delta},
+                ReturnValues="ALL_NEW",
+            )
+            totals[key] = int(response["Attributes"].get("count", 0))
+        return totals
+
+    async def reset(self, key: str | None = None) -> None:
+        if key is not None:
+            await asyncio.to_thread(self._table.delete_item, Key={"key": key})
+            return
+        await asyncio.to_thread(self._delete_all)
+
+    def _delete_all(self) -> None:
+        # key は予約語のため別名を使う
+        kwargs: dict[str, Any] = {
+            "ProjectionExpression": "#k",
+            "ExpressionAttributeNames": {"#k": "key"},
+        }
+        # batch_writer は25件ずつ BatchWriteItem を送り、未処理分を再送する
+        with self._table.batch_writer() as writer:
+            while True:
+                response = self._table.scan(**kwargs)
+                for item in response.get("Items", []):
+                    writer.delete_item(Key={"key": item["key"]})
+                last_key = response.get("LastEvaluatedKey")
+                if last_key is None:
+                    return
+                kwargs["ExclusiveStartKey"] = last_key
@@ -1,12 +1,118 @@
 import asyncio
-from typing import Optional
+import time
+from collections.abc import AsyncGenerator, Callable, Mapping, Sequence
+from typing import Any, Optional, TypeVar
 
-from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
+from src.domain.mocks.pagination import MockKey
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.repository import BulkCreateResult
 from src.domain.mocks.schemas import HttpMethod, MockEndpoint
-from src.infrastructure.dynamodb.client import get_table
-from src.infrastructure.dynamodb.converters import to_domain, to_item
+from src.infrastructure.dynamodb.client import get_dynamodb_resource, get_table
+from src.infrastructure.dynamodb.converters import (
+    PATTERN_ATTRIBUTE,
+    PATTERN_VALUE,
+    item_size,
+    to_domain,
+    to_item,
+)
+
+T = TypeVar("T")
+
+# id をハッシュキーとするGSI (scripts/init_dynamodb.py で作成する)
+ID_INDEX_NAME = "IdIndex"
+# パターンの可能性があるアイテムのみを含む疎なGSI。これも同スクリプトで作成する
+PATTERN_INDEX_NAME = "PatternIndex"
+
+# BatchGetItem は1回100キーまで
+BATCH_GET_MAX_KEYS = 100
+# Unprocessed{Keys,Items} や取り消されたトランザクションを再送する回数の上限
+BATCH_MAX_ATTEMPTS = 8
+# TransactWriteItems は1回100件、項目の合計 4 MB まで
+# (大きさは概算のため、上限より少し手前で分ける)
+TRANSACT_WRITE_MAX_ITEMS = 100
+TRANSACT_WRITE_MAX_BYTES = 4_000_000
+# 項目自体が原因でトランザクションが取り消された場合の理由。再送しても成功しない
+ITEM_ERROR_CODES = frozenset({"ValidationError", "ItemCollectionSizeLimitExceeded"})
+# キーが未登録の場合だけ書き込む条件
+PUT_IF_ABSENT = {
+    "ConditionExpression": "attribute_not_exists(#p)",
+    "ExpressionAttributeNames": {"#p": "path"},
+}
+# キーのみを取得する (path は予約語のため別名を使う)
+KEY_PROJECTION = {
+    "ProjectionExpression": "#m, #p",
+    "ExpressionAttributeNames": {"#m": "method", "#p": "path"},
+}
+# パターンの索引の構築用に、PatternIndex からパターンの可能性がある
+# アイテムのみを読み込む (テーブル全体の Scan を避ける)
+PATTERN_LOCATIONS_QUERY = {
+    "IndexName": PATTERN_INDEX_NAME,
+    "KeyConditionExpression": "#pt = :pt",
+    "ProjectionExpression": "#i, #m, #p",
+    "ExpressionAttributeNames": {
+        "#pt": PATTERN_ATTRIBUTE,
+        "#i": "id",
+        "#m": "method",
+        "#p": "path",
+    },
+}
+
+
+def batch_backoff_seconds(attempt: int) -> float:
+    """未処理分を再送するまでの待ち時間 (指数バックオフ、上限1秒)"""
+    return min(0.05 * 2.0**attempt, 1.0)
+
+
+def chunked(values: list[T], size: int) -> list[list[T]]:
+    """Batch 系APIの上限件数ごとに分割する"""
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def chunked_by_size(
+    values: list[T], size: Callable[[T], int], max_items: int, max_bytes: int
+) -> list[list[T]]:
+    """
+    件数と大きさの合計の上限ごとに分割する。
+    1件で max_bytes を超える値は単独のチャンクにする (書き込み時に拒否される)。
+    """
+    chunks: list[list[T]] = []
+    chunk: list[T] = []
+    total = 0
+    for value in values:
+        value_size = size(value)
+        if chunk and (len(chunk) >= max_items or total + value_size > max_bytes):
+            chunks.append(chunk)
+            chunk = []
+            total = 0
+        chunk.append(value)
+        total += value_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def rejected_reasons(reasons: Sequence[Mapping[str, object]]) -> dict[int, str]:
+    """
+    取り消された TransactWriteItems のうち、項目自体が原因で書き込めなかった
+    項目の位置と理由
+    """
+    return {
+        index: f"{reason.get('Code')}: {reason.get('Message', '')}"
+        for index, reason in enumerate(reasons)
+        if reason.get("Code") in ITEM_ERROR_CODES
+    }
+
+
+def conflicting_indices(reasons: Sequence[Mapping[str, object]]) -> set[int]:
+    """取り消された TransactWriteItems のうち、キーが登録済みだった項目の位置"""
+    return {
+        index
+        for index, reason in enumerate(reasons)
+        if reason.get("Code") == "ConditionalCheckFailed"
+    }
 
 
 class DynamoMockRepository:
@@ -16,17 +122,146 @@ class DynamoMockRepository:
     Table Schema:
       - PK: method (String)
       - SK: path (String)
+      - GSI IdIndex: id (String), projection ALL
+      - GSI PatternIndex: pattern (String) / path, projection id
+        (sparse: only items whose path may be a pattern)
     """
 
     def __init__(self, table_name: str = "MockTable") -> None:
         self._table = get_table(table_name)
+        self._resource = get_dynamodb_resource()
 
     async def save(self, mock: MockEndpoint) -> None:
         # ドメインモデルをそのままJSONライクに保存（埋め込み）
         item = to_item(mock)
         await asyncio.to_thread(self._table.put_item, Item=item)
 
-    async def find(self, method: HttpMethod, path: str) -> Optional[MockEndpoint]:
+    async def create(self, mock: MockEndpoint) -> bool:
+        # キーが未登録の場合だけ書き込み、確認と保存を1回のリクエストで済ませる
+        try:
+            await asyncio.to_thread(
+                self._table.put_item,
+                Item=to_item(mock),
+                ConditionExpression=Attr("path").not_exists(),
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    async def create_many(self, mocks: list[MockEndpoint]) -> BulkCreateResult:
+        if not mocks:
+            return BulkCreateResult(created=[])
+        return await asyncio.to_thread(self._create_many, mocks)
+
+    def _create_many(self, mocks: list[MockEndpoint]) -> BulkCreateResult:
+        # 登録済みのキーを先に除き、トランザクションが取り消される回数を減らす
+        existing = self._existing_keys(
+            [{"method": mock.method.value, "path": mock.path} for mock in mocks]
+        )
+        entries = [
+            (mock, to_item(mock))
+            for mock in mocks
+            if (mock.method.value, mock.path) not in existing
+        ]
+        chunks = chunked_by_size(
+            entries,
+            lambda entry: item_size(entry[1]),
+            TRANSACT_WRITE_MAX_ITEMS,
+            TRANSACT_WRITE_MAX_BYTES,
+        )
+        return BulkCreateResult.combine(self._put_if_absent(chunk) for chunk in chunks)
+
+    def _put_if_absent(
+        self, entries: list[tuple[MockEndpoint, dict[str, Any]]]
+    ) -> BulkCreateResult:
+        """
+        確認の後に別のリクエストが登録したキーを上書きしないよう、条件付きの
+        TransactWriteItems で書き込む。
+        条件を満たさない項目や項目自体が拒否された項目があると全体が取り消されるため、
+        その項目を除いて再送する。リクエスト全体が検証エラーになった場合は、
+        原因の項目を特定するため半分ずつに分けて書き込む。
+        """
+        # リソースのクライアントは Python の値を属性値に変換してから送る
+        client = self._resource.meta.client
+        rejected: dict[str, str] = {}
+        pending = entries
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if not pending:
+                return BulkCreateResult(created=[], rejected=rejected)
+            try:
+                client.transact_write_items(
+                    TransactItems=[
+                        {
+                            "Put": {
+                                "TableName": self._table.name,
+                                "Item": item,
+                                **PUT_IF_ABSENT,
+                            }
+                        }
+                        for _, item in pending
+                    ]
+                )
+            except ClientError as e:
+                error = e.response["Error"]
+                if error["Code"] == "ValidationException":
+                    if len(pending) == 1:
+                        rejected[pending[0][0].id] = (
+                            f"{error['Code']}: {error['Message']}"
+                        )
+                        return BulkCreateResult(created=[], rejected=rejected)
+                    half = len(pending) // 2
+                    return BulkCreateResult.combine(
+                        [
+                            BulkCreateResult(created=[], rejected=rejected),
+                            self._put_if_absent(pending[:half]),
+                            self._put_if_absent(pending[half:]),
+                        ]
+                    )
+                if error["Code"] != "TransactionCanceledException":
+                    raise
+                reasons = e.response.get("CancellationReasons", [])
+                failed = rejected_reasons(reasons)
+                conflicts = conflicting_indices(reasons)
+                for index, detail in failed.items():
+                    rejected[pending[index][0].id] = detail
+                if conflicts or failed:
+                    pending = [
+                        entry
+                        for index, entry in enumerate(pending)
+                        if index not in conflicts and index not in failed
+                    ]
+                else:
+                    # 同じキーへの他のトランザクションと競合した。待ってから再送する
+                    time.sleep(batch_backoff_seconds(attempt))
+                continue
+            return BulkCreateResult(
+                created=[mock for mock, _ in pending], rejected=rejected
+            )
+        # 他のトランザクションとの競合が続いた
+        for mock, _ in pending:
+            rejected[mock.id] = "TransactWriteItems did not complete"
+        return BulkCreateResult(created=[], rejected=rejected)
+
+    def _existing_keys(self, keys: list[dict[str, str]]) -> set[tuple[str, str]]:
+        found: set[tuple[str, str]] = set()
+        table_name = self._table.name
+        for chunk in chunked(keys, BATCH_GET_MAX_KEYS):
+            request: dict[str, Any] = {table_name: {"Keys": chunk, **KEY_PROJECTION}}
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                response = self._resource.batch_get_item(RequestItems=request)
+                for item in response["Responses"].get(table_name, []):
+                    found.add((item["method"], item["path"]))
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                time.sleep(batch_backoff_seconds(attempt))
+            else:
+                raise RuntimeError("BatchGetItem left unprocessed keys")
+        return found
+
+    async def find(self, method: HttpMethod, path: str) -> Optional[MockRecord]:
         # PK/SK 文字列構築ロジックが消え、直感的なキー指定になる
         key = {"method": method.value, "path": path}
 
@@ -37,11 +272,14 @@ class DynamoMockRepository:
             return to_domain(item)
         return None
 
-    async def find_by_id(self, mock_id: str) -> Optional[MockEndpoint]:
-        # GSIがないため、Scanを使用（Mockデータは少量なので許容）
-        # ※大量データならGSIの追加を検討するが、今回はシンプルさを優先
+    async def find_by_id(self, mock_id: str) -> Optional[MockRecord]:
+        # IdIndex を1回Queryするだけで済む (テーブルサイズに依存しない)
+        # GSIは結果整合性のため、保存直後は見つからない場合がある
         response = await asyncio.to_thread(
-            self._table.scan, FilterExpression=Attr("id").eq(mock_id)
+            self._table.query,
+            IndexName=ID_INDEX_NAME,
+            KeyConditionExpression=Key("id").eq(mock_id),
+            Limit=1,
         )
         items = response.get("Items", [])
         if items:
@@ -49,7 +287,7 @@ class DynamoMockRepository:
         return None
 
     async def delete(self, mock_id: str) -> bool:
-        # IDしかわからない場合、まずPK/SKを特定する必要がある
+        # IDしかわからない場合、まずIdIndexからPK/SKを特定する
         mock = await self.find_by_id(mock_id)
         if not mock:
             return False
@@ -57,13 +295,56 @@ class DynamoMockRepository:
         key = {"method": mock.method.value, "path": mock.path}
 
         try:
-            await asyncio.to_thread(self._table.delete_item, Key=key)
+            # 特定してから削除するまでに同じキーが別IDで上書きされていたら削除しない
+            await asyncio.to_thread(
+                self._table.delete_item,
+                Key=key,
+                ConditionExpression=Attr("id").eq(mock_id),
+            )
             return True
         except ClientError:
             # ログ出力などをここで行う
             return False
 
-    async def find_all(self) -> list[MockEndpoint]:
-        response = await asyncio.to_thread(self._table.scan)
-        items = response.get("Items", [])
-        return [to_domain(item) for item in items]
+    async def find_all(self) -> list[MockRecord]:
+        # 1MBで区切られるScanのページを最後まで辿る
+        return [mock async for mock in self.iter_all(page_size=1000)]
+
+    async def iter_all(
+        self, after: MockKey | None = None, page_size: int = 100
+    ) -> AsyncGenerator[MockRecord, None]:
+        # LastEvaluatedKey を辿ってScanする。順序はテーブルの走査順
+        # ExclusiveStartKey には任意のアイテムのキーを渡せるため、
+        # after はページ途中のアイテムのキーでもよい
+        kwargs: dict[str, Any] = {"Limit": page_size}
+        if after is not None:
+            method, path = after
+            kwargs["ExclusiveStartKey"] = {"method": method.value, "path": path}
+
+        while True:
+            response = await asyncio.to_thread(self._table.scan, **kwargs)
+            for item in response.get("Items", []):
+                yield to_domain(item)
+
+            last_key = response.get("LastEvaluatedKey")
+            if last_key is None:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    async def iter_locations(
+        self, page_size: int = 1000
+    ) -> AsyncGenerator[MockLocation, None]:
+        kwargs: dict[str, Any] = {
+            "Limit": page_size,
+            **PATTERN_LOCATIONS_QUERY,
+            "ExpressionAttributeValues": {":pt": PATTERN_VALUE},
+        }
+        while True:
+            response = await asyncio.to_thread(self._table.query, **kwargs)
+            for item in response.get("Items", []):
+                yield MockLocation.from_storage(item)
+
+            last_key = response.get("LastEvaluatedKey")
+            if last_key is None:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
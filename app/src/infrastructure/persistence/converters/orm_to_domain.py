@@ -1,32 +1,56 @@
-from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+from collections.abc import Mapping
+from typing import Any, cast
+
+from pydantic import BaseModel
+from sqlalchemy import RowMapping
+
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.schemas import MockEndpoint
 from src.infrastructure.persistence.postgres.models import MockEndpointModel
 
 
-def to_domain(orm_model: MockEndpointModel) -> MockEndpoint:
+def _dump(value: BaseModel | None) -> dict[str, Any] | None:
+    return value.model_dump(mode="json") if value is not None else None
+
+
+def to_domain(row: RowMapping) -> MockRecord:
+    """
+    mock_endpoints テーブルの行 (列名 -> 値) をドメインモデルに変換する
+    (保存時に検証済みのため、読み込み時は検証し直さない)
+    """
+    return MockRecord.from_storage(cast(Mapping[str, Any], row))
+
+
+def to_location(row: RowMapping) -> MockLocation:
     """
-    SQLAlchemyモデルをドメインモデルに変換する
+    id, method, path のみを SELECT した行をドメインモデルに変換する
     """
-    return MockEndpoint(
-        id=orm_model.id,
-        path=orm_model.path,
-        method=HttpMethod(orm_model.method),
-        status_code=orm_model.status_code,
-        response_body=orm_model.response_body,
-        headers=orm_model.headers,
-        latency_ms=orm_model.latency_ms,
-    )
+    return MockLocation.from_storage(cast(Mapping[str, Any], row))
 
 
 def to_orm(domain_model: MockEndpoint) -> MockEndpointModel:
     """
     ドメインモデルをSQLAlchemyモデルに変換する
     """
-    return MockEndpointModel(
-        id=domain_model.id,
-        path=domain_model.path,
-        method=domain_model.method.value,
-        status_code=domain_model.status_code,
-        response_body=domain_model.response_body,
-        headers=domain_model.headers,
-        latency_ms=domain_model.latency_ms,
-    )
+    return MockEndpointModel(**to_row(domain_model))
+
+
+def to_row(domain_model: MockEndpoint) -> dict[str, Any]:
+    """
+    ドメインモデルを INSERT 文に渡す列名と値の辞書に変換する (一括登録用)
+    """
+    return {
+        "id": domain_model.id,
+        "path": domain_model.path,
+        "method": domain_model.method.value,
+        "status_code": domain_model.status_code,
+        "response_body": domain_model.response_body,
+        "headers": domain_model.headers,
+        "latency_ms": domain_model.latency_ms,
+        "latency": _dump(domain_model.latency),
+        "rules": [rule.model_dump(mode="json") for rule in domain_model.rules] or None,
+        "sequence": _dump(domain_model.sequence),
+        "streaming": _dump(domain_model.streaming),
+        "binary_body": domain_model.binary_body,
+        "body_ref": _dump(domain_model.body_ref),
+    }
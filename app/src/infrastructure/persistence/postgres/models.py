@@ -1,6 +1,14 @@
 from typing import Any
 
-from sqlalchemy import JSON, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Integer,
+    LargeBinary,
+    Sequence,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -18,7 +26,24 @@ class MockEndpointModel(Base):
     response_body: Mapped[Any] = mapped_column(JSON, nullable=False)
     headers: Mapped[dict[str, str]] = mapped_column(JSON, nullable=False)
     latency_ms: Mapped[int] = mapped_column(Integer, default=0)
+    latency: Mapped[Any] = mapped_column(JSON, nullable=True)
+    rules: Mapped[Any] = mapped_column(JSON, nullable=True)
+    sequence: Mapped[Any] = mapped_column(JSON, nullable=True)
+    streaming: Mapped[Any] = mapped_column(JSON, nullable=True)
+    binary_body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    body_ref: Mapped[Any] = mapped_column(JSON, nullable=True)
 
     __table_args__ = (
         UniqueConstraint("method", "path", name="uq_mock_endpoints_method_path"),
     )
+
+
+# モックの変更ごとに進める版番号。変更通知の取りこぼしの検知に使う
+MOCK_VERSION = Sequence("mock_endpoints_version", metadata=Base.metadata)
+
+
+class MockCounterModel(Base):
+    __tablename__ = "mock_counters"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
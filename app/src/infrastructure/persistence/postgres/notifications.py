@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any
+
+import asyncpg
+from sqlalchemy import ColumnElement, Select, Text, cast, func, make_url, select
+
+from src.domain.mocks.records import MockLocation
+from src.domain.mocks.routing import MockRouter
+from src.infrastructure.persistence.postgres.models import MOCK_VERSION
+
+logger = logging.getLogger("app")
+
+# モックの変更を通知するチャネル
+CHANNEL = "mock_endpoints_changed"
+
+# 変更の種類。これ以外の変更を受け取った場合はキャッシュと索引を作り直す
+UPSERT = "upsert"
+DELETE = "delete"
+
+# このプロセスの識別子。自身の変更は通知を待たずに反映済みのため読み飛ばす
+PROCESS_ID = uuid.uuid4().hex
+
+# 最後に発行した版番号 (未発行なら 0)
+_READ_VERSION = (
+    f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {MOCK_VERSION.name}"
+)
+
+
+def notify_change(
+    op: str,
+    mock_id: str | ColumnElement[str] = "",
+    method: str | ColumnElement[str] = "",
+    path: str | ColumnElement[str] = "",
+) -> Select[Any]:
+    """
+    変更を通知する文。書き込みと同じトランザクションで実行すると、
+    コミットされた時点で LISTEN している全プロセスに配信される。
+    変更ごとに版番号を発行し、通知に含める。
+    mock_id 等に列を渡すと、その列を持つ行ごとに通知する。
+    """
+    payload = func.json_build_object(
+        "op",
+        op,
+        "id",
+        mock_id,
+        "method",
+        method,
+        "path",
+        path,
+        "origin",
+        PROCESS_ID,
+        "version",
+        MOCK_VERSION.next_value(),
+    )
+    return select(func.pg_notify(CHANNEL, cast(payload, Text)))
+
+
+class MockChangeListener:
+    """
+    他プロセスでのモックの登録・削除を LISTEN で受け取り、ルーティング表
+    (ルートキャッシュとパターンの索引) に反映する。
+
+    通知はプール外の専用の接続で受け取る。切断中の通知は失われるため、
+    再接続時に版番号を比べ、進んでいればキャッシュと索引を作り直させる。
+    接続中も check_seconds ごとに版番号を確認し、次の確認までに通知が
+    届かなかった版 (取りこぼし、ロールバックされた変更) があれば同様に作り直させる。
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        router: MockRouter,
+        *,
+        check_seconds: float,
+        retry_seconds: float,
+        origin: str = PROCESS_ID,
+    ) -> None:
+        # SQLAlchemy の URL (postgresql+asyncpg://) を asyncpg の DSN にする
+        self._dsn = make_url(dsn).set(drivername="postgresql")
+        self._router = router
+        self._check_seconds = check_seconds
+        self._retry_seconds = retry_seconds
+        self._origin = origin
+        # 反映済みの版番号。通知で受け取った最大の版
+        self._version: int | None = None
+        # 前回の確認で見つかった、まだ通知の届いていない版
+        self._unnotified: int | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """受信のタスクを起動する (イベントループ内で呼び出す)"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """タスクを止め、接続を閉じる"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        dsn = self._dsn.render_as_string(hide_password=False)
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Could not listen for mock changes: %s", e)
+                await asyncio.sleep(self._retry_seconds)
+                continue
+            try:
+                await self._listen(conn)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("Lost the mock change listener connection: %s", e)
+            finally:
+                conn.terminate()
+            await asyncio.sleep(self._retry_seconds)
+
+    async def _listen(self, conn: asyncpg.Connection) -> None:
+        await conn.add_listener(CHANNEL, self._on_notification)
+        version = await conn.fetchval(_READ_VERSION)
+        if self._version is not None and version > self._version:
+            # 切断していた間の変更は通知されていない
+            self._reset(version)
+        self._version = max(self._version or 0, version)
+        self._unnotified = None
+        while True:
+            await asyncio.sleep(self._check_seconds)
+            self._check(await conn.fetchval(_READ_VERSION))
+
+    def _check(self, version: int) -> None:
+        current = self._version or 0
+        if self._unnotified is not None and current < self._unnotified:
+            self._reset(self._unnotified)
+            current = self._unnotified
+        # 発行されたばかりの版はコミット前の場合があるため、次の確認まで待つ
+        self._unnotified = version if version > current else None
+
+    def _reset(self, version: int) -> None:
+        logger.info("Mock changes may have been missed; resetting the route cache.")
+        self._router.reset()
+        self._version = max(self._version or 0, version)
+
+    def _on_notification(
+        self,
+        _conn: object,
+        _pid: int,
+        _channel: str,
+        payload: object,
+    ) -> None:
+        change = json.loads(str(payload))
+        self._version = max(self._version or 0, change["version"])
+        if change["origin"] != self._origin and self._task is not None:
+            self._apply(change)
+
+    def _apply(self, change: dict[str, Any]) -> None:
+        # 通知の内容だけで反映し、定義は次の参照で読み込ませる
+        # (一括登録では1行ごとに通知されるため、ここで問い合わせない)
+        op = change["op"]
+        if op == DELETE:
+            self._router.remove(change["id"])
+        elif op == UPSERT:
+            self._router.upsert(MockLocation.from_storage(change))
+        else:
+            self._router.reset()
@@ -0,0 +1,49 @@
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.persistence.postgres.models import MockCounterModel
+
+
+class PostgresCounterBackend:
+    """
+    PostgreSQL implementation of CounterBackend.
+    Counters live in one row per key; increments are applied with
+    INSERT ... ON CONFLICT DO UPDATE, so concurrent writers never lose counts.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        # Counters are flushed outside of any request, so they use their own
+        # short-lived sessions instead of the request-scoped one.
+        self._session_factory = session_factory
+
+    async def add(self, deltas: dict[str, int]) -> dict[str, int]:
+        """
+        Add every delta in a single multi-row upsert and return the new totals.
+        """
+        if not deltas:
+            return {}
+        # Sorted keys keep the row lock order stable across concurrent flushes
+        upsert = insert(MockCounterModel).values(
+            [{"key": key, "count": delta} for key, delta in sorted(deltas.items())]
+        )
+        stmt = upsert.on_conflict_do_update(
+            index_elements=[MockCounterModel.key],
+            set_={"count": MockCounterModel.count + upsert.excluded.count},
+        ).returning(MockCounterModel.key, MockCounterModel.count)
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            totals: dict[str, int] = dict(result.tuples().all())
+            await session.commit()
+        return totals
+
+    async def reset(self, key: str | None = None) -> None:
+        """
+        Delete the counter for key, or every counter when key is None.
+        """
+        stmt = delete(MockCounterModel)
+        if key is not None:
+            stmt = stmt.where(MockCounterModel.key == key)
+        async with self._session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
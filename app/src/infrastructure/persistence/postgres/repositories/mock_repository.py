@@ -1,14 +1,79 @@
-from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy import Select, bindparam, delete, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from src.domain.mocks.pagination import MockKey
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.repository import BulkCreateResult
 from src.domain.mocks.schemas import HttpMethod, MockEndpoint
-from src.infrastructure.persistence.converters.orm_to_domain import to_domain, to_orm
+from src.infrastructure.persistence.converters.orm_to_domain import (
+    to_domain,
+    to_location,
+    to_orm,
+    to_row,
+)
 from src.infrastructure.persistence.postgres.models import MockEndpointModel
+from src.infrastructure.persistence.postgres.notifications import (
+    DELETE,
+    UPSERT,
+    notify_change,
+)
+
+# Reads select the table's columns with Core statements: rows map straight to
+# MockRecord without hydrating ORM instances into the session identity map.
+_MOCKS = MockEndpointModel.__table__
+_SELECT_MOCKS = select(*_MOCKS.c)
+# Built once with bind parameters so every lookup renders the same SQL, which
+# SQLAlchemy's compiled cache and asyncpg's per-connection prepared statement
+# cache then reuse (served by the unique (method, path) index).
+_FIND_BY_KEY = _SELECT_MOCKS.where(
+    _MOCKS.c.method == bindparam("method"), _MOCKS.c.path == bindparam("path")
+)
+_FIND_BY_ID = _SELECT_MOCKS.where(_MOCKS.c.id == bindparam("id"))
+# Only the columns and rows the router's pattern index needs (may_be_pattern)
+_SELECT_LOCATIONS = select(_MOCKS.c.id, _MOCKS.c.method, _MOCKS.c.path).where(
+    or_(_MOCKS.c.path.like("%{%"), _MOCKS.c.path.like("%*%"))
+)
+
+
+def _select_in_key_order(after: MockKey | None) -> Select[Any]:
+    """All mocks ordered by (method, path), resuming after a key if given."""
+    stmt = _SELECT_MOCKS.order_by(_MOCKS.c.method, _MOCKS.c.path)
+    if after is not None:
+        method, path = after
+        stmt = stmt.where(tuple_(_MOCKS.c.method, _MOCKS.c.path) > (method.value, path))
+    return stmt
+
+
+async def _find(
+    conn: AsyncConnection, method: HttpMethod, path: str
+) -> MockRecord | None:
+    result = await conn.execute(_FIND_BY_KEY, {"method": method.value, "path": path})
+    row = result.mappings().one_or_none()
+    return to_domain(row) if row else None
+
+
+async def _iter_locations(
+    conn: AsyncConnection, page_size: int
+) -> AsyncGenerator[MockLocation, None]:
+    result = await conn.stream(_SELECT_LOCATIONS.execution_options(yield_per=page_size))
+    try:
+        async for row in result.mappings():
+            yield to_location(row)
+    finally:
+        await result.close()
 
 
 class PostgresMockRepository:
     """
     PostgreSQL implementation of MockRepository using SQLAlchemy.
+    Every write also sends a change notification in its transaction, so
+    other processes listening for it update their route caches on commit.
+    Reads run on the session's connection and leave its transaction to the
+    caller; the simulator reads through PostgresMockReader instead.
     """
 
     def __init__(self, session: AsyncSession) -> None:
@@ -21,20 +86,66 @@ class PostgresMockRepository:
         """
         orm_model = to_orm(mock)
         await self.session.merge(orm_model)
+        await self.session.execute(
+            notify_change(UPSERT, mock.id, mock.method.value, mock.path)
+        )
         await self.session.commit()
 
-    async def find(self, method: HttpMethod, path: str) -> MockEndpoint | None:
+    async def create(self, mock: MockEndpoint) -> bool:
         """
-        Find a mock endpoint by method and path.
+        Insert a mock endpoint unless its (method, path) already exists,
+        using INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        Returns True if the row was inserted.
+        """
+        stmt = (
+            insert(MockEndpointModel)
+            .values(to_row(mock))
+            .on_conflict_do_nothing()
+            .returning(MockEndpointModel.id)
+        )
+        result = await self.session.execute(stmt)
+        inserted = result.scalar_one_or_none() is not None
+        if inserted:
+            await self.session.execute(
+                notify_change(UPSERT, mock.id, mock.method.value, mock.path)
+            )
+        await self.session.commit()
+        return inserted
+
+    async def create_many(self, mocks: list[MockEndpoint]) -> BulkCreateResult:
+        """
+        Insert mock endpoints with a single multi-row INSERT ... ON CONFLICT
+        DO NOTHING in one transaction.
+        Returns the mocks that were inserted; the rest already existed
+        (nothing is rejected per row: a bad row fails the whole statement).
+        Each inserted row is announced as its own upsert by the same
+        statement, so listeners update just those routes instead of
+        dropping their whole cache once per batch.
         """
-        stmt = select(MockEndpointModel).where(
-            MockEndpointModel.method == method.value, MockEndpointModel.path == path
+        if not mocks:
+            return BulkCreateResult(created=[])
+        inserted = (
+            insert(MockEndpointModel)
+            .values([to_row(mock) for mock in mocks])
+            .on_conflict_do_nothing()
+            .returning(_MOCKS.c.id, _MOCKS.c.method, _MOCKS.c.path)
+            .cte("inserted")
         )
+        stmt = notify_change(
+            UPSERT, inserted.c.id, inserted.c.method, inserted.c.path
+        ).add_columns(inserted.c.id)
         result = await self.session.execute(stmt)
-        orm_model = result.scalar_one_or_none()
-        if orm_model:
-            return to_domain(orm_model)
-        return None
+        inserted_ids = set(result.scalars("id").all())
+        await self.session.commit()
+        return BulkCreateResult(
+            created=[mock for mock in mocks if mock.id in inserted_ids]
+        )
+
+    async def find(self, method: HttpMethod, path: str) -> MockRecord | None:
+        """
+        Find a mock endpoint by method and path.
+        """
+        return await _find(await self.session.connection(), method, path)
 
     async def delete(self, mock_id: str) -> bool:
         """
@@ -43,25 +154,86 @@ class PostgresMockRepository:
         """
         stmt = delete(MockEndpointModel).where(MockEndpointModel.id == mock_id)
         result = await self.session.execute(stmt)
+        deleted = result.rowcount > 0
+        if deleted:
+            await self.session.execute(notify_change(DELETE, mock_id))
         await self.session.commit()
-        return result.rowcount > 0
+        return deleted
 
-    async def find_by_id(self, mock_id: str) -> MockEndpoint | None:
+    async def find_by_id(self, mock_id: str) -> MockRecord | None:
         """
         Find a mock endpoint by ID.
         """
-        stmt = select(MockEndpointModel).where(MockEndpointModel.id == mock_id)
-        result = await self.session.execute(stmt)
-        orm_model = result.scalar_one_or_none()
-        if orm_model:
-            return to_domain(orm_model)
-        return None
+        conn = await self.session.connection()
+        result = await conn.execute(_FIND_BY_ID, {"id": mock_id})
+        row = result.mappings().one_or_none()
+        return to_domain(row) if row else None
 
-    async def find_all(self) -> list[MockEndpoint]:
+    async def find_all(self) -> list[MockRecord]:
         """
         Retrieve all mock endpoints.
         """
-        stmt = select(MockEndpointModel)
-        result = await self.session.execute(stmt)
-        orm_models = result.scalars().all()
-        return [to_domain(m) for m in orm_models]
+        conn = await self.session.connection()
+        result = await conn.execute(_SELECT_MOCKS)
+        return [to_domain(row) for row in result.mappings()]
+
+    async def iter_locations(
+        self, page_size: int = 1000
+    ) -> AsyncGenerator[MockLocation, None]:
+        """
+        Stream the id, method and path of every mock endpoint.
+        """
+        conn = await self.session.connection()
+        async for location in _iter_locations(conn, page_size):
+            yield location
+
+    async def iter_all(
+        self, after: MockKey | None = None, page_size: int = 100
+    ) -> AsyncGenerator[MockRecord, None]:
+        """
+        Stream all mock endpoints ordered by (method, path).
+        Rows are fetched through a server-side cursor, page_size at a time,
+        and keyset pagination on the unique (method, path) index makes
+        resuming from a cursor independent of the offset.
+        """
+        stmt = _select_in_key_order(after)
+        conn = await self.session.connection()
+        result = await conn.stream(stmt.execution_options(yield_per=page_size))
+        try:
+            async for row in result.mappings():
+                yield to_domain(row)
+        finally:
+            await result.close()
+
+
+class PostgresMockReader:
+    """
+    Read-only PostgreSQL repository for the simulator.
+
+    Unlike PostgresMockRepository it opens no session: each query borrows a
+    pooled connection from the engine and returns it as soon as the rows are
+    read, so a simulated request holds a connection only for its lookup, not
+    through latency simulation and rendering.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+
+    async def find(self, method: HttpMethod, path: str) -> MockRecord | None:
+        """
+        Find a mock endpoint by method and path.
+        This is the simulator's hot path, so it runs a prepared Core query.
+        """
+        async with self.engine.connect() as conn:
+            return await _find(conn, method, path)
+
+    async def iter_locations(
+        self, page_size: int = 1000
+    ) -> AsyncGenerator[MockLocation, None]:
+        """
+        Stream the id, method and path of every mock endpoint through a
+        server-side cursor, holding one connection until the scan ends.
+        """
+        async with self.engine.connect() as conn:
+            async for location in _iter_locations(conn, page_size):
+                yield location
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import logging.config
 from contextlib import asynccontextmanager
@@ -5,13 +6,28 @@ from typing import Annotated, AsyncGenerator, Awaitable, Callable
 
 import yaml
 from fastapi import Depends, FastAPI, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy.exc import SQLAlchemyError
 
-from src.dependencies import get_mock_sim_service
+from src.config import get_settings
+from src.dependencies import (
+    get_counter_store,
+    get_mock_change_listener,
+    get_mock_sim_service,
+)
 from src.domain.mocks.exceptions import MockNotFoundError
 from src.domain.mocks.router import router as mocks_router
+from src.domain.mocks.schemas import SimulationRequest
 from src.domain.mocks.services import MockSimulatorService
+from src.domain.mocks.streaming import stream_headers, stream_media_type
+from src.infrastructure.dynamodb import client as dynamodb_client
+from src.infrastructure.dynamodb.async_client import close_async_dynamodb_client
+from src.infrastructure.persistence.postgres.database import (
+    dispose_engine,
+    warm_up_pool,
+)
+from src.shared.json_codec import get_json_codec
 from src.shared.logging_utils import generate_request_id, set_request_id
 from src.shared.result import Failure, Success
 
@@ -39,11 +55,41 @@ class HealthResponse(BaseModel):
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup logic
     logger.info("Application startup sequence initiated.")
+    settings = get_settings()
+    logger.info("Using the %s JSON codec.", get_json_codec().name)
+    if settings.db_type == "postgres":
+        # Open pooled connections up front so the first requests after a
+        # deploy do not pay for connection setup. An unreachable database must
+        # not block startup; the first request reports the error instead.
+        try:
+            warmed = await warm_up_pool(settings.postgres_pool_warmup_connections)
+        except (OSError, SQLAlchemyError) as e:
+            logger.warning("PostgreSQL connection pool warm-up failed: %s", e)
+        else:
+            logger.info(
+                "PostgreSQL connection pool warmed up with %d connections.", warmed
+            )
+        if settings.postgres_change_listener:
+            # Apply mocks registered or deleted by other processes to the
+            # route cache as their transactions commit
+            get_mock_change_listener().start()
+    else:
+        # Build the shared boto3 resource and open a connection ahead of traffic
+        await asyncio.to_thread(dynamodb_client.warm_up, settings.dynamodb_table_name)
 
     yield
 
     # Shutdown logic
     logger.info("Application shutdown sequence initiated.")
+    # Write out batched sequence counters before the database goes away
+    await get_counter_store().close()
+    if settings.db_type == "postgres":
+        if settings.postgres_change_listener:
+            await get_mock_change_listener().stop()
+        await dispose_engine()
+    else:
+        dynamodb_client.close_dynamodb()
+        await close_async_dynamodb_client()
 
 
 # 3. App Definition
@@ -97,24 +143,46 @@ async def _execute_simulation(
     method = request.method
 
     # 2. Execute simulation
-    result = await service.execute(method, full_path)
+    # The body is passed as a reader so it is only received when a template
+    # references it
+    result = await service.execute(
+        method,
+        full_path,
+        if_none_match=request.headers.get("if-none-match"),
+        request=SimulationRequest(
+            query=request.query_params,
+            headers=request.headers,
+            read_body=request.body,
+            loads=get_json_codec().loads,
+        ),
+    )
 
     # 3. Build response
     match result:
+        case Success(sim_result) if sim_result.stream is not None:
+            # Chunks are slices of the encoded body, sent as they are paced
+            return StreamingResponse(
+                service.stream(sim_result),
+                status_code=sim_result.status_code,
+                headers=stream_headers(sim_result),
+                media_type=stream_media_type(sim_result),
+            )
+        case Success(sim_result) if sim_result.body_file is not None:
+            # Sent straight from the file (pathsend where the server supports it)
+            return FileResponse(
+                sim_result.body_file.path,
+                status_code=sim_result.status_code,
+                headers=sim_result.headers,
+                media_type=sim_result.media_type,
+            )
         case Success(sim_result):
-            # If body is string, we might want to return Response directly
-            # to avoid extra quoting
-            if isinstance(sim_result.body, str):
-                return Response(
-                    content=sim_result.body,
-                    status_code=sim_result.status_code,
-                    headers=sim_result.headers,
-                )
-
-            return JSONResponse(
+            # Body is already encoded (JSON bodies included), so no
+            # re-serialization is needed here
+            return Response(
                 content=sim_result.body,
                 status_code=sim_result.status_code,
                 headers=sim_result.headers,
+                media_type=sim_result.media_type,
             )
         case Failure(MockNotFoundError()):
             raise HTTPException(status_code=404, detail="Mock not found")
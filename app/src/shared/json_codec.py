@@ -0,0 +1,92 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Protocol
+
+from src.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency (fast-json extra)
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
+
+# A run of 19 or more digits may be an integer beyond 64 bits
+_LONG_DIGITS = re.compile(rb"[0-9]{19}")
+_LONG_DIGITS_TEXT = re.compile(r"[0-9]{19}")
+
+
+class JsonCodec(Protocol):
+    """Encodes and decodes JSON documents that are not pydantic models."""
+
+    name: str
+
+    def dumps(self, value: Any) -> bytes:  # noqa: ANN401
+        """Compact UTF-8 JSON (non-ASCII characters are not escaped)."""
+        ...
+
+    def loads(self, data: bytes | str) -> Any:  # noqa: ANN401
+        """Raises ValueError when data is not valid JSON."""
+        ...
+
+
+class StdlibJsonCodec:
+    name = "stdlib"
+
+    def dumps(self, value: Any) -> bytes:  # noqa: ANN401
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes | str) -> Any:  # noqa: ANN401
+        return json.loads(data)
+
+
+class OrjsonJsonCodec:
+    """
+    orjson-backed codec. Integers beyond 64 bits are not supported by orjson:
+    encoding them falls back to the stdlib. Decoding would silently turn them
+    into floats, so documents with a digit run long enough to hold one are
+    decoded by the stdlib instead.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+        self._fallback = StdlibJsonCodec()
+
+    def dumps(self, value: Any) -> bytes:  # noqa: ANN401
+        try:
+            encoded: bytes = orjson.dumps(value)
+        except TypeError:
+            return self._fallback.dumps(value)
+        return encoded
+
+    def loads(self, data: bytes | str) -> Any:  # noqa: ANN401
+        if isinstance(data, str):
+            has_long_digits = _LONG_DIGITS_TEXT.search(data) is not None
+        else:
+            has_long_digits = _LONG_DIGITS.search(data) is not None
+        if has_long_digits:
+            return self._fallback.loads(data)
+        return orjson.loads(data)
+
+
+def make_json_codec(name: str) -> JsonCodec:
+    """
+    Build the codec named by the json_codec setting. "auto" picks orjson when
+    it is installed and the stdlib otherwise.
+    """
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name == "orjson":
+        return OrjsonJsonCodec()
+    if name == "stdlib":
+        return StdlibJsonCodec()
+    raise ValueError(f"Unknown JSON codec: {name!r}")
+
+
+@lru_cache
+def get_json_codec() -> JsonCodec:
+    """The process-wide codec selected in Settings."""
+    return make_json_codec(get_settings().json_codec)
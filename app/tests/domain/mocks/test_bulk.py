@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.domain.mocks import bulk
+from src.domain.mocks.bulk import encode_ndjson, iter_ndjson_lines
+from src.domain.mocks.exceptions import LineTooLongError
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+
+
+async def collect(iterator) -> list:
+    return [value async for value in iterator]
+
+
+async def chunks_of(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+class TestIterNdjsonLines:
+    async def test_joins_lines_split_across_chunks(self):
+        lines = await collect(
+            iter_ndjson_lines(
+                chunks_of(b'{"a":', b"1}\n\n", b'{"b":2}\r\n{"c"', b":3}"), 100
+            )
+        )
+
+        assert lines == [(1, b'{"a":1}'), (3, b'{"b":2}\r'), (4, b'{"c":3}')]
+
+    async def test_empty_body(self):
+        assert await collect(iter_ndjson_lines(chunks_of(b""), 100)) == []
+
+    async def test_reports_lines_over_the_maximum(self):
+        lines = await collect(
+            iter_ndjson_lines(
+                chunks_of(b"12345", b"678", b"9\nabc\n", b"x" * 20, b"\nok", b"!" * 9),
+                8,
+            )
+        )
+
+        assert lines == [
+            (1, LineTooLongError(8)),
+            (2, b"abc"),
+            (3, LineTooLongError(8)),
+            (4, LineTooLongError(8)),
+        ]
+
+    async def test_many_small_chunks(self):
+        body = b"".join(b'{"path": "/p/%d"}\n' % i for i in range(1000))
+        chunks = [body[i : i + 7] for i in range(0, len(body), 7)]
+
+        lines = await collect(iter_ndjson_lines(chunks_of(*chunks), 1024))
+
+        assert [line for _, line in lines] == body.splitlines()
+
+
+@pytest.mark.asyncio
+class TestEncodeNdjson:
+    async def test_one_mock_per_line_in_bounded_chunks(self, monkeypatch):
+        monkeypatch.setattr(bulk, "EXPORT_CHUNK_BYTES", 100)
+
+        async def mocks():
+            for i in range(5):
+                yield MockRecord.from_model(
+                    MockEndpoint(id=str(i), path=f"/m/{i}", method=HttpMethod.GET)
+                )
+
+        chunks = await collect(encode_ndjson(mocks()))
+        lines = b"".join(chunks).splitlines()
+
+        assert len(chunks) > 1
+        assert [json.loads(line)["id"] for line in lines] == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,88 @@
+from src.domain.mocks.cache import LruCache, MockRouteCache
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLruCache:
+    def test_evicts_least_recently_used(self):
+        cache: LruCache[str, int] = LruCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_expires_after_ttl(self):
+        clock = FakeClock()
+        cache: LruCache[str, int] = LruCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") is not None
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_disabled_when_max_entries_is_zero(self):
+        cache: LruCache[str, int] = LruCache(max_entries=0, ttl_seconds=60)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+
+
+class TestMockRouteCache:
+    def make_mock(self) -> MockRecord:
+        return MockRecord.from_model(
+            MockEndpoint(id="1", path="/users", method=HttpMethod.GET)
+        )
+
+    def test_positive_and_negative_entries(self):
+        clock = FakeClock()
+        cache = MockRouteCache(
+            max_entries=10, ttl_seconds=60, negative_ttl_seconds=1, clock=clock
+        )
+        cache.put(HttpMethod.GET, "/users", self.make_mock(), cache.generation)
+        cache.put(HttpMethod.GET, "/missing", None, cache.generation)
+
+        hit = cache.get(HttpMethod.GET, "/users")
+        miss = cache.get(HttpMethod.GET, "/missing")
+        assert hit is not None and hit.value is not None
+        assert miss is not None and miss.value is None
+
+        clock.now = 1.0
+        assert cache.get(HttpMethod.GET, "/missing") is None
+        assert cache.get(HttpMethod.GET, "/users") is not None
+
+    def test_negative_cache_can_be_disabled(self):
+        cache = MockRouteCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=0)
+        cache.put(HttpMethod.GET, "/missing", None, cache.generation)
+
+        assert cache.get(HttpMethod.GET, "/missing") is None
+
+    def test_invalidate_id(self):
+        cache = MockRouteCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=1)
+        cache.put(HttpMethod.GET, "/users", self.make_mock(), cache.generation)
+
+        cache.invalidate_id("1")
+
+        assert cache.get(HttpMethod.GET, "/users") is None
+
+    def test_stale_generation_is_not_stored(self):
+        cache = MockRouteCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=1)
+        generation = cache.generation
+        cache.invalidate(HttpMethod.GET, "/users")
+
+        cache.put(HttpMethod.GET, "/users", None, generation)
+
+        assert cache.get(HttpMethod.GET, "/users") is None
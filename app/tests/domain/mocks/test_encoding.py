@@ -0,0 +1,69 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.domain.mocks.encoding import (
+    CODECS,
+    MIN_COMPRESS_BYTES,
+    compress_variants,
+    parse_accept_encoding,
+    select_encoding,
+)
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, BR;q=0.5 , zstd;q=0, *;q=x") == {
+        "gzip": 1.0,
+        "br": 0.5,
+        "zstd": 0.0,
+        "*": 0.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0", None),
+        ("*, gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_select_encoding(header, expected):
+    assert select_encoding(header, {"gzip": b""}) == expected
+
+
+def test_select_encoding_prefers_server_order():
+    # zstd / br は任意の依存のため、利用できる方式の中での順序を確かめる
+    preferred = next(iter(CODECS))
+
+    assert select_encoding("gzip;q=0.1, br, zstd", CODECS) == preferred
+    assert select_encoding("br, zstd", {"gzip"}) is None
+
+
+def test_compress_variants():
+    body = b'{"message": "hello"}' * 100
+    variants = compress_variants(body)
+
+    assert gzip.decompress(variants["gzip"]) == body
+    # 同じボディからは同じバイト列 (ETag を安定させる)
+    assert compress_variants(body) == variants
+
+
+def test_compress_variants_from_threads():
+    bodies = [str(i).encode() * 4096 for i in range(32)]
+    expected = [compress_variants(body) for body in bodies]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(compress_variants, bodies)) == expected
+
+
+def test_small_or_incompressible_bodies_are_not_compressed():
+    assert compress_variants(b"x" * (MIN_COMPRESS_BYTES - 1)) == {}
+    # ランダムなデータ (圧縮済みの画像等) は小さくならない
+    assert compress_variants(os.urandom(4096)) == {}
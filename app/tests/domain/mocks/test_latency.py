@@ -0,0 +1,80 @@
+import asyncio
+import random
+
+import pytest
+
+from src.domain.mocks.latency import LatencyScheduler, sample_latency_ms
+from src.domain.mocks.schemas import LatencyDistribution, LatencyProfile
+
+
+class TestSampleLatency:
+    def test_fixed_without_profile(self):
+        assert sample_latency_ms(120, None, random.Random(0)) == 120
+
+    def test_uniform_within_bounds(self):
+        profile = LatencyProfile(
+            distribution=LatencyDistribution.UNIFORM, min_ms=10, max_ms=20
+        )
+        rng = random.Random(0)
+
+        samples = [sample_latency_ms(0, profile, rng) for _ in range(100)]
+
+        assert all(10 <= sample <= 20 for sample in samples)
+
+    def test_jitter_is_never_negative(self):
+        profile = LatencyProfile(distribution=LatencyDistribution.JITTER, jitter_ms=50)
+        rng = random.Random(0)
+
+        samples = [sample_latency_ms(10, profile, rng) for _ in range(100)]
+
+        assert all(0 <= sample <= 60 for sample in samples)
+
+    def test_percentiles_are_interpolated(self):
+        profile = LatencyProfile(
+            distribution=LatencyDistribution.PERCENTILE,
+            percentiles={50: 100, 99: 1000},
+        )
+        rng = random.Random(0)
+
+        samples = sorted(sample_latency_ms(0, profile, rng) for _ in range(1000))
+
+        assert samples[0] == 100
+        assert samples[-1] == 1000
+        # Roughly half of the samples fall below the 50th percentile value
+        assert 400 <= sum(1 for sample in samples if sample == 100) <= 600
+
+
+@pytest.mark.asyncio
+class TestLatencyScheduler:
+    async def test_wakes_in_deadline_order(self):
+        scheduler = LatencyScheduler()
+        woken: list[str] = []
+
+        async def wait(name: str, seconds: float) -> None:
+            await scheduler.sleep(seconds)
+            woken.append(name)
+
+        await asyncio.gather(wait("late", 0.03), wait("early", 0.01))
+
+        assert woken == ["early", "late"]
+        metrics = scheduler.metrics()
+        assert metrics.scheduled == 2
+        assert metrics.completed == 2
+        assert metrics.pending == 0
+
+    async def test_cancelled_waiters_are_skipped(self):
+        scheduler = LatencyScheduler()
+        cancelled = asyncio.ensure_future(scheduler.sleep(0.01))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await scheduler.sleep(0.02)
+
+        assert scheduler.metrics().completed == 1
+
+    async def test_many_concurrent_sleeps(self):
+        scheduler = LatencyScheduler()
+
+        await asyncio.gather(*[scheduler.sleep(0.01) for _ in range(2000)])
+
+        assert scheduler.metrics().completed == 2000
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from src.domain.mocks.pagination import decode_cursor, encode_cursor, stream_page
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+
+
+def make_mock(i: int) -> MockRecord:
+    return MockRecord.from_model(
+        MockEndpoint(id=f"id-{i}", path=f"/items/{i}", method=HttpMethod.GET)
+    )
+
+
+async def read(chunks) -> dict:
+    return json.loads(b"".join([chunk async for chunk in chunks]))
+
+
+class TestCursor:
+    def test_round_trip(self):
+        mock = MockRecord.from_model(
+            MockEndpoint(id="1", path="/a b/ü?x=1", method=HttpMethod.PATCH)
+        )
+
+        cursor = encode_cursor(mock)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (HttpMethod.PATCH, "/a b/ü?x=1")
+
+    @pytest.mark.parametrize("cursor", ["!!!", "e30", "WyJGT08iLCIvYSJd", "WzEsMl0"])
+    def test_malformed(self, cursor):
+        with pytest.raises(ValueError, match="Malformed cursor"):
+            decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+class TestStreamPage:
+    async def test_limit_sets_next_cursor(self):
+        closed = []
+
+        async def mocks():
+            try:
+                for i in range(5):
+                    yield make_mock(i)
+            finally:
+                closed.append(True)
+
+        page = await read(stream_page(mocks(), limit=2))
+
+        assert [item["id"] for item in page["items"]] == ["id-0", "id-1"]
+        assert decode_cursor(page["next_cursor"]) == (HttpMethod.GET, "/items/1")
+        assert closed == [True]
+
+    async def test_last_page_has_no_cursor(self):
+        async def mocks():
+            for i in range(2):
+                yield make_mock(i)
+
+        assert (await read(stream_page(mocks(), limit=2)))["next_cursor"] is None
+        assert len((await read(stream_page(mocks(), limit=None)))["items"]) == 2
+
+    async def test_empty(self):
+        async def mocks():
+            return
+            yield
+
+        assert await read(stream_page(mocks(), limit=None)) == {
+            "items": [],
+            "next_cursor": None,
+        }
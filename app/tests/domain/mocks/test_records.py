@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint, MockRule
+
+
+def make_mock() -> MockEndpoint:
+    return MockEndpoint.model_validate(
+        {
+            "id": "1",
+            "path": "/users",
+            "method": "GET",
+            "response_body": {"name": "alice"},
+            "headers": {"X-Test": "1"},
+            "latency": {"distribution": "jitter", "jitter_ms": 5},
+            "rules": [
+                {
+                    "conditions": [{"source": "query", "name": "page", "value": "2"}],
+                    "status_code": 404,
+                }
+            ],
+            "sequence": {"steps": [{"status_code": 503}, {}]},
+            "binary_body": b"\x00\xff",
+            "body_ref": {"digest": "a" * 64, "size": 1},
+        }
+    )
+
+
+def test_round_trips_through_model():
+    mock = make_mock()
+    record = MockRecord.from_model(mock)
+
+    assert record.key == mock.key
+    assert isinstance(record.rules[0], MockRule)
+    assert record.to_model() == mock
+
+
+def test_from_storage_matches_from_model():
+    mock = make_mock()
+
+    assert MockRecord.from_storage(mock.model_dump()) == MockRecord.from_model(mock)
+
+
+def test_from_storage_converts_stored_json_without_recompiling_patterns():
+    mock = MockEndpoint.model_validate(
+        {
+            **make_mock().model_dump(),
+            "latency": {"distribution": "percentile", "percentiles": {50: 10}},
+            "rules": [
+                {
+                    "conditions": [
+                        {
+                            "source": "header",
+                            "name": "x",
+                            "operator": "regex",
+                            "value": "^a",
+                        }
+                    ]
+                }
+            ],
+            "sequence": {"steps": [{"status_code": 503}], "mode": "cycle"},
+            "streaming": {"events": [{"data": "hello", "event": "greeting"}]},
+            "body_ref": {
+                "digest": "a" * 64,
+                "size": 1,
+                "media_type": "application/json",
+                "encodings": {"gzip": {"digest": "b" * 64, "size": 1}},
+            },
+        }
+    )
+    # Stored as JSON: enums become strings and integer dict keys become strings
+    stored = json.loads(mock.model_dump_json(exclude={"binary_body"}))
+
+    record = MockRecord.from_storage(stored)
+
+    assert record.to_model() == mock.model_copy(update={"binary_body": None})
+    # Stored values were validated when registered, so patterns are not recompiled
+    stored["rules"][0]["conditions"][0]["value"] = "("
+    assert MockRecord.from_storage(stored).rules[0].conditions[0].value == "("
+
+
+def test_from_storage_fills_fields_missing_from_old_items():
+    record = MockRecord.from_storage({"id": "1", "path": "/old", "method": "POST"})
+
+    assert record.method is HttpMethod.POST
+    assert record.status_code == 200
+    assert record.response_body == {}
+    assert record.headers == {}
+    assert record.rules == ()
+    assert record.latency is None
+    assert record.body_ref is None
+
+
+def test_record_is_immutable_and_has_no_instance_dict():
+    record = MockRecord.from_model(make_mock())
+
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.status_code = 500  # type: ignore[misc]
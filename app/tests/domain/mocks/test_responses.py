@@ -0,0 +1,77 @@
+import gzip
+
+from src.domain.mocks.responses import build_static_payload, etag_matches
+from src.domain.mocks.schemas import ContentType
+
+
+class TestBuildStaticPayload:
+    def test_mock_headers_override_defaults(self):
+        payload = build_static_payload(
+            200, b"{}", {"Content-Type": "application/vnd.api+json"}, ContentType.JSON
+        )
+
+        assert payload.ok.headers["Content-Type"] == "application/vnd.api+json"
+        assert "content-type" not in payload.ok.headers
+
+    def test_custom_etag_is_used(self):
+        payload = build_static_payload(200, b"{}", {"ETag": '"v1"'}, None)
+
+        assert payload.etag == '"v1"'
+        assert payload.select('"v1"').status_code == 304
+
+    def test_no_etag_for_error_responses(self):
+        payload = build_static_payload(404, b"missing", {}, None)
+
+        assert payload.etag is None
+        assert payload.select("*").status_code == 404
+
+    def test_no_content_length_without_body(self):
+        payload = build_static_payload(204, b"", {}, None)
+
+        assert "content-length" not in payload.ok.headers
+
+
+class TestEtagMatches:
+    def test_matches_list_and_weak_tags(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+
+
+class TestPrecompressedPayload:
+    BODY = b'{"message": "hello"}' * 100
+
+    def test_variant_is_chosen_from_accept_encoding(self):
+        payload = build_static_payload(
+            200, self.BODY, {"Vary": "origin"}, ContentType.JSON, compress=True
+        )
+
+        plain = payload.select(None)
+        assert plain.body == self.BODY
+        assert plain.headers["vary"] == "origin, accept-encoding"
+        assert "content-encoding" not in plain.headers
+
+        compressed = payload.select(None, "br;q=0, gzip")
+        assert gzip.decompress(compressed.body) == self.BODY
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["content-length"] == str(len(compressed.body))
+        assert compressed.headers["etag"] == payload.etag[:-1] + '-gzip"'
+
+    def test_not_modified_compares_the_variant_etag(self):
+        payload = build_static_payload(
+            200, self.BODY, {"ETag": '"v1"'}, None, compress=True
+        )
+
+        assert payload.select('"v1-gzip"', "gzip").status_code == 304
+        assert payload.select('"v1"', "gzip").status_code == 200
+        not_modified = payload.select('"v1"', "identity")
+        assert not_modified.status_code == 304
+        assert not_modified.headers["vary"] == "accept-encoding"
+
+    def test_bodies_with_content_encoding_are_not_recompressed(self):
+        payload = build_static_payload(
+            200, self.BODY, {"Content-Encoding": "gzip"}, None, compress=True
+        )
+
+        assert payload.encoded == {}
+        assert payload.select(None, "gzip").body == self.BODY
@@ -0,0 +1,263 @@
+import asyncio
+
+import pytest
+
+from src.domain.mocks.cache import MockRouteCache
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.routing import MockRouter, PatternTrie, parse_pattern
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+
+
+def make_mock(path: str, mock_id: str | None = None) -> MockRecord:
+    return MockRecord.from_model(
+        MockEndpoint(id=mock_id or path, path=path, method=HttpMethod.GET)
+    )
+
+
+def make_trie(*paths: str) -> PatternTrie:
+    trie = PatternTrie()
+    for path in paths:
+        trie.add(make_mock(path), parse_pattern(path))
+    return trie
+
+
+def matched(trie: PatternTrie, path: str) -> tuple[str, dict[str, str]] | None:
+    result = trie.match(path)
+    if result is None:
+        return None
+    route, params = result
+    return route.pattern, params
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScanCountingRepository:
+    def __init__(self, *mocks: MockRecord):
+        self.mocks = {mock.key: mock for mock in mocks}
+        self.scans = 0
+
+    async def find(self, method: HttpMethod, path: str) -> MockRecord | None:
+        return self.mocks.get(f"{method}:{path}")
+
+    async def iter_locations(self, page_size=1000):
+        self.scans += 1
+        for mock in list(self.mocks.values()):
+            yield MockLocation(mock.id, mock.method, mock.path)
+
+
+def make_router(clock=None) -> MockRouter:
+    cache = MockRouteCache(max_entries=100, ttl_seconds=60, negative_ttl_seconds=60)
+    return MockRouter(cache, refresh_seconds=30, clock=clock or FakeClock())
+
+
+class TestParsePattern:
+    def test_exact_path_is_not_a_pattern(self):
+        assert parse_pattern("/users/1") is None
+        assert parse_pattern("/files/name.{ext}") is None
+
+    def test_segments(self):
+        assert parse_pattern("/users/{id}/*/**") == ["users", "{id}", None, "**"]
+
+    @pytest.mark.parametrize("path", ["/a/**/b", "/a/{id}/b/{id}"])
+    def test_invalid(self, path):
+        with pytest.raises(ValueError):
+            parse_pattern(path)
+
+
+class TestPatternTrie:
+    def test_captures_named_parameters(self):
+        trie = make_trie("/users/{id}/posts/{post_id}")
+
+        assert matched(trie, "/users/7/posts/42") == (
+            "/users/{id}/posts/{post_id}",
+            {"id": "7", "post_id": "42"},
+        )
+        assert matched(trie, "/users/7/posts") is None
+        assert matched(trie, "/users/7/posts/42/x") is None
+
+    def test_literal_wins_over_parameter_and_backtracks(self):
+        trie = make_trie("/users/me/settings/{key}", "/users/{id}/profile")
+
+        assert matched(trie, "/users/me/settings/theme") == (
+            "/users/me/settings/{key}",
+            {"key": "theme"},
+        )
+        # "me" matches the literal branch first, which has no "profile"
+        assert matched(trie, "/users/me/profile") == (
+            "/users/{id}/profile",
+            {"id": "me"},
+        )
+
+    def test_wildcards(self):
+        trie = make_trie("/files/*/meta", "/static/**", "/static/{name}")
+
+        assert matched(trie, "/files/abc/meta") == ("/files/*/meta", {})
+        assert matched(trie, "/static/app.js")[0] == "/static/{name}"
+        assert matched(trie, "/static/js/app.js")[0] == "/static/**"
+        assert matched(trie, "/static")[0] == "/static/**"
+
+    def test_remove_prunes_branches(self):
+        trie = make_trie("/a/{id}/b", "/a/{id}/c")
+
+        trie.remove("/a/{id}/b", parse_pattern("/a/{id}/b"))
+        assert matched(trie, "/a/1/b") is None
+        assert matched(trie, "/a/1/c") is not None
+
+        trie.remove("/a/{id}/c", parse_pattern("/a/{id}/c"))
+        assert trie._root.is_empty()
+
+    def test_many_patterns(self):
+        trie = make_trie(*[f"/tenants/t{i}/users/{{id}}" for i in range(10_000)])
+
+        assert matched(trie, "/tenants/t9999/users/5") == (
+            "/tenants/t9999/users/{id}",
+            {"id": "5"},
+        )
+
+
+@pytest.mark.asyncio
+class TestMockRouter:
+    async def test_exact_match_does_not_load_patterns(self):
+        repo = ScanCountingRepository(make_mock("/users/1"))
+        router = make_router()
+
+        route = await router.resolve(repo, HttpMethod.GET, "/users/1")
+
+        assert route.mock.path == "/users/1"
+        assert route.path_params == {}
+        assert repo.scans == 0
+
+    async def test_loads_patterns_once_and_refreshes(self):
+        clock = FakeClock()
+        repo = ScanCountingRepository(make_mock("/users/{id}"))
+        router = make_router(clock)
+
+        route = await router.resolve(repo, HttpMethod.GET, "/users/1")
+        await router.resolve(repo, HttpMethod.GET, "/users/2")
+
+        assert route.path_params == {"id": "1"}
+        assert repo.scans == 1
+
+        # A pattern registered by another process shows up after a refresh
+        other = make_mock("/orders/{id}")
+        repo.mocks[other.key] = other
+        assert await router.resolve(repo, HttpMethod.GET, "/orders/1") is None
+        clock.now = 30
+        # The stale index keeps answering while it is rebuilt in the background
+        assert await router.resolve(repo, HttpMethod.GET, "/orders/2") is None
+        await router._loading
+        assert await router.resolve(repo, HttpMethod.GET, "/orders/3") is not None
+        assert repo.scans == 2
+
+    async def test_add_and_remove_are_incremental(self):
+        repo = ScanCountingRepository()
+        router = make_router()
+        assert await router.resolve(repo, HttpMethod.GET, "/items/1") is None
+
+        mock = make_mock("/items/{id}")
+        repo.mocks[mock.key] = mock
+        router.add(mock)
+        assert (await router.resolve(repo, HttpMethod.GET, "/items/1")) is not None
+
+        del repo.mocks[mock.key]
+        router.remove(mock.id)
+        assert await router.resolve(repo, HttpMethod.GET, "/items/1") is None
+        assert repo.scans == 1
+
+    async def test_upsert_applies_a_location_without_scanning_the_cache(
+        self, monkeypatch
+    ):
+        repo = ScanCountingRepository(make_mock("/users/1"))
+        router = make_router()
+        assert await router.resolve(repo, HttpMethod.GET, "/users/1") is not None
+        assert await router.resolve(repo, HttpMethod.GET, "/items/1") is None
+        scans = []
+        monkeypatch.setattr(router.cache, "invalidate_id", scans.append)
+
+        # Registered elsewhere: only its key is invalidated and read on demand
+        for mock in (make_mock("/items/1"), make_mock("/items/{id}", "pattern")):
+            repo.mocks[mock.key] = mock
+            router.upsert(MockLocation(mock.id, mock.method, mock.path))
+
+        assert (await router.resolve(repo, HttpMethod.GET, "/items/1")) is not None
+        route = await router.resolve(repo, HttpMethod.GET, "/items/2")
+        assert route.mock.id == "pattern"
+        assert scans == []
+        assert repo.scans == 1
+
+        # Moved to another path: the old pattern is dropped
+        moved = make_mock("/orders/{id}", "pattern")
+        del repo.mocks[route.mock.key]
+        repo.mocks[moved.key] = moved
+        router.upsert(MockLocation(moved.id, moved.method, moved.path))
+
+        assert scans == ["pattern"]
+        assert router._index.match(HttpMethod.GET, "/items/2") is None
+        assert await router.resolve(repo, HttpMethod.GET, "/orders/2") is not None
+
+    async def test_exact_mock_takes_precedence(self):
+        repo = ScanCountingRepository(make_mock("/users/{id}"), make_mock("/users/me"))
+        router = make_router()
+
+        route = await router.resolve(repo, HttpMethod.GET, "/users/me")
+
+        assert route.mock.path == "/users/me"
+
+    async def test_pattern_deleted_elsewhere_is_dropped(self):
+        mock = make_mock("/users/{id}")
+        repo = ScanCountingRepository(mock)
+        router = make_router()
+        assert await router.resolve(repo, HttpMethod.GET, "/users/1") is not None
+
+        del repo.mocks[mock.key]
+        router.cache.clear()
+
+        assert await router.resolve(repo, HttpMethod.GET, "/users/2") is None
+        assert router._index.match(HttpMethod.GET, "/users/2") is None
+
+    async def test_reset_clears_the_cache_and_reloads_patterns(self):
+        repo = ScanCountingRepository(make_mock("/users/1"))
+        router = make_router()
+        assert await router.resolve(repo, HttpMethod.GET, "/orders/1") is None
+
+        # Changes made elsewhere whose notifications were missed
+        for mock in (make_mock("/orders/1"), make_mock("/items/{id}")):
+            repo.mocks[mock.key] = mock
+        router.reset()
+
+        assert await router.resolve(repo, HttpMethod.GET, "/orders/1") is not None
+        assert await router.resolve(repo, HttpMethod.GET, "/items/1") is None
+        await router._loading
+        assert await router.resolve(repo, HttpMethod.GET, "/items/1") is not None
+        assert repo.scans == 2
+
+    async def test_stored_invalid_pattern_is_skipped(self):
+        repo = ScanCountingRepository(make_mock("/a/**/b"), make_mock("/users/{id}"))
+        router = make_router()
+
+        assert await router.resolve(repo, HttpMethod.GET, "/users/1") is not None
+        assert await router.resolve(repo, HttpMethod.GET, "/a/x/b") is None
+
+    async def test_failed_refresh_keeps_the_current_index(self):
+        clock = FakeClock()
+        repo = ScanCountingRepository(make_mock("/users/{id}"))
+        router = make_router(clock)
+        assert await router.resolve(repo, HttpMethod.GET, "/users/1") is not None
+
+        async def failing(page_size=1000):
+            raise OSError("unreachable")
+            yield
+
+        repo.iter_locations = failing
+        clock.now = 30
+        assert await router.resolve(repo, HttpMethod.GET, "/users/2") is not None
+        await asyncio.gather(router._loading, return_exceptions=True)
+        # Retried only after another refresh interval
+        assert await router.resolve(repo, HttpMethod.GET, "/users/3") is not None
+        assert router._loading.done()
@@ -0,0 +1,107 @@
+import pytest
+from pydantic import ValidationError
+
+from src.domain.mocks.rules import RuleInput, compile_rules
+from src.domain.mocks.schemas import MockRule, RuleCondition, SimulationRequest
+
+
+def make_rule(*conditions: dict) -> MockRule:
+    return MockRule.model_validate({"conditions": list(conditions)})
+
+
+def make_input(
+    query: dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+    path_params: dict[str, str] | None = None,
+    body: object = None,
+) -> RuleInput:
+    request = SimulationRequest(query=query or {}, headers=headers or {})
+    return RuleInput(request, path_params or {}, body)
+
+
+def test_first_matching_rule_wins():
+    matcher = compile_rules(
+        [
+            make_rule({"source": "query", "name": "tier", "value": "gold"}),
+            make_rule({"source": "query", "name": "tier", "operator": "exists"}),
+        ]
+    )
+
+    assert matcher.select(make_input(query={"tier": "gold"})) == 0
+    assert matcher.select(make_input(query={"tier": "silver"})) == 1
+    assert matcher.select(make_input()) is None
+
+
+def test_all_conditions_must_match():
+    matcher = compile_rules(
+        [
+            make_rule(
+                {"source": "path", "name": "id", "value": "1"},
+                {
+                    "source": "header",
+                    "name": "X-Role",
+                    "operator": "not_equals",
+                    "value": "guest",
+                },
+            )
+        ]
+    )
+
+    # ヘッダー名は大文字小文字を区別しない。リクエスト側は小文字で渡される
+    assert matcher.select(make_input(path_params={"id": "1"})) == 0
+    assert (
+        matcher.select(make_input(path_params={"id": "1"}, headers={"x-role": "guest"}))
+        is None
+    )
+    assert matcher.select(make_input(path_params={"id": "2"})) is None
+
+
+@pytest.mark.parametrize(
+    ("condition", "body", "expected"),
+    [
+        ({"name": "user.name", "value": "ann"}, {"user": {"name": "ann"}}, True),
+        ({"name": "items.1", "value": "b"}, {"items": ["a", "b"]}, True),
+        ({"name": "count", "value": "3"}, {"count": 3}, True),
+        ({"name": "flag", "value": "true"}, {"flag": True}, True),
+        ({"name": "user", "operator": "absent"}, {"other": 1}, True),
+        (
+            {"name": "name", "operator": "contains", "value": "nn"},
+            {"name": "ann"},
+            True,
+        ),
+        (
+            {"name": "email", "operator": "regex", "value": r"@example\.com$"},
+            {"email": "a@example.com"},
+            True,
+        ),
+        ({"name": "email", "operator": "regex", "value": "x"}, None, False),
+    ],
+)
+def test_body_conditions(condition, body, expected):
+    matcher = compile_rules([make_rule({"source": "body", **condition})])
+
+    assert matcher.needs_body
+    assert (matcher.select(make_input(body=body)) == 0) is expected
+
+
+def test_body_is_not_needed_without_body_conditions():
+    matcher = compile_rules([make_rule({"source": "query", "name": "q", "value": "x"})])
+
+    assert not matcher.needs_body
+
+
+def test_rule_without_conditions_always_matches():
+    assert compile_rules([make_rule()]).select(make_input()) == 0
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        {"source": "query", "name": "q"},
+        {"source": "query", "name": "q", "operator": "regex", "value": "("},
+        {"source": "cookie", "name": "q", "value": "x"},
+    ],
+)
+def test_invalid_condition(condition):
+    with pytest.raises(ValidationError):
+        RuleCondition.model_validate(condition)
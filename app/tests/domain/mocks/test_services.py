@@ -1,26 +1,49 @@
+import gzip
+import json
+import tempfile
+import threading
+from pathlib import Path
+
 import pytest
 
-from src.domain.mocks.exceptions import MockAlreadyExistsError, MockNotFoundError
+from src.domain.mocks import responses
+from src.domain.mocks.cache import MockRouteCache
+from src.domain.mocks.exceptions import (
+    InvalidCursorError,
+    InvalidMockError,
+    LineTooLongError,
+    MockAlreadyExistsError,
+    MockNotFoundError,
+)
+from src.domain.mocks.latency import LatencyScheduler
+from src.domain.mocks.records import MockLocation, MockRecord
+from src.domain.mocks.repository import BulkCreateResult
+from src.domain.mocks.responses import StaticPayloadCache
+from src.domain.mocks.routing import MockRouter
 from src.domain.mocks.schemas import (
     HttpMethod,
     MockCreate,
     MockEndpoint,
+    SimulationRequest,
 )
 from src.domain.mocks.services import MockManagementService, MockSimulatorService
+from src.domain.mocks.state import InMemoryCounterStore
 from src.domain.mocks.template_engine import TemplateEngine
+from src.infrastructure.blobs.local_store import LocalBlobStore
 from src.shared.result import Failure, Success
 
 
 class InMemoryMockRepository:
     def __init__(self):
-        self.store: dict[str, MockEndpoint] = {}  # id -> mock
+        self.store: dict[str, MockRecord] = {}  # id -> mock
         self.lookup: dict[str, str] = {}  # method:path -> id
+        self.refused_paths: set[str] = set()  # create_many rejects these
 
     async def save(self, mock: MockEndpoint) -> None:
-        self.store[mock.id] = mock
+        self.store[mock.id] = MockRecord.from_model(mock)
         self.lookup[mock.key] = mock.id
 
-    async def find(self, method: HttpMethod, path: str) -> MockEndpoint | None:
+    async def find(self, method: HttpMethod, path: str) -> MockRecord | None:
         key = f"{method}:{path}"
         mock_id = self.lookup.get(key)
         if mock_id:
@@ -35,18 +58,86 @@ class InMemoryMockRepository:
             return True
         return False
 
-    async def find_by_id(self, mock_id: str) -> MockEndpoint | None:
+    async def find_by_id(self, mock_id: str) -> MockRecord | None:
         return self.store.get(mock_id)
 
-    async def find_all(self) -> list[MockEndpoint]:
+    async def find_all(self) -> list[MockRecord]:
         return list(self.store.values())
 
+    async def create(self, mock: MockEndpoint) -> bool:
+        if mock.key in self.lookup:
+            return False
+        await self.save(mock)
+        return True
+
+    async def create_many(self, mocks: list[MockEndpoint]) -> BulkCreateResult:
+        result = BulkCreateResult(created=[])
+        for mock in mocks:
+            if mock.path in self.refused_paths:
+                result.rejected[mock.id] = "ValidationException: too large"
+            elif mock.key not in self.lookup:
+                await self.save(mock)
+                result.created.append(mock)
+        return result
+
+    async def iter_all(self, after=None, page_size=100):
+        keys = sorted((mock.method, mock.path) for mock in self.store.values())
+        for method, path in keys:
+            if after is None or (method, path) > after:
+                yield await self.find(method, path)
+
+    async def iter_locations(self, page_size=1000):
+        for mock in list(self.store.values()):
+            yield MockLocation(mock.id, mock.method, mock.path)
+
+
+def make_router() -> MockRouter:
+    return MockRouter(
+        MockRouteCache(max_entries=100, ttl_seconds=60, negative_ttl_seconds=60)
+    )
+
+
+# Content-addressed, so tests can share one directory; nothing is written
+# unless a test registers a large body
+SHARED_BLOBS = LocalBlobStore(Path(tempfile.gettempdir()) / "mock-service-blobs")
+
+
+def make_management(
+    repo: InMemoryMockRepository,
+    router: MockRouter | None = None,
+    counters: InMemoryCounterStore | None = None,
+    blobs: LocalBlobStore | None = None,
+) -> MockManagementService:
+    return MockManagementService(
+        repo,
+        router or make_router(),
+        counters or InMemoryCounterStore(),
+        blobs or SHARED_BLOBS,
+    )
+
+
+def make_simulator(
+    repo: InMemoryMockRepository,
+    router: MockRouter | None = None,
+    counters: InMemoryCounterStore | None = None,
+    blobs: LocalBlobStore | None = None,
+) -> MockSimulatorService:
+    return MockSimulatorService(
+        repo,
+        TemplateEngine(),
+        router or make_router(),
+        StaticPayloadCache(max_entries=100),
+        LatencyScheduler(),
+        counters=counters or InMemoryCounterStore(),
+        blobs=blobs or SHARED_BLOBS,
+    )
+
 
 @pytest.mark.asyncio
 class TestMockManagementService:
     async def test_register_success(self):
         repo = InMemoryMockRepository()
-        service = MockManagementService(repo)
+        service = make_management(repo)
 
         create_dto = MockCreate(
             path="/test",
@@ -68,7 +159,7 @@ class TestMockManagementService:
 
     async def test_register_duplicate(self):
         repo = InMemoryMockRepository()
-        service = MockManagementService(repo)
+        service = make_management(repo)
 
         create_dto = MockCreate(path="/test", method=HttpMethod.GET, status_code=200)
 
@@ -80,7 +171,7 @@ class TestMockManagementService:
 
     async def test_delete_success(self):
         repo = InMemoryMockRepository()
-        service = MockManagementService(repo)
+        service = make_management(repo)
 
         create_dto = MockCreate(path="/test", method=HttpMethod.GET)
         created = (await service.register(create_dto)).value
@@ -93,20 +184,140 @@ class TestMockManagementService:
 
     async def test_delete_not_found(self):
         repo = InMemoryMockRepository()
-        service = MockManagementService(repo)
+        service = make_management(repo)
 
         result = await service.delete("non-existent")
 
         assert isinstance(result, Failure)
         assert isinstance(result.error, MockNotFoundError)
 
+    async def test_list_page_follows_cursor(self):
+        repo = InMemoryMockRepository()
+        service = make_management(repo)
+        for i in range(5):
+            await service.register(
+                MockCreate(path=f"/items/{i}", method=HttpMethod.GET)
+            )
+
+        async def read_page(cursor):
+            result = service.list_page(cursor, limit=2)
+            assert isinstance(result, Success)
+            return json.loads(b"".join([chunk async for chunk in result.value]))
+
+        paths = []
+        cursor = None
+        while True:
+            page = await read_page(cursor)
+            paths.extend(item["path"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert paths == [f"/items/{i}" for i in range(5)]
+
+    async def test_import_bulk_reports_failures_per_line(self):
+        repo = InMemoryMockRepository()
+        router = make_router()
+        route_cache = router.cache
+        service = make_management(repo, router)
+        await service.register(MockCreate(path="/existing", method=HttpMethod.GET))
+        route_cache.put(HttpMethod.GET, "/new/1", None, route_cache.generation)
+
+        async def lines():
+            yield 1, b'{"path": "/new/0", "method": "GET"}'
+            yield 2, b'{"path": "/existing", "method": "GET"}'
+            yield 3, b'{"path": "/new/1", "method": "GET"}'
+            yield 4, b'{"path": "/new/0", "method": "GET"}'
+            yield 6, b'{"path": "/bad", "method": "TRACE"}'
+            yield 7, b"not json"
+            yield 9, b'{"path": "/a/**/b", "method": "GET"}'
+            yield 8, b'{"path": "/new/2", "method": "POST", "status_code": 201}'
+            yield 10, LineTooLongError(64)
+
+        result = await service.import_bulk(lines(), batch_size=2)
+
+        assert isinstance(result, Success)
+        report = result.value
+        assert report.created == 3
+        assert [(f.line, f.reason) for f in report.failures] == [
+            (2, "conflict"),
+            (4, "conflict"),
+            (6, "invalid"),
+            (7, "invalid"),
+            (9, "invalid"),
+            (10, "invalid"),
+        ]
+        assert report.failures[0].path == "/existing"
+        assert report.failures[4].path == "/a/**/b"
+        assert await repo.find(HttpMethod.GET, "/a/**/b") is None
+        assert "method" in report.failures[2].detail
+        assert report.failures[5].detail.endswith("(64 bytes)")
+        assert (await repo.find(HttpMethod.POST, "/new/2")).status_code == 201
+        # The negative entry for a newly imported route is dropped
+        assert route_cache.get(HttpMethod.GET, "/new/1") is None
+
+    async def test_import_bulk_reports_rows_the_store_rejects(self):
+        repo = InMemoryMockRepository()
+        repo.refused_paths = {"/huge"}
+        router = make_router()
+        service = make_management(repo, router)
+
+        async def lines():
+            yield 1, b'{"path": "/ok", "method": "GET"}'
+            yield 2, b'{"path": "/huge", "method": "GET"}'
+
+        result = await service.import_bulk(lines())
+
+        report = result.value
+        assert report.created == 1
+        assert [(f.line, f.reason, f.path) for f in report.failures] == [
+            (2, "rejected", "/huge")
+        ]
+        assert report.failures[0].detail == "ValidationException: too large"
+        assert await repo.find(HttpMethod.GET, "/huge") is None
+
+    async def test_export_round_trips_through_import(self):
+        source = make_management(InMemoryMockRepository())
+        for i in range(3):
+            await source.register(MockCreate(path=f"/e/{i}", method=HttpMethod.GET))
+        exported = b"".join([chunk async for chunk in source.export()])
+
+        target_repo = InMemoryMockRepository()
+        target = make_management(target_repo)
+
+        async def lines():
+            for i, line in enumerate(exported.splitlines(), start=1):
+                yield i, line
+
+        result = await target.import_bulk(lines())
+
+        assert result.value.created == 3
+        assert sorted(target_repo.lookup) == ["GET:/e/0", "GET:/e/1", "GET:/e/2"]
+
+    async def test_register_invalid_pattern(self):
+        service = make_management(InMemoryMockRepository())
+
+        result = await service.register(
+            MockCreate(path="/files/**/meta", method=HttpMethod.GET)
+        )
+
+        assert isinstance(result, Failure)
+        assert isinstance(result.error, InvalidMockError)
+
+    async def test_list_page_invalid_cursor(self):
+        service = make_management(InMemoryMockRepository())
+
+        result = service.list_page("not-a-cursor", limit=10)
+
+        assert isinstance(result, Failure)
+        assert isinstance(result.error, InvalidCursorError)
+
 
 @pytest.mark.asyncio
 class TestMockSimulatorService:
     async def test_execute_success(self):
         repo = InMemoryMockRepository()
-        template_engine = TemplateEngine()
-        service = MockSimulatorService(repo, template_engine)
+        service = make_simulator(repo)
 
         # Setup mock
         mock = MockEndpoint(
@@ -125,15 +336,552 @@ class TestMockSimulatorService:
         sim_result = result.value
         assert sim_result.status_code == 201
         assert sim_result.headers["X-Test"] == "1"
-        assert isinstance(sim_result.body, dict)
-        assert len(sim_result.body["id"]) == 36  # UUID length
+        assert sim_result.media_type == "application/json"
+        body = json.loads(sim_result.body)
+        assert len(body["id"]) == 36  # UUID length
+
+    async def test_execute_text_body(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(
+            MockEndpoint(
+                id="1", path="/text", method=HttpMethod.GET, response_body="plain"
+            )
+        )
+
+        result = await service.execute("GET", "/text")
+
+        assert isinstance(result, Success)
+        assert result.value.body == b"plain"
+        assert "content-type" not in result.value.headers
 
     async def test_execute_not_found(self):
         repo = InMemoryMockRepository()
-        template_engine = TemplateEngine()
-        service = MockSimulatorService(repo, template_engine)
+        service = make_simulator(repo)
 
         result = await service.execute("GET", "/not-found")
 
         assert isinstance(result, Failure)
         assert isinstance(result.error, MockNotFoundError)
+
+    async def test_execute_serves_hot_cache_without_repository(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(MockEndpoint(id="1", path="/test", method=HttpMethod.GET))
+
+        await service.execute("GET", "/test")
+        # Remove from storage behind the cache's back
+        repo.store.clear()
+        repo.lookup.clear()
+        result = await service.execute("GET", "/test")
+
+        assert isinstance(result, Success)
+
+    async def test_register_and_delete_invalidate_cache(self):
+        repo = InMemoryMockRepository()
+        router = make_router()
+        mgmt = make_management(repo, router)
+        sim = make_simulator(repo, router)
+
+        # Negative entry is recorded first
+        assert isinstance(await sim.execute("GET", "/test"), Failure)
+
+        created = await mgmt.register(MockCreate(path="/test", method=HttpMethod.GET))
+        assert isinstance(await sim.execute("GET", "/test"), Success)
+
+        await mgmt.delete(created.value.id)
+        assert isinstance(await sim.execute("GET", "/test"), Failure)
+
+    async def test_path_pattern_parameters_reach_the_template(self):
+        repo = InMemoryMockRepository()
+        router = make_router()
+        mgmt = make_management(repo, router)
+        sim = make_simulator(repo, router)
+        await mgmt.register(
+            MockCreate(
+                path="/users/{user_id}/orders/{order_id}",
+                method=HttpMethod.GET,
+                response_body={
+                    "user": "{{path.user_id}}",
+                    "order": "{{path.order_id}}",
+                },
+            )
+        )
+
+        result = await sim.execute("GET", "/users/7/orders/abc")
+
+        assert isinstance(result, Success)
+        assert json.loads(result.value.body) == {"user": "7", "order": "abc"}
+        assert isinstance(await sim.execute("GET", "/users/7/orders"), Failure)
+
+    async def test_request_body_is_read_only_when_referenced(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(
+            MockEndpoint(
+                id="echo",
+                path="/echo",
+                method=HttpMethod.POST,
+                response_body={"name": "{{body.name}}", "q": "{{query.q}}"},
+            )
+        )
+        await repo.save(
+            MockEndpoint(
+                id="plain",
+                path="/plain",
+                method=HttpMethod.POST,
+                response_body={"q": "{{query.q}}"},
+            )
+        )
+        reads = []
+
+        async def read_body() -> bytes:
+            reads.append(True)
+            return b'{"name": "ann"}'
+
+        def make_request() -> SimulationRequest:
+            return SimulationRequest(query={"q": "x"}, read_body=read_body)
+
+        plain = await service.execute("POST", "/plain", request=make_request())
+        assert json.loads(plain.value.body) == {"q": "x"}
+        assert reads == []
+
+        echo = await service.execute("POST", "/echo", request=make_request())
+        assert json.loads(echo.value.body) == {"name": "ann", "q": "x"}
+        assert reads == [True]
+
+    async def test_rules_select_the_response(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(
+            MockEndpoint.model_validate(
+                {
+                    "id": "orders",
+                    "path": "/orders/{id}",
+                    "method": "POST",
+                    "response_body": {"status": "ok"},
+                    "rules": [
+                        {
+                            "conditions": [
+                                {"source": "path", "name": "id", "value": "0"}
+                            ],
+                            "status_code": 404,
+                            "response_body": {"error": "missing {{path.id}}"},
+                        },
+                        {
+                            "conditions": [
+                                {"source": "body", "name": "qty", "value": "0"}
+                            ],
+                            "status_code": 400,
+                            "response_body": "bad quantity",
+                        },
+                    ],
+                }
+            )
+        )
+        reads = []
+
+        def make_request(body: bytes) -> SimulationRequest:
+            async def read_body() -> bytes:
+                reads.append(body)
+                return body
+
+            return SimulationRequest(read_body=read_body)
+
+        missing = await service.execute(
+            "POST", "/orders/0", request=make_request(b'{"qty": 0}')
+        )
+        assert missing.value.status_code == 404
+        assert json.loads(missing.value.body) == {"error": "missing 0"}
+
+        bad = await service.execute(
+            "POST", "/orders/1", request=make_request(b'{"qty": 0}')
+        )
+        assert bad.value.status_code == 400
+        assert bad.value.body == b"bad quantity"
+
+        ok = await service.execute(
+            "POST", "/orders/1", request=make_request(b'{"qty": 2}')
+        )
+        assert ok.value.status_code == 200
+        assert json.loads(ok.value.body) == {"status": "ok"}
+
+        # The body is read once per request, and only when a rule needs it
+        assert reads == [b'{"qty": 0}', b'{"qty": 0}', b'{"qty": 2}']
+
+    async def test_sequence_steps_through_responses(self):
+        repo = InMemoryMockRepository()
+        counters = InMemoryCounterStore()
+        service = make_simulator(repo, counters=counters)
+        await repo.save(
+            MockEndpoint.model_validate(
+                {
+                    "id": "flaky",
+                    "path": "/flaky",
+                    "method": "GET",
+                    "rules": [
+                        {
+                            "conditions": [
+                                {"source": "query", "name": "force", "value": "ok"}
+                            ],
+                            "response_body": "forced",
+                        }
+                    ],
+                    "sequence": {
+                        "steps": [
+                            {"status_code": 503, "response_body": "busy"},
+                            {"status_code": 503, "response_body": "busy"},
+                            {"status_code": 200, "response_body": "ok"},
+                        ]
+                    },
+                }
+            )
+        )
+
+        async def status() -> int:
+            result = await service.execute("GET", "/flaky")
+            return result.value.status_code
+
+        assert [await status() for _ in range(4)] == [503, 503, 200, 200]
+
+        # A matching rule takes precedence and does not advance the sequence
+        forced = await service.execute(
+            "GET", "/flaky", request=SimulationRequest(query={"force": "ok"})
+        )
+        assert forced.value.body == b"forced"
+
+        await make_management(repo, counters=counters).reset_sequences()
+        assert await status() == 503
+
+    async def test_sequences_share_a_scenario(self):
+        repo = InMemoryMockRepository()
+        counters = InMemoryCounterStore()
+        service = make_simulator(repo, counters=counters)
+        for mock_id, method in (("create", "POST"), ("poll", "GET")):
+            await repo.save(
+                MockEndpoint.model_validate(
+                    {
+                        "id": mock_id,
+                        "path": "/jobs",
+                        "method": method,
+                        "sequence": {
+                            "scenario": "job",
+                            "mode": "cycle",
+                            "steps": [
+                                {"response_body": "pending"},
+                                {"response_body": "done"},
+                            ],
+                        },
+                    }
+                )
+            )
+
+        bodies = [
+            (await service.execute(method, "/jobs")).value.body
+            for method in ("POST", "GET", "GET")
+        ]
+        assert bodies == [b"pending", b"done", b"pending"]
+
+        await make_management(repo, counters=counters).reset_sequences("job")
+        assert (await service.execute("GET", "/jobs")).value.body == b"pending"
+
+    async def test_streaming_mock_reuses_the_cached_body(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(
+            MockEndpoint.model_validate(
+                {
+                    "id": "download",
+                    "path": "/download",
+                    "method": "GET",
+                    "response_body": "x" * 10,
+                    "streaming": {"chunk_size": 4, "repeat": 3},
+                }
+            )
+        )
+
+        first = (await service.execute("GET", "/download")).value
+        second = (await service.execute("GET", "/download")).value
+
+        assert first.stream == second.stream
+        assert first.body is second.body
+        chunks = [chunk async for chunk in service.stream(first)]
+        assert b"".join(chunks) == b"x" * 30
+        assert all(chunk.obj is first.body for chunk in chunks)
+
+        etag = first.headers["etag"]
+        not_modified = await service.execute("GET", "/download", if_none_match=etag)
+        assert not_modified.value.status_code == 304
+        assert not_modified.value.stream is None
+
+    async def test_large_static_body_is_kept_in_the_blob_store(self, tmp_path):
+        repo = InMemoryMockRepository()
+        router = make_router()
+        blobs = LocalBlobStore(tmp_path)
+        mgmt = MockManagementService(
+            repo, router, InMemoryCounterStore(), blobs, inline_max_bytes=64
+        )
+        service = make_simulator(repo, router, blobs=blobs)
+        body = {"items": ["x" * 10] * 10}
+
+        large = (
+            await mgmt.register(
+                MockCreate(path="/large", method="GET", response_body=body)
+            )
+        ).value
+        templated = (
+            await mgmt.register(
+                MockCreate(
+                    path="/templated",
+                    method="GET",
+                    response_body={"id": "{{uuid}}", "pad": "x" * 100},
+                )
+            )
+        ).value
+
+        assert large.response_body == ""
+        assert large.body_ref.media_type == "application/json"
+        assert templated.body_ref is None
+
+        result = (await service.execute("GET", "/large")).value
+        assert json.loads(result.body_file.path.read_bytes()) == body
+        assert result.body_file.size == large.body_ref.size
+        assert result.media_type == "application/json"
+
+        etag = result.headers["etag"]
+        assert etag == f'"{large.body_ref.digest}"'
+        not_modified = await service.execute("GET", "/large", if_none_match=etag)
+        assert not_modified.value.status_code == 304
+        assert not_modified.value.body_file is None
+
+    async def test_bodies_stay_inline_without_a_blob_store(self, tmp_path):
+        blobs = LocalBlobStore(tmp_path)
+        mgmt = MockManagementService(
+            InMemoryMockRepository(),
+            make_router(),
+            InMemoryCounterStore(),
+            blobs,
+            inline_max_bytes=None,
+        )
+        body = {"items": ["x" * 10] * 10}
+
+        mock = (
+            await mgmt.register(
+                MockCreate(path="/large", method="GET", response_body=body)
+            )
+        ).value
+
+        assert mock.response_body == body
+        assert mock.body_ref is None
+        assert not any(tmp_path.iterdir())
+
+    async def test_streamed_blob_is_sliced_from_a_shared_map(self, tmp_path):
+        repo = InMemoryMockRepository()
+        blobs = LocalBlobStore(tmp_path)
+        service = make_simulator(repo, blobs=blobs)
+        digest = await blobs.put(b"0123456789")
+        await repo.save(
+            MockEndpoint.model_validate(
+                {
+                    "id": "blob",
+                    "path": "/blob",
+                    "method": "GET",
+                    "body_ref": {"digest": digest, "size": 10},
+                    "streaming": {"chunk_size": 4},
+                }
+            )
+        )
+
+        result = (await service.execute("GET", "/blob")).value
+        chunks = [chunk async for chunk in service.stream(result)]
+
+        assert [bytes(chunk) for chunk in chunks] == [b"0123", b"4567", b"89"]
+        shared = await blobs.mapped(digest)
+        assert all(chunk.obj is shared.obj for chunk in chunks)
+
+    async def test_least_recently_used_maps_are_closed(self, tmp_path):
+        blobs = LocalBlobStore(tmp_path, max_maps=1)
+        first = await blobs.put(b"first")
+        second = await blobs.put(b"second")
+
+        in_flight = await blobs.mapped(first)
+        await blobs.mapped(second)
+
+        # The evicted map stays readable until the last view is released
+        assert bytes(in_flight) == b"first"
+        assert not in_flight.obj.closed
+        in_flight.release()
+        idle = (await blobs.mapped(first)).obj
+        await blobs.mapped(second)
+        assert idle.closed
+        assert bytes(await blobs.mapped(first)) == b"first"
+
+    async def test_missing_blob_is_reported(self, tmp_path):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo, blobs=LocalBlobStore(tmp_path))
+        await repo.save(
+            MockEndpoint.model_validate(
+                {
+                    "id": "blob",
+                    "path": "/blob",
+                    "method": "GET",
+                    "body_ref": {"digest": "0" * 64, "size": 10},
+                }
+            )
+        )
+
+        result = await service.execute("GET", "/blob")
+
+        assert isinstance(result, Failure)
+        assert isinstance(result.error, MockNotFoundError)
+
+    async def test_binary_body_is_compressed_per_accept_encoding(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        body = bytes(range(16)) * 256
+        await repo.save(
+            MockEndpoint(id="1", path="/bin", method=HttpMethod.GET, binary_body=body)
+        )
+        await repo.save(
+            MockEndpoint.model_validate(
+                {
+                    "id": "2",
+                    "path": "/bin/stream",
+                    "method": "GET",
+                    "binary_body": body,
+                    "streaming": {"chunk_size": 1024},
+                }
+            )
+        )
+        gzip_request = SimulationRequest(headers={"accept-encoding": "gzip"})
+
+        plain = (await service.execute("GET", "/bin")).value
+        compressed = (await service.execute("GET", "/bin", request=gzip_request)).value
+        streamed = (
+            await service.execute("GET", "/bin/stream", request=gzip_request)
+        ).value
+
+        assert plain.body == body
+        assert plain.headers["content-type"] == "application/octet-stream"
+        assert plain.headers["vary"] == "accept-encoding"
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(compressed.body) == body
+        # Streamed bodies are paced byte for byte, so they stay uncompressed
+        assert streamed.body == body
+        assert "content-encoding" not in streamed.headers
+
+    async def test_static_body_is_compressed_off_the_event_loop(self, monkeypatch):
+        compress_variants = responses.compress_variants
+        threads = []
+
+        def record_thread(body):
+            threads.append(threading.get_ident())
+            return compress_variants(body)
+
+        monkeypatch.setattr(responses, "compress_variants", record_thread)
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        body = bytes(range(16)) * 256
+        await repo.save(
+            MockEndpoint(id="1", path="/bin", method=HttpMethod.GET, binary_body=body)
+        )
+        gzip_request = SimulationRequest(headers={"accept-encoding": "gzip"})
+
+        for _ in range(2):
+            result = (await service.execute("GET", "/bin", request=gzip_request)).value
+            assert gzip.decompress(result.body) == body
+
+        # Built once per cache fill, on a worker thread
+        assert len(threads) == 1
+        assert threads[0] != threading.get_ident()
+
+    async def test_large_body_variants_are_stored_at_registration(self, tmp_path):
+        repo = InMemoryMockRepository()
+        router = make_router()
+        blobs = LocalBlobStore(tmp_path)
+        mgmt = MockManagementService(
+            repo, router, InMemoryCounterStore(), blobs, inline_max_bytes=64
+        )
+        service = make_simulator(repo, router, blobs=blobs)
+        body = b"\x00\x01" * 1024
+
+        mock = (
+            await mgmt.register(MockCreate(path="/bin", method="GET", binary_body=body))
+        ).value
+
+        assert mock.binary_body is None
+        assert mock.body_ref.media_type == "application/octet-stream"
+        variant = mock.body_ref.encodings["gzip"]
+        result = (
+            await service.execute(
+                "GET",
+                "/bin",
+                request=SimulationRequest(headers={"accept-encoding": "gzip"}),
+            )
+        ).value
+        assert result.body_file.digest == variant.digest
+        assert result.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(result.body_file.path.read_bytes()) == body
+
+        etag = result.headers["etag"]
+        not_modified = await service.execute(
+            "GET",
+            "/bin",
+            if_none_match=etag,
+            request=SimulationRequest(headers={"accept-encoding": "gzip"}),
+        )
+        assert not_modified.value.status_code == 304
+        assert not_modified.value.headers["vary"] == "accept-encoding"
+
+    async def test_static_mock_is_served_pre_encoded(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(
+            MockEndpoint(
+                id="1",
+                path="/static",
+                method=HttpMethod.GET,
+                response_body={"message": "hello"},
+                headers={"X-Test": "1"},
+            )
+        )
+
+        first = (await service.execute("GET", "/static")).value
+        second = (await service.execute("GET", "/static")).value
+
+        assert first is second
+        assert first.body == b'{"message":"hello"}'
+        assert first.headers["content-type"] == "application/json"
+        assert first.headers["content-length"] == str(len(first.body))
+        assert first.headers["X-Test"] == "1"
+        assert first.headers["etag"].startswith('"')
+
+    async def test_static_mock_not_modified(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(MockEndpoint(id="1", path="/static", method=HttpMethod.GET))
+        etag = (await service.execute("GET", "/static")).value.headers["etag"]
+
+        result = await service.execute("GET", "/static", if_none_match=etag)
+
+        assert result.value.status_code == 304
+        assert result.value.body == b""
+        assert result.value.headers["etag"] == etag
+        assert "content-length" not in result.value.headers
+
+    async def test_dynamic_mock_has_no_etag(self):
+        repo = InMemoryMockRepository()
+        service = make_simulator(repo)
+        await repo.save(
+            MockEndpoint(
+                id="1",
+                path="/dynamic",
+                method=HttpMethod.GET,
+                response_body={"id": "{{uuid}}"},
+            )
+        )
+
+        result = await service.execute("GET", "/dynamic", if_none_match="*")
+
+        assert result.value.status_code == 200
+        assert "etag" not in result.value.headers
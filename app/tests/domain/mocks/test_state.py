@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from src.domain.mocks.schemas import MockSequence
+from src.domain.mocks.state import (
+    InMemoryCounterStore,
+    SharedCounterStore,
+    step_index,
+)
+
+
+class InMemoryCounterBackend:
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.calls: list[dict[str, int]] = []
+
+    async def add(self, deltas: dict[str, int]) -> dict[str, int]:
+        self.calls.append(dict(deltas))
+        for key, delta in deltas.items():
+            self.counts[key] = self.counts.get(key, 0) + delta
+        return {key: self.counts[key] for key in deltas}
+
+    async def reset(self, key: str | None = None) -> None:
+        if key is None:
+            self.counts.clear()
+        else:
+            self.counts.pop(key, None)
+
+
+def make_sequence(steps: int, mode: str) -> MockSequence:
+    return MockSequence.model_validate(
+        {"steps": [{"status_code": 200 + i} for i in range(steps)], "mode": mode}
+    )
+
+
+def test_step_index_repeats_last_step():
+    sequence = make_sequence(3, "repeat_last")
+
+    assert [step_index(sequence, count) for count in range(5)] == [0, 1, 2, 2, 2]
+
+
+def test_step_index_cycles():
+    sequence = make_sequence(2, "cycle")
+
+    assert [step_index(sequence, count) for count in range(5)] == [0, 1, 0, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_counter_store():
+    store = InMemoryCounterStore()
+
+    results = await asyncio.gather(*[store.advance("a") for _ in range(100)])
+    assert sorted(results) == list(range(100))
+    assert await store.advance("b") == 0
+
+    await store.reset("a")
+    assert await store.advance("a") == 0
+    assert await store.advance("b") == 1
+
+    await store.reset()
+    assert await store.advance("b") == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_store_writes_through_without_flush_interval():
+    backend = InMemoryCounterBackend()
+    first = SharedCounterStore(backend)
+    second = SharedCounterStore(backend)
+
+    assert [
+        await first.advance("a"),
+        await second.advance("a"),
+        await first.advance("a"),
+    ] == [0, 1, 2]
+    assert backend.calls == [{"a": 1}] * 3
+
+
+@pytest.mark.asyncio
+async def test_shared_store_batches_increments():
+    backend = InMemoryCounterBackend()
+    store = SharedCounterStore(backend, flush_seconds=60)
+
+    assert [await store.advance("a") for _ in range(3)] == [0, 1, 2]
+    assert await store.advance("b") == 0
+    # 初めてのキーの読み込みのみで、増分はまだ書き出していない
+    assert backend.calls == [{"a": 0}, {"b": 0}]
+
+    await store.flush()
+    assert backend.counts == {"a": 3, "b": 1}
+    assert backend.calls[-1] == {"a": 3, "b": 1}
+
+    # 他プロセスの増分は書き出し後の基準値に反映される
+    await backend.add({"a": 10})
+    await store.advance("a")
+    await store.flush()
+    assert await store.advance("a") == 14
+
+    await store.close()
+    assert backend.counts["a"] == 15
+
+
+@pytest.mark.asyncio
+async def test_shared_store_flushes_in_background():
+    backend = InMemoryCounterBackend()
+    store = SharedCounterStore(backend, flush_seconds=0.01)
+
+    await store.advance("a")
+    await store.advance("a")
+    await asyncio.sleep(0.05)
+
+    assert backend.counts == {"a": 2}
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_store_keeps_increments_when_flush_fails():
+    backend = InMemoryCounterBackend()
+    store = SharedCounterStore(backend, flush_seconds=60)
+    await store.advance("a")
+
+    async def failing_add(deltas):
+        raise ConnectionError("down")
+
+    add, backend.add = backend.add, failing_add
+    with pytest.raises(ConnectionError):
+        await store.flush()
+    assert await store.advance("a") == 1
+
+    backend.add = add
+    await store.close()
+    assert backend.counts == {"a": 2}
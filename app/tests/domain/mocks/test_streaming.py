@@ -0,0 +1,110 @@
+import pytest
+
+from src.domain.mocks.schemas import SimulationResult, SseEvent, StreamingProfile
+from src.domain.mocks.streaming import (
+    encode_sse_event,
+    iter_stream,
+    stream_headers,
+    stream_media_type,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def make_result(body: bytes, **profile) -> SimulationResult:
+    return SimulationResult(
+        status_code=200,
+        body=body,
+        headers={"content-length": str(len(body)), "content-type": "text/plain"},
+        stream=StreamingProfile.model_validate(profile),
+    )
+
+
+async def collect(result: SimulationResult, clock: FakeClock) -> list:
+    return [chunk async for chunk in iter_stream(result, clock.sleep, clock)]
+
+
+@pytest.mark.asyncio
+async def test_chunks_share_the_body_buffer():
+    body = b"0123456789"
+    result = make_result(body, chunk_size=4, repeat=2)
+
+    chunks = await collect(result, FakeClock())
+
+    assert [bytes(chunk) for chunk in chunks] == [b"0123", b"4567", b"89"] * 2
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert all(chunk.obj is result.body for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_limit_paces_chunks():
+    clock = FakeClock()
+    result = make_result(b"x" * 300, chunk_size=100, bytes_per_second=1000)
+
+    await collect(result, clock)
+
+    # 最初のチャンクは待たずに送り、以降は送信済みのバイト数に応じて待つ
+    assert clock.sleeps == [0.1, 0.1]
+    assert clock.now == pytest.approx(0.2)
+
+
+@pytest.mark.asyncio
+async def test_pacing_does_not_accumulate_drift():
+    clock = FakeClock()
+
+    async def late_sleep(seconds: float) -> None:
+        clock.sleeps.append(round(seconds, 6))
+        clock.now += seconds + 0.05
+
+    result = make_result(b"x" * 4, chunk_size=1, chunk_delay_ms=100)
+    [chunk async for chunk in iter_stream(result, late_sleep, clock)]
+
+    # 遅れた分は次の待機で取り戻す
+    assert clock.sleeps == [0.1, 0.05, 0.05]
+
+
+@pytest.mark.asyncio
+async def test_sse_events():
+    clock = FakeClock()
+    result = make_result(
+        b"ignored",
+        chunk_delay_ms=500,
+        events=[
+            {"data": "first", "event": "update", "id": "1"},
+            {"data": "line1\nline2", "retry_ms": 1000},
+        ],
+    )
+
+    chunks = await collect(result, clock)
+
+    assert chunks == [
+        b"event: update\nid: 1\ndata: first\n\n",
+        b"retry: 1000\ndata: line1\ndata: line2\n\n",
+    ]
+    assert clock.sleeps == [0.5]
+    assert stream_media_type(result) == "text/event-stream"
+    assert stream_headers(result) == {"cache-control": "no-cache"}
+
+
+def test_stream_headers_cover_repeated_body():
+    result = make_result(b"abc", repeat=4)
+
+    assert stream_headers(result) == {
+        "content-type": "text/plain",
+        "content-length": "12",
+    }
+
+
+def test_encode_empty_sse_event():
+    assert encode_sse_event(SseEvent(data="")) == b"data: \n\n"
@@ -1,5 +1,8 @@
-from src.domain.mocks.schemas import MockTemplateContext
+import json
+
+from src.domain.mocks.schemas import MockTemplateContext, SimulationRequest
 from src.domain.mocks.template_engine import TemplateEngine
+from src.shared.logging_utils import request_id_context
 
 
 class TestTemplateEngine:
@@ -67,3 +70,158 @@ class TestTemplateEngine:
         result = engine.render(template, context)
 
         assert result == "Hello World"
+
+    def test_unknown_tags_are_kept(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext(
+            request_id="req-1", timestamp="2024-01-01T00:00:00Z"
+        )
+
+        result = engine.render("{{unknown}} at {{now_iso}}", context)
+
+        assert result == "{{unknown}} at 2024-01-01T00:00:00Z"
+
+    def test_each_uuid_tag_is_unique(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext(
+            request_id="req-1", timestamp="2024-01-01T00:00:00Z"
+        )
+
+        first, second = engine.render("{{uuid}},{{uuid}}", context).split(",")
+
+        assert first != second
+
+    def test_path_parameters(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext(path_params={"id": "42"})
+
+        result = engine.render(
+            "user {{path.id}}{{path.missing}} {{unknown.id}}", context
+        )
+
+        assert result == "user 42 {{unknown.id}}"
+
+    def test_query_and_headers(self):
+        engine = TemplateEngine()
+        request = SimulationRequest(
+            query={"page": "2"}, headers={"x-api-key": "secret"}
+        )
+        context = MockTemplateContext(request=request)
+
+        result = engine.render(
+            "{{query.page}}/{{query.missing}}/{{header.X-Api-Key}}", context
+        )
+
+        assert result == "2//secret"
+
+    def test_body_fields(self):
+        engine = TemplateEngine()
+        body = {"user": {"name": "ann", "tags": ["a", "b"]}, "n": 3}
+        context = MockTemplateContext(body=body)
+
+        result = engine.render(
+            "{{body.user.name}} {{body.user.tags.1}} {{body.n}} {{body.user.x.y}}",
+            context,
+        )
+
+        assert result == "ann b 3 "
+        assert json.loads(engine.render("{{body}}", context)) == body
+
+    def test_needs_body(self):
+        engine = TemplateEngine()
+
+        assert engine.compile("{{body.id}}").needs_body
+        assert engine.compile_json("mock-1", {"echo": "{{body}}"}).needs_body
+        assert not engine.compile("{{query.id}} {{header.body}}").needs_body
+
+
+class TestMockTemplateContext:
+    def test_request_id_comes_from_context_var(self):
+        token = request_id_context.set("req-from-middleware")
+        try:
+            result = TemplateEngine().render("{{request_id}}", MockTemplateContext())
+        finally:
+            request_id_context.reset(token)
+
+        assert result == "req-from-middleware"
+
+    def test_timestamp_is_stable_within_a_context(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext()
+
+        first, second = engine.render("{{now_iso}}|{{now_iso}}", context).split("|")
+
+        assert first == second
+        assert "T" in first
+
+    def test_values_are_not_computed_until_used(self):
+        context = MockTemplateContext()
+
+        TemplateEngine().render("{{uuid}}", context)
+
+        assert context._timestamp is None
+
+
+class TestCompiledTemplate:
+    def test_static_template(self):
+        compiled = TemplateEngine().compile("Hello {{unknown}}")
+
+        assert compiled.is_static
+        assert compiled.segments == ("Hello ", "{{unknown}}")
+
+    def test_segments(self):
+        compiled = TemplateEngine().compile("{{uuid}} / {{random_int}}!")
+
+        assert not compiled.is_static
+        assert len(compiled.segments) == 4
+        assert compiled.segments[1] == " / "
+        assert compiled.segments[3] == "!"
+
+    def test_compiled_form_is_cached(self):
+        engine = TemplateEngine()
+
+        assert engine.compile("{{uuid}}") is engine.compile("{{uuid}}")
+
+
+class TestCompileJson:
+    def test_renders_valid_json(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext(
+            request_id="req-1", timestamp="2024-01-01T00:00:00Z"
+        )
+        body = {"{{uuid}}": "key", "nested": {"at": "{{now_iso}}"}, "n": [1, 2]}
+
+        rendered = json.loads(engine.compile_json("mock-1", body).render(context))
+
+        assert rendered["nested"] == {"at": "2024-01-01T00:00:00Z"}
+        assert rendered["n"] == [1, 2]
+        assert len(next(iter(rendered))) == 36
+
+    def test_values_are_json_escaped(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext(request_id="req-1", timestamp='"quoted"\\')
+
+        rendered = engine.compile_json("mock-1", {"at": "{{now_iso}}"}).render(context)
+
+        assert json.loads(rendered) == {"at": '"quoted"\\'}
+
+    def test_path_parameters_are_json_escaped(self):
+        engine = TemplateEngine()
+        context = MockTemplateContext(path_params={"name": 'a"b'})
+
+        rendered = engine.compile_json("mock-1", {"name": "{{path.name}}"})
+
+        assert json.loads(rendered.render(context)) == {"name": 'a"b'}
+
+    def test_static_body_is_pre_serialized(self):
+        compiled = TemplateEngine().compile_json("mock-1", {"message": "hello"})
+
+        assert compiled.is_static
+        assert compiled.source == '{"message":"hello"}'
+
+    def test_compiled_form_is_cached_by_mock_id(self):
+        engine = TemplateEngine()
+
+        first = engine.compile_json("mock-1", {"a": "{{uuid}}"})
+
+        assert engine.compile_json("mock-1", {"a": "{{uuid}}"}) is first
@@ -1,8 +1,12 @@
+import base64
+import json
+
 import boto3
 import pytest
 from fastapi.testclient import TestClient
 
 from src.config import get_settings
+from src.dependencies import get_blob_store
 from src.main import app
 
 
@@ -47,6 +51,26 @@ def setup_table(dynamodb_resource):
         AttributeDefinitions=[
             {"AttributeName": "method", "AttributeType": "S"},
             {"AttributeName": "path", "AttributeType": "S"},
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "pattern", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "IdIndex",
+                "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "PatternIndex",
+                "KeySchema": [
+                    {"AttributeName": "pattern", "KeyType": "HASH"},
+                    {"AttributeName": "path", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["id"],
+                },
+            },
         ],
         BillingMode="PAY_PER_REQUEST",
     )
@@ -112,3 +136,314 @@ def test_template_rendering(client):
     assert "id" in data
     assert len(data["id"]) == 36  # UUID length
     assert "timestamp" in data
+
+
+def test_static_mock_conditional_get(client):
+    mock_data = {
+        "path": "/test/static",
+        "method": "GET",
+        "status_code": 200,
+        "response_body": {"message": "cached"},
+    }
+    response = client.post("/api/mocks", json=mock_data)
+    assert response.status_code == 201
+
+    response = client.get("/test/static")
+    assert response.status_code == 200
+    assert response.json() == {"message": "cached"}
+    etag = response.headers["ETag"]
+
+    response = client.get("/test/static", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_latency_profile(client):
+    mock_data = {
+        "path": "/test/latency",
+        "method": "GET",
+        "latency_ms": 20,
+        "latency": {"distribution": "jitter", "jitter_ms": 10},
+    }
+    response = client.post("/api/mocks", json=mock_data)
+    assert response.status_code == 201
+    assert response.json()["latency"]["distribution"] == "jitter"
+
+    response = client.get("/test/latency")
+    assert response.status_code == 200
+
+    response = client.get("/api/mocks/metrics/latency")
+    assert response.status_code == 200
+    assert response.json()["completed"] >= 1
+
+
+def test_list_mocks_paginates(client):
+    for i in range(7):
+        response = client.post(
+            "/api/mocks", json={"path": f"/list/{i}", "method": "GET"}
+        )
+        assert response.status_code == 201
+
+    paths = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/mocks", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 3
+        paths.extend(item["path"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(paths) == [f"/list/{i}" for i in range(7)]
+
+    response = client.get("/api/mocks")
+    assert len(response.json()["items"]) == 7
+
+    response = client.get("/api/mocks", params={"cursor": "broken"})
+    assert response.status_code == 400
+
+
+def test_bulk_import_and_export(client):
+    client.post("/api/mocks", json={"path": "/bulk/3", "method": "GET"})
+    lines = [
+        json.dumps({"path": f"/bulk/{i}", "method": "GET", "response_body": {"i": i}})
+        for i in range(120)
+    ]
+    body = "\n".join([*lines, "{broken"]).encode()
+
+    def chunks():
+        for start in range(0, len(body), 1000):
+            yield body[start : start + 1000]
+
+    response = client.post("/api/mocks/bulk", content=chunks())
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 119
+    assert [(f["line"], f["reason"]) for f in report["failures"]] == [
+        (4, "conflict"),
+        (121, "invalid"),
+    ]
+
+    assert client.get("/bulk/42").json() == {"i": 42}
+
+    response = client.get("/api/mocks/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert len(exported) == 120
+
+
+def test_path_pattern_mock(client):
+    response = client.post(
+        "/api/mocks",
+        json={
+            "path": "/users/{id}",
+            "method": "GET",
+            "response_body": {"id": "{{path.id}}"},
+        },
+    )
+    assert response.status_code == 201
+
+    assert client.get("/users/1").json() == {"id": "1"}
+    assert client.get("/users/2").json() == {"id": "2"}
+    assert client.get("/users/2/extra").status_code == 404
+
+    response = client.post("/api/mocks", json={"path": "/a/**/b", "method": "GET"})
+    assert response.status_code == 422
+
+
+def test_echo_mock(client):
+    client.post(
+        "/api/mocks",
+        json={
+            "path": "/echo/{kind}",
+            "method": "POST",
+            "response_body": {
+                "kind": "{{path.kind}}",
+                "page": "{{query.page}}",
+                "agent": "{{header.x-agent}}",
+                "name": "{{body.user.name}}",
+            },
+        },
+    )
+
+    response = client.post(
+        "/echo/users?page=3",
+        headers={"X-Agent": "tests"},
+        json={"user": {"name": "ann"}},
+    )
+
+    assert response.json() == {
+        "kind": "users",
+        "page": "3",
+        "agent": "tests",
+        "name": "ann",
+    }
+
+
+def test_conditional_rules(client):
+    response = client.post(
+        "/api/mocks",
+        json={
+            "path": "/login",
+            "method": "POST",
+            "response_body": {"token": "abc"},
+            "rules": [
+                {
+                    "conditions": [
+                        {"source": "body", "name": "password", "value": "wrong"}
+                    ],
+                    "status_code": 401,
+                    "response_body": {"error": "unauthorized"},
+                }
+            ],
+        },
+    )
+    assert response.status_code == 201
+
+    denied = client.post("/login", json={"password": "wrong"})
+    assert denied.status_code == 401
+    assert denied.json() == {"error": "unauthorized"}
+
+    accepted = client.post("/login", json={"password": "secret"})
+    assert accepted.status_code == 200
+    assert accepted.json() == {"token": "abc"}
+
+    response = client.post(
+        "/api/mocks",
+        json={
+            "path": "/bad-rule",
+            "method": "GET",
+            "rules": [{"conditions": [{"source": "query", "name": "q"}]}],
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_sequence_mock(client):
+    response = client.post(
+        "/api/mocks",
+        json={
+            "path": "/flaky",
+            "method": "GET",
+            "sequence": {
+                "steps": [
+                    {"status_code": 503, "response_body": {"error": "busy"}},
+                    {"status_code": 200, "response_body": {"ok": True}},
+                ]
+            },
+        },
+    )
+    assert response.status_code == 201
+
+    assert [client.get("/flaky").status_code for _ in range(3)] == [503, 200, 200]
+
+    assert client.post("/api/mocks/sequences/reset").status_code == 204
+    assert client.get("/flaky").json() == {"error": "busy"}
+
+
+def test_streaming_mocks(client):
+    client.post(
+        "/api/mocks",
+        json={
+            "path": "/large",
+            "method": "GET",
+            "response_body": "0123456789",
+            "streaming": {"chunk_size": 3, "repeat": 100},
+        },
+    )
+    client.post(
+        "/api/mocks",
+        json={
+            "path": "/events",
+            "method": "GET",
+            "streaming": {
+                "chunk_delay_ms": 1,
+                "events": [{"data": "a", "event": "tick"}, {"data": "b"}],
+            },
+        },
+    )
+
+    large = client.get("/large")
+    assert large.status_code == 200
+    assert large.headers["content-length"] == "1000"
+    assert large.content == b"0123456789" * 100
+
+    events = client.get("/events")
+    assert events.headers["content-type"].startswith("text/event-stream")
+    assert events.text == "event: tick\ndata: a\n\ndata: b\n\n"
+
+
+def test_large_body_is_served_from_blob_store(client, monkeypatch, tmp_path):
+    monkeypatch.setenv("BLOB_STORE", "local")
+    monkeypatch.setenv("BLOB_INLINE_MAX_BYTES", "100")
+    monkeypatch.setenv("BLOB_LOCAL_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    get_blob_store.cache_clear()
+    body = {"items": [{"id": i, "name": f"item-{i}"} for i in range(50)]}
+
+    try:
+        response = client.post(
+            "/api/mocks",
+            json={"path": "/catalog", "method": "GET", "response_body": body},
+        )
+        assert response.status_code == 201
+        created = response.json()
+        assert created["response_body"] == ""
+        digest = created["body_ref"]["digest"]
+
+        served = client.get("/catalog", headers={"Accept-Encoding": "identity"})
+        assert served.status_code == 200
+        assert served.headers["content-type"] == "application/json"
+        assert served.headers["etag"] == f'"{digest}"'
+        assert "content-encoding" not in served.headers
+        assert served.json() == body
+
+        cached = client.get(
+            "/catalog",
+            headers={"If-None-Match": f'"{digest}"', "Accept-Encoding": "identity"},
+        )
+        assert cached.status_code == 304
+
+        # The gzip variant was stored at registration and is sent as is
+        gzip_ref = created["body_ref"]["encodings"]["gzip"]
+        compressed = client.get("/catalog", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["content-length"] == str(gzip_ref["size"])
+        assert compressed.headers["vary"] == "accept-encoding"
+        assert compressed.json() == body
+    finally:
+        get_blob_store.cache_clear()
+
+
+def test_binary_body_round_trips_as_base64(client):
+    payload = bytes(range(256)) * 8
+    response = client.post(
+        "/api/mocks",
+        json={
+            "path": "/image",
+            "method": "GET",
+            "binary_body": base64.b64encode(payload).decode(),
+            "headers": {"Content-Type": "image/x-test"},
+        },
+    )
+    assert response.status_code == 201
+    assert base64.b64decode(response.json()["binary_body"]) == payload
+
+    raw = client.get("/image", headers={"Accept-Encoding": "identity"})
+    assert raw.headers["content-type"] == "image/x-test"
+    assert raw.content == payload
+
+    # httpx decodes the precompressed body transparently
+    compressed = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == payload
+
+    invalid = client.post(
+        "/api/mocks",
+        json={"path": "/broken", "method": "GET", "binary_body": "not base64!"},
+    )
+    assert invalid.status_code == 422
@@ -1,3 +1,4 @@
+import json
 import os
 
 import pytest
@@ -5,6 +6,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from src.config import Settings, get_settings
+from src.infrastructure.persistence.postgres.database import get_engine
 from src.infrastructure.persistence.postgres.models import Base
 from src.main import app
 
@@ -106,3 +108,68 @@ def test_e2e_mock_lifecycle_postgres(client):
     # 4. Verify Deletion (Simulation should fail)
     response = client.get("/test/postgres-api")
     assert response.status_code == 404
+
+
+def test_connection_pool_is_warmed_up_on_startup(client):
+    settings = get_settings()
+    expected = min(
+        settings.postgres_pool_warmup_connections, settings.postgres_pool_size
+    )
+    assert get_engine().pool.checkedin() >= expected
+
+
+def test_list_mocks_paginates_postgres(client):
+    for i in range(7):
+        response = client.post(
+            "/api/mocks", json={"path": f"/pg-list/{i}", "method": "PUT"}
+        )
+        assert response.status_code == 201
+
+    paths = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/mocks", params=params).json()
+        paths.extend(item["path"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(paths) == len(set(paths))
+    assert [path for path in paths if path.startswith("/pg-list/")] == [
+        f"/pg-list/{i}" for i in range(7)
+    ]
+
+
+def test_bulk_import_postgres(client):
+    lines = [
+        json.dumps({"path": f"/pg-bulk/{i}", "method": "POST", "status_code": 201})
+        for i in range(50)
+    ]
+    body = "\n".join([*lines, lines[7]]).encode()
+
+    report = client.post("/api/mocks/bulk", content=body).json()
+
+    assert report["created"] == 50
+    assert report["failures"][0]["line"] == 51
+    assert report["failures"][0]["reason"] == "conflict"
+    assert client.post("/pg-bulk/49").status_code == 201
+
+    exported = client.get("/api/mocks/export").text.splitlines()
+    paths = {json.loads(line)["path"] for line in exported}
+    assert {f"/pg-bulk/{i}" for i in range(50)} <= paths
+
+
+def test_startup_continues_when_pool_warm_up_fails(monkeypatch, caplog):
+    async def unreachable(connections):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr("src.main.warm_up_pool", unreachable)
+    monkeypatch.setenv("DB_TYPE", "postgres")
+    get_settings.cache_clear()
+
+    with TestClient(app) as c:
+        assert c.get("/").status_code == 200
+
+    assert "warm-up failed: connection refused" in caplog.text
+    get_settings.cache_clear()
@@ -0,0 +1,242 @@
+import asyncio
+import uuid
+
+import boto3
+import pytest
+
+from src.config import get_settings
+from src.domain.mocks.records import MockRecord
+from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+from src.infrastructure.dynamodb.async_client import (
+    close_async_dynamodb_client,
+    get_async_dynamodb_client,
+)
+from src.infrastructure.dynamodb.async_mock_repository import (
+    AsyncDynamoMockRepository,
+)
+from src.infrastructure.dynamodb.mock_repository import DynamoMockRepository
+
+
+@pytest.fixture(scope="module")
+def setup_table():
+    settings = get_settings()
+    dynamodb_resource = boto3.resource(
+        "dynamodb",
+        endpoint_url=settings.dynamodb_endpoint_url,
+        region_name=settings.aws_default_region,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+    )
+    table_name = "MockTable"
+    try:
+        table = dynamodb_resource.Table(table_name)
+        table.load()
+        table.delete()
+        table.wait_until_not_exists(WaiterConfig={"Delay": 1, "MaxAttempts": 5})
+    except dynamodb_resource.meta.client.exceptions.ResourceNotFoundException:
+        pass
+
+    table = dynamodb_resource.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "method", "KeyType": "HASH"},
+            {"AttributeName": "path", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "method", "AttributeType": "S"},
+            {"AttributeName": "path", "AttributeType": "S"},
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "pattern", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "IdIndex",
+                "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "PatternIndex",
+                "KeySchema": [
+                    {"AttributeName": "pattern", "KeyType": "HASH"},
+                    {"AttributeName": "path", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["id"],
+                },
+            },
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists(WaiterConfig={"Delay": 1, "MaxAttempts": 10})
+    yield table
+
+    table.delete()
+    table.wait_until_not_exists(WaiterConfig={"Delay": 1, "MaxAttempts": 5})
+
+
+@pytest.fixture
+async def repo(setup_table):
+    yield AsyncDynamoMockRepository(get_async_dynamodb_client(), "MockTable")
+    # The connection pool is bound to this test's event loop
+    await close_async_dynamodb_client()
+
+
+@pytest.mark.asyncio
+async def test_async_repository_crud(repo):
+    mock_id = str(uuid.uuid4())
+    mock = MockEndpoint(
+        id=mock_id,
+        path="/async",
+        method=HttpMethod.POST,
+        status_code=201,
+        response_body={"message": "hello", "nested": {"items": ["a", "b"]}},
+        headers={"Content-Type": "application/json"},
+        latency_ms=100,
+    )
+
+    await repo.save(mock)
+
+    found = await repo.find(HttpMethod.POST, "/async")
+    assert found == MockRecord.from_model(mock)
+
+    found_by_id = await repo.find_by_id(mock_id)
+    assert found_by_id is not None
+    assert found_by_id.path == "/async"
+
+    assert len(await repo.find_all()) >= 1
+
+    assert await repo.delete(mock_id) is True
+    assert await repo.find(HttpMethod.POST, "/async") is None
+    assert await repo.delete(mock_id) is False
+
+
+@pytest.mark.asyncio
+async def test_async_repository_concurrent_lookups(repo):
+    await repo.save(MockEndpoint(id="c-1", path="/concurrent", method=HttpMethod.GET))
+
+    results = await asyncio.gather(
+        *[repo.find(HttpMethod.GET, "/concurrent") for _ in range(100)]
+    )
+
+    assert all(result is not None and result.id == "c-1" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_async_repository_iter_all_pages(repo):
+    for i in range(5):
+        await repo.save(
+            MockEndpoint(id=f"ap-{i}", path=f"/async-page/{i}", method=HttpMethod.PUT)
+        )
+
+    ids = [mock.id async for mock in repo.iter_all(page_size=2)]
+
+    assert len(ids) == len(set(ids))
+    assert {f"ap-{i}" for i in range(5)} <= set(ids)
+
+
+@pytest.mark.asyncio
+async def test_async_repository_iter_locations_reads_only_patterns(repo):
+    for i, path in enumerate(["/aloc/{id}", "/aloc/plain", "/aloc/**"]):
+        await repo.save(MockEndpoint(id=f"aloc-{i}", path=path, method=HttpMethod.GET))
+
+    locations = [loc async for loc in repo.iter_locations(page_size=1)]
+
+    assert {loc.id for loc in locations if loc.id.startswith("aloc-")} == {
+        "aloc-0",
+        "aloc-2",
+    }
+    assert all(loc.method is HttpMethod.GET for loc in locations)
+
+
+@pytest.mark.asyncio
+async def test_async_repository_create_many(repo):
+    await repo.save(MockEndpoint(id="cm-x", path="/cm/0", method=HttpMethod.DELETE))
+    mocks = [
+        MockEndpoint(id=f"cm-{i}", path=f"/cm/{i}", method=HttpMethod.DELETE)
+        for i in range(60)
+    ]
+
+    result = await repo.create_many(mocks)
+
+    assert [mock.id for mock in result.created] == [f"cm-{i}" for i in range(1, 60)]
+    assert result.rejected == {}
+    assert (await repo.find(HttpMethod.DELETE, "/cm/0")).id == "cm-x"
+    assert (await repo.find(HttpMethod.DELETE, "/cm/59")).id == "cm-59"
+
+
+@pytest.mark.asyncio
+async def test_async_repository_create_many_skips_late_conflicts(repo, monkeypatch):
+    await repo.save(MockEndpoint(id="late-x", path="/late/1", method=HttpMethod.PUT))
+
+    async def nothing_registered(keys):
+        return set()
+
+    # Another request registers /late/1 between the check and the write
+    monkeypatch.setattr(repo, "_existing_keys", nothing_registered)
+    mocks = [
+        MockEndpoint(id=f"late-{i}", path=f"/late/{i}", method=HttpMethod.PUT)
+        for i in range(3)
+    ]
+
+    result = await repo.create_many(mocks)
+
+    assert [mock.id for mock in result.created] == ["late-0", "late-2"]
+    assert (await repo.find(HttpMethod.PUT, "/late/1")).id == "late-x"
+    assert (await repo.find(HttpMethod.PUT, "/late/2")).id == "late-2"
+
+
+@pytest.mark.asyncio
+async def test_async_repository_create_many_rejects_oversized_items(repo):
+    mocks = [
+        MockEndpoint(
+            id=f"asize-{i}",
+            path=f"/async-size/{i}",
+            method=HttpMethod.PUT,
+            response_body="x" * (500_000 if i in (1, 4) else 10),
+        )
+        for i in range(6)
+    ]
+
+    result = await repo.create_many(mocks)
+
+    assert [mock.id for mock in result.created] == [
+        "asize-0",
+        "asize-2",
+        "asize-3",
+        "asize-5",
+    ]
+    assert sorted(result.rejected) == ["asize-1", "asize-4"]
+    assert await repo.find(HttpMethod.PUT, "/async-size/4") is None
+
+
+@pytest.mark.asyncio
+async def test_async_repository_create_does_not_overwrite(repo):
+    mocks = [
+        MockEndpoint(id=f"ac-{i}", path="/async-create", method=HttpMethod.PATCH)
+        for i in range(5)
+    ]
+
+    results = await asyncio.gather(*[repo.create(mock) for mock in mocks])
+
+    assert sorted(results) == [False, False, False, False, True]
+    stored = await repo.find(HttpMethod.PATCH, "/async-create")
+    assert stored.id == f"ac-{results.index(True)}"
+
+
+@pytest.mark.asyncio
+async def test_binary_body_is_stored_as_bytes(repo):
+    mock = MockEndpoint(
+        id=str(uuid.uuid4()),
+        path="/binary",
+        method=HttpMethod.GET,
+        binary_body=b"\x89PNG\r\n\x00\xff",
+    )
+
+    await repo.save(mock)
+    record = MockRecord.from_model(mock)
+
+    # The sync repository reads the same item through boto3's Binary type
+    assert await repo.find(HttpMethod.GET, "/binary") == record
+    sync_repo = DynamoMockRepository(table_name="MockTable")
+    assert await sync_repo.find(HttpMethod.GET, "/binary") == record
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 
 import boto3
@@ -5,7 +6,11 @@ import pytest
 
 from src.config import get_settings
 from src.domain.mocks.schemas import HttpMethod, MockEndpoint
-from src.infrastructure.dynamodb.mock_repository import DynamoMockRepository
+from src.infrastructure.dynamodb.counter_store import DynamoCounterBackend
+from src.infrastructure.dynamodb.mock_repository import (
+    DynamoMockRepository,
+    chunked_by_size,
+)
 
 
 @pytest.fixture(scope="module")
@@ -49,6 +54,26 @@ def setup_table(dynamodb_resource):
         AttributeDefinitions=[
             {"AttributeName": "method", "AttributeType": "S"},
             {"AttributeName": "path", "AttributeType": "S"},
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "pattern", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "IdIndex",
+                "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "PatternIndex",
+                "KeySchema": [
+                    {"AttributeName": "pattern", "KeyType": "HASH"},
+                    {"AttributeName": "path", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["id"],
+                },
+            },
         ],
         BillingMode="PAY_PER_REQUEST",
     )
@@ -103,3 +128,165 @@ async def test_repository_crud(setup_table):
 
     found_by_id_after = await repo.find_by_id(mock_id)
     assert found_by_id_after is None
+
+
+def test_repositories_share_one_table_resource(setup_table):
+    first = DynamoMockRepository(table_name="MockTable")
+    second = DynamoMockRepository(table_name="MockTable")
+
+    assert first._table is second._table
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_uses_id_index(setup_table):
+    repo = DynamoMockRepository(table_name="MockTable")
+    for i in range(30):
+        await repo.save(
+            MockEndpoint(id=f"bulk-{i}", path=f"/bulk/{i}", method=HttpMethod.GET)
+        )
+
+    calls: list[str] = []
+    original_query = repo._table.query
+
+    def spy_query(**kwargs):
+        calls.append(kwargs["IndexName"])
+        return original_query(**kwargs)
+
+    repo._table.query = spy_query
+    try:
+        found = await repo.find_by_id("bulk-17")
+        assert found is not None
+        assert found.path == "/bulk/17"
+        assert await repo.delete("bulk-17") is True
+    finally:
+        del repo._table.query
+
+    assert calls == ["IdIndex", "IdIndex"]
+    assert await repo.find(HttpMethod.GET, "/bulk/17") is None
+
+
+@pytest.mark.asyncio
+async def test_iter_all_follows_last_evaluated_key(setup_table):
+    repo = DynamoMockRepository(table_name="MockTable")
+    for i in range(10):
+        await repo.save(
+            MockEndpoint(id=f"page-{i}", path=f"/page/{i}", method=HttpMethod.PUT)
+        )
+
+    everything = [mock async for mock in repo.iter_all(page_size=3)]
+    ids = [mock.id for mock in everything]
+    assert len(ids) == len(set(ids))
+    assert {f"page-{i}" for i in range(10)} <= set(ids)
+    assert len(await repo.find_all()) == len(everything)
+
+    # Resume from the middle of a scan page
+    after = everything[4]
+    rest = [mock.id async for mock in repo.iter_all((after.method, after.path), 3)]
+    assert rest == ids[5:]
+
+
+@pytest.mark.asyncio
+async def test_iter_locations_reads_only_patterns(setup_table):
+    repo = DynamoMockRepository(table_name="MockTable")
+    for i, path in enumerate(["/loc/{id}", "/loc/*/x", "/loc/plain", "/loc/**"]):
+        await repo.save(MockEndpoint(id=f"loc-{i}", path=path, method=HttpMethod.GET))
+
+    locations = [loc async for loc in repo.iter_locations(page_size=2)]
+
+    assert {loc.id for loc in locations if loc.id.startswith("loc-")} == {
+        "loc-0",
+        "loc-1",
+        "loc-3",
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_does_not_overwrite(setup_table):
+    repo = DynamoMockRepository(table_name="MockTable")
+    first = MockEndpoint(id="first", path="/create", method=HttpMethod.POST)
+    second = MockEndpoint(id="second", path="/create", method=HttpMethod.POST)
+
+    assert await repo.create(first) is True
+    assert await repo.create(second) is False
+    assert (await repo.find(HttpMethod.POST, "/create")).id == "first"
+
+
+@pytest.mark.asyncio
+async def test_create_many_skips_keys_registered_after_the_check(
+    setup_table, monkeypatch
+):
+    repo = DynamoMockRepository(table_name="MockTable")
+    await repo.save(MockEndpoint(id="taken", path="/many/1", method=HttpMethod.PUT))
+    # Another request registers /many/1 between the check and the write
+    monkeypatch.setattr(repo, "_existing_keys", lambda keys: set())
+    mocks = [
+        MockEndpoint(id=f"many-{i}", path=f"/many/{i}", method=HttpMethod.PUT)
+        for i in range(3)
+    ]
+
+    result = await repo.create_many(mocks)
+
+    assert [mock.id for mock in result.created] == ["many-0", "many-2"]
+    assert (await repo.find(HttpMethod.PUT, "/many/1")).id == "taken"
+    assert (await repo.find(HttpMethod.PUT, "/many/2")).id == "many-2"
+
+
+@pytest.mark.asyncio
+async def test_create_many_rejects_oversized_items_per_row(setup_table):
+    repo = DynamoMockRepository(table_name="MockTable")
+    mocks = [
+        MockEndpoint(id="size-0", path="/size/0", method=HttpMethod.PUT),
+        # Over the 400 KB item limit: the whole transaction fails validation
+        MockEndpoint(
+            id="size-1",
+            path="/size/1",
+            method=HttpMethod.PUT,
+            response_body="x" * 500_000,
+        ),
+        MockEndpoint(id="size-2", path="/size/2", method=HttpMethod.PUT),
+    ]
+
+    result = await repo.create_many(mocks)
+
+    assert [mock.id for mock in result.created] == ["size-0", "size-2"]
+    assert list(result.rejected) == ["size-1"]
+    assert result.rejected["size-1"].startswith("ValidationException")
+    assert await repo.find(HttpMethod.PUT, "/size/1") is None
+
+
+def test_chunked_by_size():
+    sizes = [3, 3, 5, 1, 9, 1]
+
+    chunks = chunked_by_size(list(range(6)), sizes.__getitem__, 3, 8)
+
+    assert chunks == [[0, 1], [2, 3], [4], [5]]
+
+
+@pytest.fixture
+def state_table(dynamodb_resource):
+    table = dynamodb_resource.create_table(
+        TableName="MockStateTable",
+        KeySchema=[{"AttributeName": "key", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "key", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists(WaiterConfig={"Delay": 1, "MaxAttempts": 10})
+    yield table
+    table.delete()
+    table.wait_until_not_exists(WaiterConfig={"Delay": 1, "MaxAttempts": 5})
+
+
+@pytest.mark.asyncio
+async def test_counter_backend_adds_atomically(state_table):
+    backend = DynamoCounterBackend(table_name="MockStateTable")
+
+    assert await backend.add({"a": 0}) == {"a": 0}
+    results = await asyncio.gather(*[backend.add({"a": 1}) for _ in range(10)])
+    assert sorted(result["a"] for result in results) == list(range(1, 11))
+    assert await backend.add({"a": 5, "b": 2}) == {"a": 15, "b": 2}
+
+    await backend.reset("a")
+    assert await backend.add({"a": 0, "b": 0}) == {"a": 0, "b": 2}
+
+    await backend.reset()
+    assert state_table.scan()["Items"] == []
@@ -1,12 +1,21 @@
+import asyncio
+import dataclasses
 import uuid
 
 import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from src.config import get_settings
+from src.domain.mocks.records import MockLocation, MockRecord
 from src.domain.mocks.schemas import HttpMethod, MockEndpoint
+from src.infrastructure.persistence.converters.orm_to_domain import to_orm
+from src.infrastructure.persistence.postgres import database
 from src.infrastructure.persistence.postgres.models import Base
+from src.infrastructure.persistence.postgres.repositories.counter_backend import (
+    PostgresCounterBackend,
+)
 from src.infrastructure.persistence.postgres.repositories.mock_repository import (
+    PostgresMockReader,
     PostgresMockRepository,
 )
 
@@ -98,3 +107,152 @@ async def test_postgres_repository_crud(session):
 
     found_by_id_after = await repo.find_by_id(mock_id)
     assert found_by_id_after is None
+
+
+@pytest.mark.asyncio
+async def test_postgres_repository_reads_skip_the_identity_map(session):
+    repo = PostgresMockRepository(session)
+    mock = MockEndpoint(id=str(uuid.uuid4()), path="/core", method=HttpMethod.GET)
+    assert await repo.create(mock)
+
+    assert await repo.find(HttpMethod.GET, "/core") == MockRecord.from_model(mock)
+    assert await repo.find_by_id(mock.id) is not None
+    assert [m async for m in repo.iter_all()]
+
+    assert len(session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test_postgres_repository_reads_keep_the_callers_transaction(session):
+    repo = PostgresMockRepository(session)
+    mock = MockEndpoint(id=str(uuid.uuid4()), path="/pending", method=HttpMethod.GET)
+    await session.merge(to_orm(mock))
+    await session.flush()
+
+    assert await repo.find(HttpMethod.GET, "/pending") is not None
+    assert [m.id async for m in repo.iter_all()] == [mock.id]
+    # The uncommitted row is still there for the caller to commit or roll back
+    assert session.in_transaction()
+    assert await repo.find_by_id(mock.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_postgres_reader_borrows_a_connection_per_query(session, async_engine):
+    repo = PostgresMockRepository(session)
+    mock = MockEndpoint(
+        id=str(uuid.uuid4()), path="/reader/{id}", method=HttpMethod.GET
+    )
+    assert await repo.create(mock)
+    plain = MockEndpoint(id=str(uuid.uuid4()), path="/reader/me", method=HttpMethod.GET)
+    assert await repo.create(plain)
+    reader = PostgresMockReader(async_engine)
+
+    stored = await reader.find(HttpMethod.GET, "/reader/{id}")
+    assert stored == MockRecord.from_model(mock)
+    assert await reader.find(HttpMethod.GET, "/missing") is None
+    assert async_engine.pool.checkedout() == 0
+
+    # Only paths that may be patterns are loaded for the router's index
+    locations = [location async for location in reader.iter_locations()]
+    assert locations == [MockLocation(mock.id, HttpMethod.GET, "/reader/{id}")]
+    assert async_engine.pool.checkedout() == 0
+
+
+@pytest.mark.asyncio
+async def test_postgres_repository_create_is_insert_if_absent(async_engine):
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def create(mock_id: str) -> bool:
+        async with async_session() as session:
+            repo = PostgresMockRepository(session)
+            return await repo.create(
+                MockEndpoint(id=mock_id, path="/race", method=HttpMethod.POST)
+            )
+
+    results = await asyncio.gather(*[create(f"race-{i}") for i in range(5)])
+
+    assert sorted(results) == [False, False, False, False, True]
+    async with async_session() as session:
+        stored = await PostgresMockRepository(session).find(HttpMethod.POST, "/race")
+    assert stored is not None
+    assert stored.id == f"race-{results.index(True)}"
+
+
+@pytest.mark.asyncio
+async def test_postgres_repository_round_trips_nested_fields(session):
+    repo = PostgresMockRepository(session)
+    mock = MockEndpoint.model_validate(
+        {
+            "id": str(uuid.uuid4()),
+            "path": "/rules",
+            "method": "GET",
+            "rules": [
+                {
+                    "conditions": [{"source": "query", "name": "q", "value": "x"}],
+                    "status_code": 418,
+                }
+            ],
+            "sequence": {"steps": [{"status_code": 503}, {}]},
+            "streaming": {"chunk_size": 1024},
+            "binary_body": b"\x00\xff",
+            "body_ref": {
+                "digest": "a" * 64,
+                "size": 1,
+                "encodings": {"gzip": {"digest": "b" * 64, "size": 1}},
+            },
+        }
+    )
+
+    assert await repo.create(mock)
+    await repo.create_many(
+        [mock.model_copy(update={"id": str(uuid.uuid4()), "path": "/rules/bulk"})]
+    )
+
+    record = MockRecord.from_model(mock)
+    assert await repo.find(HttpMethod.GET, "/rules") == record
+    bulk = await repo.find(HttpMethod.GET, "/rules/bulk")
+    assert bulk is not None
+    assert dataclasses.replace(bulk, id=mock.id, path=mock.path) == record
+    assert bulk.to_model().rules == mock.rules
+
+
+@pytest.mark.asyncio
+async def test_postgres_counter_backend_adds_atomically(async_engine):
+    backend = PostgresCounterBackend(
+        async_sessionmaker(async_engine, expire_on_commit=False)
+    )
+
+    assert await backend.add({"a": 0}) == {"a": 0}
+    results = await asyncio.gather(*[backend.add({"a": 1}) for _ in range(10)])
+    assert sorted(result["a"] for result in results) == list(range(1, 11))
+    assert await backend.add({"a": 5, "b": 2}) == {"a": 15, "b": 2}
+
+    await backend.reset("a")
+    assert await backend.add({"a": 0, "b": 0}) == {"a": 0, "b": 2}
+
+    await backend.reset()
+    assert await backend.add({"b": 0}) == {"b": 0}
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_returns_connections_when_one_fails(
+    async_engine, monkeypatch
+):
+    connects = 0
+
+    class FlakyEngine:
+        def connect(self):
+            nonlocal connects
+            connects += 1
+            if connects == 3:
+                raise OSError("connection refused")
+            return async_engine.connect()
+
+    monkeypatch.setattr(database, "get_engine", FlakyEngine)
+
+    with pytest.raises(OSError):
+        await database.warm_up_pool(5)
+
+    assert connects == 5
+    assert async_engine.pool.checkedout() == 0
+    assert async_engine.pool.checkedin() == 4
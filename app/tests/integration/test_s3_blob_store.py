@@ -0,0 +1,47 @@
+import boto3
+import pytest
+
+from src.config import get_settings
+from src.infrastructure.blobs.local_store import LocalBlobStore
+from src.infrastructure.blobs.s3_store import S3BlobStore
+
+BUCKET = "mock-response-bodies-test"
+
+
+@pytest.fixture
+def s3_client():
+    settings = get_settings()
+    client = boto3.client(
+        "s3",
+        # ローカルのS3互換サーバー (DynamoDB と同じエンドポイントで動かしている)
+        endpoint_url=settings.blob_s3_endpoint_url or settings.dynamodb_endpoint_url,
+        region_name=settings.aws_default_region,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+    )
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+    for item in client.list_objects_v2(Bucket=BUCKET).get("Contents", []):
+        client.delete_object(Bucket=BUCKET, Key=item["Key"])
+    client.delete_bucket(Bucket=BUCKET)
+
+
+@pytest.mark.asyncio
+async def test_s3_blob_store_round_trip(s3_client, tmp_path):
+    writer = S3BlobStore(s3_client, BUCKET, LocalBlobStore(tmp_path / "writer"))
+    digest = await writer.put(b"large body")
+
+    assert await writer.put(b"large body") == digest
+    assert [
+        item["Key"] for item in s3_client.list_objects_v2(Bucket=BUCKET)["Contents"]
+    ] == [digest]
+
+    # 別のインスタンスは初回にローカルへ取得する
+    reader = S3BlobStore(s3_client, BUCKET, LocalBlobStore(tmp_path / "reader"))
+    path = await reader.local_path(digest)
+    assert path is not None
+    assert path.read_bytes() == b"large body"
+    assert bytes(await reader.mapped(digest)) == b"large body"
+
+    assert await reader.local_path("f" * 64) is None
+    assert await reader.mapped("f" * 64) is None
@@ -0,0 +1,65 @@
+import pytest
+
+from src.domain.mocks.schemas import SimulationRequest
+from src.shared.json_codec import (
+    OrjsonJsonCodec,
+    StdlibJsonCodec,
+    make_json_codec,
+    orjson,
+)
+
+CODECS = [StdlibJsonCodec()]
+if orjson is not None:
+    CODECS.append(OrjsonJsonCodec())
+
+DOCUMENT = {"name": "café", "items": [1, 2.5, True, None], "nested": {"a": "b"}}
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_codecs_emit_the_same_compact_json(codec):
+    encoded = codec.dumps(DOCUMENT)
+
+    assert encoded == StdlibJsonCodec().dumps(DOCUMENT)
+    assert encoded.startswith(b'{"name":"caf\xc3\xa9"')
+    assert codec.loads(encoded) == DOCUMENT
+    assert codec.loads(encoded.decode()) == DOCUMENT
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_invalid_json_raises_value_error(codec):
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+def test_orjson_falls_back_for_large_integers():
+    codec = OrjsonJsonCodec()
+    assert codec.dumps({"id": 2**70}) == b'{"id":1180591620717411303424}'
+
+    for value in (2**64, -(2**63) - 1, 2**70):
+        encoded = codec.dumps({"id": value, "name": "café"})
+        assert codec.loads(encoded) == {"id": value, "name": "café"}
+        assert codec.loads(encoded.decode())["id"] == value
+    assert codec.loads(b"[9223372036854775807, 1.5]") == [2**63 - 1, 1.5]
+
+
+def test_make_json_codec():
+    assert make_json_codec("stdlib").name == "stdlib"
+    assert make_json_codec("auto").name == ("stdlib" if orjson is None else "orjson")
+    with pytest.raises(ValueError):
+        make_json_codec("yaml")
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+async def test_request_body_is_parsed_with_the_codec(codec):
+    async def read_json() -> bytes:
+        return b'{"a": [1]}'
+
+    async def read_text() -> bytes:
+        return b"plain \xff"
+
+    parsed = SimulationRequest(read_body=read_json, loads=codec.loads)
+    text = SimulationRequest(read_body=read_text, loads=codec.loads)
+
+    assert await parsed.parsed_body() == {"a": [1]}
+    assert await text.parsed_body() == "plain �"